@@ -7,9 +7,41 @@
 
 // Testbench for the turtle_cpu_top module
 module turtle_cpu_top_tb;
+    // The trace monitor names decoder and branch condition enum values
+    /* verilator lint_off IMPORTSTAR */
+    import program_counter_pkg::*;
+    import decoder_pkg::*;
+    /* verilator lint_on IMPORTSTAR */
+
+    // +trace_level= values: quiet runs skip both the VCD and the per-cycle monitor text
+    localparam int TRACE_QUIET = 0;
+    localparam int TRACE_TEXT = 1;
+    localparam int TRACE_FULL = 2;
+
+    int trace_level = TRACE_FULL;
+
+    // +dump_format= "bin" writes the final dumps with $writememb, "hex" with $writememh
+    string dump_format = "bin";
+
+    // +retire_trace=1 prints one RETIRE record per retired instruction for lockstep runs
+    bit retire_trace = 0;
+
+    // +checkpoint_interval=N dumps both memories every N cycles to
+    // <checkpoint_prefix>_<cycle>_{memory,registers}.mem and prints a CHECKPOINT record
+    int checkpoint_interval = 0;
+    string checkpoint_prefix = "checkpoint";
+
     initial begin
-        $dumpfile("waves.vcd");
-        $dumpvars(0, turtle_cpu_top_tb);
+        automatic string wave_file = "waves.vcd";
+
+        void'($value$plusargs("trace_level=%d", trace_level));
+
+        if (trace_level >= TRACE_FULL) begin
+            // Parallel test runs point each simulation at its own wave file
+            void'($value$plusargs("wave_file=%s", wave_file));
+            $dumpfile(wave_file);
+            $dumpvars(0, turtle_cpu_top_tb);
+        end
     end
 
     // Signals
@@ -19,6 +51,9 @@ module turtle_cpu_top_tb;
 
     int cycle_count = 0;
 
+    // Cycle budget when no +max_cycles= plusarg is given (the old fixed 20ms window)
+    localparam int DEFAULT_MAX_CYCLES = 20000;
+
     // Instantiate the turtle CPU top module
     turtle_cpu_top uut (
         .reset_btn(reset_btn),
@@ -37,20 +72,235 @@ module turtle_cpu_top_tb;
         return ".";
     endfunction
 
+    // HALT assembles to a jump to itself, so it retires as a taken branch whose target is the
+    // current PC. Sampled right after a clock edge, these are the values for the instruction
+    // that retires on that edge.
+    function automatic bit halt_retiring();
+        return uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.program_counter_inst.branch_taken
+            && uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.program_counter_inst.next_pc
+               == uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.pc;
+    endfunction
+
+    // Print the RETIRE record of the instruction retiring on the current clock edge: its PC,
+    // the instruction, then ACC, the register a PUT wrote (-1 for none) and STATUS once the
+    // edge's updates have settled. Returns at the following negedge.
+    task automatic trace_retirement();
+        logic [11:0] pc = uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.pc;
+        logic [15:0] instruction = uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.instruction;
+        int put_reg = uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.write_put_acc
+            ? int'(uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.reg_addr) : -1;
+
+        @(negedge uut.clk);
+        $display("RETIRE pc=%03h instruction=%04h acc=%02h reg=%0d value=%02h status=%08b",
+            pc, instruction, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.acc_out, put_reg,
+            put_reg >= 0 ? uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_file_inst.mem[put_reg] : 8'h00,
+            uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_file_inst.mem[15]);
+    endtask
+
+    // Performance counters of the program being run, printed as PERF records once it stops
+    int perf_retired;
+    int perf_branches_taken;
+    int perf_branches_not_taken;
+    int perf_jumps;
+    int perf_loads;
+    int perf_stores;
+    int perf_pc_counts[logic [11:0]];
+    logic [15:0] perf_pc_instructions[logic [11:0]];
+
+    task automatic reset_perf_counters();
+        perf_retired = 0;
+        perf_branches_taken = 0;
+        perf_branches_not_taken = 0;
+        perf_jumps = 0;
+        perf_loads = 0;
+        perf_stores = 0;
+        perf_pc_counts.delete();
+        perf_pc_instructions.delete();
+    endtask
+
+    // Count the instruction retiring on the current clock edge (sampled like halt_retiring)
+    function automatic void count_retirement();
+        logic [11:0] pc = uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.pc;
+
+        perf_retired++;
+        if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.branch_instruction) begin
+            if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.program_counter_inst.branch_taken) begin
+                perf_branches_taken++;
+            end else begin
+                perf_branches_not_taken++;
+            end
+        end else if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.jump_branch_select) begin
+            perf_jumps++;
+        end
+        if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.mem_read_en) begin
+            perf_loads++;
+        end
+        if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.data_memory_write_enable) begin
+            perf_stores++;
+        end
+
+        if (perf_pc_counts.exists(pc)) begin
+            perf_pc_counts[pc]++;
+        end else begin
+            perf_pc_counts[pc] = 1;
+        end
+        perf_pc_instructions[pc] = uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.instruction;
+    endfunction
+
+    // Print the counters: one PERF record with the totals, then one PERF_PC record per
+    // executed PC with its instruction and how often it retired
+    task automatic report_perf_counters(input int cycles);
+        $display("PERF cycles=%0d retired=%0d branches_taken=%0d branches_not_taken=%0d jumps=%0d loads=%0d stores=%0d",
+            cycles, perf_retired, perf_branches_taken, perf_branches_not_taken, perf_jumps,
+            perf_loads, perf_stores);
+        foreach (perf_pc_counts[pc]) begin
+            $display("PERF_PC pc=%03h instruction=%04h count=%0d", pc, perf_pc_instructions[pc],
+                perf_pc_counts[pc]);
+        end
+    endtask
+
+    // Run the loaded program until HALT retires or max_cycles clock cycles have elapsed
+    task automatic run_program(input int max_cycles);
+        int cycles = 0;
+        bit halted = 0;
+
+        reset_perf_counters();
+        while (!halted && cycles < max_cycles) begin
+            @(posedge uut.clk);
+            cycles++;
+            halted = halt_retiring();
+            count_retirement();
+            if (retire_trace) begin
+                trace_retirement();
+            end
+            if (checkpoint_interval > 0 && !halted && cycles % checkpoint_interval == 0) begin
+                write_checkpoint(cycles);
+            end
+        end
+
+        // Let the final edge's register and memory updates settle before dumping
+        // (trace_retirement already waited for the negedge)
+        if (!retire_trace) begin
+            @(negedge uut.clk);
+        end
+
+        if (halted) begin
+            $display("HALT retired after %0d cycles", cycles);
+        end else begin
+            $display("Reached max_cycles=%0d without HALT", max_cycles);
+        end
+        report_perf_counters(cycles);
+    endtask
+
+    // Clear both memories so nothing from the previous batch program leaks into the next
+    task automatic clear_memories();
+        foreach (uut.turtle_cpu_subsystem_inst.instruction_memory_inst.mem[i]) begin
+            uut.turtle_cpu_subsystem_inst.instruction_memory_inst.mem[i] = '0;
+        end
+        foreach (uut.turtle_cpu_subsystem_inst.data_memory_inst.mem[i]) begin
+            uut.turtle_cpu_subsystem_inst.data_memory_inst.mem[i] = '0;
+        end
+    endtask
+
+    // Write the final data memory and register file dumps, one byte per line in dump_format
+    task automatic dump_state(input string final_data_memory_file, input string final_register_file);
+        $display("Saving final data memory to %s", final_data_memory_file);
+        if (dump_format == "hex") begin
+            $writememh(final_data_memory_file, uut.turtle_cpu_subsystem_inst.data_memory_inst.mem);
+        end else begin
+            $writememb(final_data_memory_file, uut.turtle_cpu_subsystem_inst.data_memory_inst.mem);
+        end
+
+        $display("Saving final register file to %s", final_register_file);
+        if (dump_format == "hex") begin
+            $writememh(final_register_file, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_file_inst.mem);
+        end else begin
+            $writememb(final_register_file, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_file_inst.mem);
+        end
+    endtask
+
+    // Dump both memories after the current clock edge's updates have settled, for a long
+    // run to be checked while it is still going. Returns at the following negedge.
+    task automatic write_checkpoint(input int cycles);
+        automatic string memory_file = $sformatf("%s_%0d_memory.mem", checkpoint_prefix, cycles);
+        automatic string register_file = $sformatf("%s_%0d_registers.mem", checkpoint_prefix, cycles);
+
+        // trace_retirement already waited for the negedge
+        if (!retire_trace) begin
+            @(negedge uut.clk);
+        end
+        dump_state(memory_file, register_file);
+        $display("CHECKPOINT cycle=%0d memory=%s registers=%s", cycles, memory_file, register_file);
+    endtask
+
+    // Run every program in a batch manifest. Each line holds three whitespace separated
+    // paths: instruction memory file, final data memory file, final register file.
+    task automatic run_batch(input string batch_manifest_file, input int max_cycles);
+        int manifest_fd;
+        int program_index = 0;
+        string initial_instruction_memory_file;
+        string final_data_memory_file;
+        string final_register_file;
+
+        manifest_fd = $fopen(batch_manifest_file, "r");
+        if (manifest_fd == 0) begin
+            $fatal(1, "Could not open batch manifest %s", batch_manifest_file);
+        end
+
+        while ($fscanf(manifest_fd, "%s %s %s", initial_instruction_memory_file,
+                       final_data_memory_file, final_register_file) == 3) begin
+            // The framework splits the log into per-program sections at this marker
+            $display("BATCH_PROGRAM %0d %s", program_index, initial_instruction_memory_file);
+
+            reset_btn = 1;
+            #2us;
+
+            clear_memories();
+            $display("Loading initial instruction memory from %s", initial_instruction_memory_file);
+            $readmemb(initial_instruction_memory_file, uut.turtle_cpu_subsystem_inst.instruction_memory_inst.mem);
+
+            reset_btn = 0;
+
+            run_program(max_cycles);
+
+            dump_state(final_data_memory_file, final_register_file);
+            program_index++;
+        end
+
+        $fclose(manifest_fd);
+        $display("Turtle CPU Top-level batch of %0d programs completed successfully!", program_index);
+    endtask
+
     // Test sequence
     initial begin
         automatic string tb_dir = dir_of(`__FILE__);
         automatic string turtle_cpu_top_dir = {tb_dir, "/.."};
 
-        // Defaults use absolute paths so xsim can find the files regardless of run directory.
+        // Defaults use absolute paths so any simulator finds the files regardless of run directory.
         automatic string initial_instruction_memory_file = {turtle_cpu_top_dir, "/initial_instruction_memory.mem"};
         automatic string final_data_memory_file = {turtle_cpu_top_dir, "/final_data_memory.mem"};
         automatic string final_register_file = {turtle_cpu_top_dir, "/final_register_file.mem"};
+        automatic string batch_manifest_file;
+        automatic int max_cycles = DEFAULT_MAX_CYCLES;
 
         reset_btn = 1;
         manual_clk_sw = 0;
         pulse_clk_btn = 0;
 
+        void'($value$plusargs("dump_format=%s", dump_format));
+        void'($value$plusargs("retire_trace=%b", retire_trace));
+        void'($value$plusargs("checkpoint_interval=%d", checkpoint_interval));
+        void'($value$plusargs("checkpoint_prefix=%s", checkpoint_prefix));
+
+        if (!$value$plusargs("max_cycles=%d", max_cycles)) begin
+            $display("No max_cycles provided, using default of %0d.", max_cycles);
+        end
+
+        if ($value$plusargs("batch_manifest=%s", batch_manifest_file)) begin
+            run_batch(batch_manifest_file, max_cycles);
+            $finish;
+        end
+
         #2us;
 
         reset_btn = 0;
@@ -61,21 +311,17 @@ module turtle_cpu_top_tb;
         $display("Loading initial instruction memory from %s", initial_instruction_memory_file);
         $readmemb(initial_instruction_memory_file, uut.turtle_cpu_subsystem_inst.instruction_memory_inst.mem);
 
-        #20ms;
+        run_program(max_cycles);
 
         $display("Turtle CPU Top-level testbench completed successfully!");
 
         if (!$value$plusargs("final_data_memory_file=%s", final_data_memory_file)) begin
             $display("No final data memory file provided, using default.");
         end
-        $display("Saving final data memory to %s", final_data_memory_file);
-        $writememb(final_data_memory_file, uut.turtle_cpu_subsystem_inst.data_memory_inst.mem);
-        
         if (!$value$plusargs("final_register_file=%s", final_register_file)) begin
             $display("No final register file provided, using default.");
         end
-        $display("Saving final register file to %s", final_register_file);
-        $writememb(final_register_file, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_file_inst.mem);
+        dump_state(final_data_memory_file, final_register_file);
 
         $finish;
     end
@@ -93,97 +339,99 @@ module turtle_cpu_top_tb;
 
     always @(posedge uut.clk or edge uut.reset_n) begin
         if (uut.reset_n) begin
-            // First, let's add detailed decoder signal monitoring
-            $display("cycle=%4d pc=%4d, instruction=0x%4h", cycle_count, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.pc, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.instruction);
-            $display("  DECODER_SIGNALS: branch_inst=%b, jump_branch_sel=%b, uncond_branch=%b, op=%s", 
-                uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.branch_instruction,
-                uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.jump_branch_select,
-                uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.unconditional_branch,
-                uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.op.name()
-            );
+            if (trace_level >= TRACE_TEXT) begin
+                // First, let's add detailed decoder signal monitoring
+                $display("cycle=%4d pc=%4d, instruction=0x%4h", cycle_count, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.pc, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.instruction);
+                $display("  DECODER_SIGNALS: branch_inst=%b, jump_branch_sel=%b, uncond_branch=%b, op=%s", 
+                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.branch_instruction,
+                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.jump_branch_select,
+                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.unconditional_branch,
+                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.op.name()
+                );
             
-            // Show the actual instruction classification
-            if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.branch_instruction) begin
-                $display("  BRANCH_INSTRUCTION: cond=%s, addr_imm=0x%03h", 
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.branch_condition.name(), uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.address_immediate);
-            end else begin
-                string op_name;
-                string func_name;
-
-                op_name = uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.op.name();
-                if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.op == OPCODE_REG_MEMORY) begin
-                    func_name = uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.reg_mem_func.name();
-                end else if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.alu_output_enable === 1'b1) begin
-                    func_name = uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.alu_function.name();
+                // Show the actual instruction classification
+                if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.branch_instruction) begin
+                    $display("  BRANCH_INSTRUCTION: cond=%s, addr_imm=0x%03h", 
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.branch_condition.name(), uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.address_immediate);
                 end else begin
-                    func_name = "N/A";
-                end
+                    string op_name;
+                    string func_name;
 
-                $display("  NON_BRANCH: op=%s, func=%s", op_name, func_name);
-            end
+                    op_name = uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.op.name();
+                    if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.op == OPCODE_REG_MEMORY) begin
+                        func_name = uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.reg_mem_func.name();
+                    end else if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.alu_output_enable === 1'b1) begin
+                        func_name = uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.alu_function.name();
+                    end else begin
+                        func_name = "N/A";
+                    end
+
+                    $display("  NON_BRANCH: op=%s, func=%s", op_name, func_name);
+                end
             
-            $display("  STATE: acc=0x%02h, gpr=%p", uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.acc_out, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_file_inst.gpr);
+                $display("  STATE: acc=0x%02h, gpr=%p", uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.acc_out, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_file_inst.gpr);
             
-            // Monitor ALU flags and status register updates
-            if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.status_write_enable) begin
-                $display("  STATUS_UPDATE: alu_zero=%b, alu_positive=%b, alu_carry=%b, alu_overflow=%b, status_we=%b",
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.zero_flag,
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.positive_flag,
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.carry_flag,
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.signed_overflow,
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.status_write_enable
-                );
-                $display("  STATUS_DETAIL: old_status=0x%02h, new_status=0x%02h, reg_data_bus=0x%02h",
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_file_inst.mem[15], // Previous STATUS value
-                    {4'b0, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.signed_overflow, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.carry_flag, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.positive_flag, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.zero_flag},
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus
-                );
-            end
+                // Monitor ALU flags and status register updates
+                if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.status_write_enable) begin
+                    $display("  STATUS_UPDATE: alu_zero=%b, alu_positive=%b, alu_carry=%b, alu_overflow=%b, status_we=%b",
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.zero_flag,
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.positive_flag,
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.carry_flag,
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.signed_overflow,
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.status_write_enable
+                    );
+                    $display("  STATUS_DETAIL: old_status=0x%02h, new_status=0x%02h, reg_data_bus=0x%02h",
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_file_inst.mem[15], // Previous STATUS value
+                        {4'b0, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.signed_overflow, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.carry_flag, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.positive_flag, uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.alu_inst.zero_flag},
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus
+                    );
+                end
             
-            // Enhanced monitoring for branch instructions - use the correct branch detection
-            if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.branch_instruction) begin
-                $display("  BRANCH_DEBUG: cond=%s, status=0x%02h, addr_imm=0x%03h, pc_rel=%b",
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.branch_condition.name(),
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus,
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.address_immediate,
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.pc_relative
-                );
-                $display("  BRANCH_CALC: target_offset=0x%03h, branch_addr=0x%03h, branch_taken=%b",
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.program_counter_inst.target_offset,
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.program_counter_inst.branch_addr,
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.program_counter_inst.branch_taken
-                );
-                $display("  PC_LOGIC: next_pc=0x%03h, current_pc=0x%03h",
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.program_counter_inst.next_pc,
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.pc
-                );
+                // Enhanced monitoring for branch instructions - use the correct branch detection
+                if (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.decoder_inst.branch_instruction) begin
+                    $display("  BRANCH_DEBUG: cond=%s, status=0x%02h, addr_imm=0x%03h, pc_rel=%b",
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.branch_condition.name(),
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus,
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.address_immediate,
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.pc_relative
+                    );
+                    $display("  BRANCH_CALC: target_offset=0x%03h, branch_addr=0x%03h, branch_taken=%b",
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.program_counter_inst.target_offset,
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.program_counter_inst.branch_addr,
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.program_counter_inst.branch_taken
+                    );
+                    $display("  PC_LOGIC: next_pc=0x%03h, current_pc=0x%03h",
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.program_counter_inst.next_pc,
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.pc
+                    );
                 
-                // Detailed branch condition evaluation
-                $display("  BRANCH_EVAL: zero_flag=%b, pos_flag=%b, carry_flag=%b, overflow_flag=%b",
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[0], // ZERO_FLAG 
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[1], // POSITIVE_FLAG
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[2], // CARRY_FLAG
-                    uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[3]  // SIGNED_OVERFLOW_FLAG
-                );
+                    // Detailed branch condition evaluation
+                    $display("  BRANCH_EVAL: zero_flag=%b, pos_flag=%b, carry_flag=%b, overflow_flag=%b",
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[0], // ZERO_FLAG 
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[1], // POSITIVE_FLAG
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[2], // CARRY_FLAG
+                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[3]  // SIGNED_OVERFLOW_FLAG
+                    );
                 
-                // Show how branch condition is being evaluated
-                case (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.branch_condition)
-                    COND_ZERO: $display("  BZ_EVAL: zero_flag=%b, should_branch=%b", 
-                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[0], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[0] == 1'b1);
-                    COND_NOT_ZERO: $display("  BNZ_EVAL: zero_flag=%b, should_branch=%b", 
-                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[0], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[0] == 1'b0);
-                    COND_POSITIVE: $display("  BP_EVAL: pos_flag=%b, should_branch=%b", 
-                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[1], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[1] == 1'b1);
-                    COND_NEGATIVE: $display("  BN_EVAL: pos_flag=%b, should_branch=%b", 
-                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[1], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[1] == 1'b0);
-                    COND_CARRY_SET: $display("  BCS_EVAL: carry_flag=%b, should_branch=%b", 
-                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[2], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[2] == 1'b1);
-                    COND_CARRY_CLEARED: $display("  BCC_EVAL: carry_flag=%b, should_branch=%b", 
-                        uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[2], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[2] == 1'b0);
-                    default: $display("  UNKNOWN_BRANCH_CONDITION: %s", uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.branch_condition.name());
-                endcase
+                    // Show how branch condition is being evaluated
+                    case (uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.branch_condition)
+                        COND_ZERO: $display("  BZ_EVAL: zero_flag=%b, should_branch=%b", 
+                            uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[0], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[0] == 1'b1);
+                        COND_NOT_ZERO: $display("  BNZ_EVAL: zero_flag=%b, should_branch=%b", 
+                            uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[0], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[0] == 1'b0);
+                        COND_POSITIVE: $display("  BP_EVAL: pos_flag=%b, should_branch=%b", 
+                            uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[1], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[1] == 1'b1);
+                        COND_NEGATIVE: $display("  BN_EVAL: pos_flag=%b, should_branch=%b", 
+                            uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[1], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[1] == 1'b0);
+                        COND_CARRY_SET: $display("  BCS_EVAL: carry_flag=%b, should_branch=%b", 
+                            uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[2], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[2] == 1'b1);
+                        COND_CARRY_CLEARED: $display("  BCC_EVAL: carry_flag=%b, should_branch=%b", 
+                            uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[2], uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.register_data_bus[2] == 1'b0);
+                        default: $display("  UNKNOWN_BRANCH_CONDITION: %s", uut.turtle_cpu_subsystem_inst.turtle_cpu_core_inst.branch_condition.name());
+                    endcase
+                end
             end
-            
+
             cycle_count <= cycle_count + 1;
         end
     end
@@ -29,6 +29,9 @@ module io_controller #(
     // Other parameters
     parameter int I_MEMORY_DEPTH = 1 << I_ADDR_W,
     parameter int D_MEMORY_DEPTH = 1 << D_ADDR_W,
+    // UART parameters
+    parameter int BAUD_RATE = 9600,
+    parameter int OVERSAMPLE_RATE = 16,
     localparam int BYTE_SIZE = 8
 ) (
     input clk,
@@ -142,5 +145,8 @@ module io_controller #(
   // Outputs / submodules
   // ------------------------------------------------------------------------
   seven_segment_driver seven_segment_driver_inst (.*);
-  uart_controller uart_controller_inst (.*);
+  uart_controller #(
+      .BAUD_RATE(BAUD_RATE),
+      .OVERSAMPLE_RATE(OVERSAMPLE_RATE)
+  ) uart_controller_inst (.*);
 endmodule
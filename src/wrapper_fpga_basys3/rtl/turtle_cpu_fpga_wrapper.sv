@@ -31,6 +31,9 @@ module turtle_cpu_fpga_wrapper #(
     parameter int REG_ADDR_WIDTH = 4,
     parameter int I_MEMORY_DEPTH = 1 << I_ADDR_W,
     parameter int D_MEMORY_DEPTH = 1 << D_ADDR_W,
+    // UART parameters
+    parameter int BAUD_RATE = 9600,
+    parameter int OVERSAMPLE_RATE = 16,
     localparam int BYTE_SIZE = 8
 ) (
     input logic clk_in,
@@ -63,7 +66,10 @@ module turtle_cpu_fpga_wrapper #(
 
   clk_rst_pll_sync clk_rst_pll_sync_inst (.*);
 
-  io_controller io_controller_inst (.*);
+  io_controller #(
+      .BAUD_RATE(BAUD_RATE),
+      .OVERSAMPLE_RATE(OVERSAMPLE_RATE)
+  ) io_controller_inst (.*);
 
   turtle_cpu_subsystem turtle_cpu_subsystem_inst (.*);
 
@@ -3,8 +3,19 @@
 
 `timescale 1ns / 1ps
 
+// UART_HOST_BAUD_RATE and UART_HOST_OVERSAMPLE_RATE, rewritten per setting by
+// tests/integration/uart_host.py
+`include "uart_host_config.svh"
+
 module turtle_cpu_fpga_wrapper_tb;
 
+    // Instruction memory address width of the DUT. The UART host model can send at
+    // most a full instruction memory, tests/integration/uart_host.py reads it from here.
+    localparam int I_ADDR_W = 12;
+    localparam int UART_STREAM_MAX_BYTES = 1 << I_ADDR_W;
+    // Frames the echo may trail the sender by: both FIFOs plus the frames in flight
+    localparam int UART_DRAIN_FRAMES = 40;
+
     logic clk_in;
     logic [15:0] sw;
     logic [15:0] led;
@@ -12,8 +23,24 @@ module turtle_cpu_fpga_wrapper_tb;
     logic [3:0] an;
     logic RsTx, RsRx;
 
+    // UART host model stream, enabled by +uart_stream_file=
+    string uart_stream_file;
+    string uart_capture_file = "uart_capture.hex";
+    int uart_stream_length = 0;
+    int uart_idle_bits = 1;
+    int uart_rx_count;
+    logic [7:0] uart_tx_bytes[UART_STREAM_MAX_BYTES];
+    logic [7:0] uart_rx_bytes[UART_STREAM_MAX_BYTES];
+    realtime uart_bit_time;
+    realtime uart_first_start;
+    realtime uart_last_stop;
+
     // Instantiate the DUT
-    turtle_cpu_fpga_wrapper uut (.*);
+    turtle_cpu_fpga_wrapper #(
+        .I_ADDR_W(I_ADDR_W),
+        .BAUD_RATE(`UART_HOST_BAUD_RATE),
+        .OVERSAMPLE_RATE(`UART_HOST_OVERSAMPLE_RATE)
+    ) uut (.*);
 
     // Clock generation
     initial begin
@@ -29,13 +56,90 @@ module turtle_cpu_fpga_wrapper_tb;
         @(posedge uut.reset_n);
     endtask
 
+    // The UART's bit time in simulated time: its oversample divider runs on the
+    // PLL clock, which differs from the CLOCK_FREQ the divider assumes
+    task automatic measure_uart_bit_time();
+        realtime clk_edge;
+        @(posedge uut.clk);
+        clk_edge = $realtime;
+        @(posedge uut.clk);
+        uart_bit_time = ($realtime - clk_edge)
+                      * uut.io_controller_inst.uart_controller_inst.OVERSAMPLE_CLOCKS
+                      * `UART_HOST_OVERSAMPLE_RATE;
+    endtask
+
+    // Host transmitter: one 8N1 frame on RsRx, then uart_idle_bits of idle line
+    task automatic uart_send_byte(input logic [7:0] data);
+        RsRx = 1'b0;
+        #(uart_bit_time);
+        for (int i = 0; i < 8; i++) begin
+            RsRx = data[i];
+            #(uart_bit_time);
+        end
+        RsRx = 1'b1;
+        #(uart_bit_time * (1 + uart_idle_bits));
+    endtask
+
+    // Host receiver: one 8N1 frame from RsTx, sampled mid-bit
+    task automatic uart_receive_byte(output logic [7:0] data);
+        @(negedge RsTx);
+        #(uart_bit_time * 1.5);
+        for (int i = 0; i < 8; i++) begin
+            data[i] = RsTx;
+            #(uart_bit_time);
+        end
+        uart_last_stop = $realtime + uart_bit_time / 2;
+    endtask
+
+    // Send the stream file over RsRx and capture what comes back on RsTx
+    task automatic run_uart_stream();
+        $readmemh(uart_stream_file, uart_tx_bytes, 0, uart_stream_length - 1);
+        measure_uart_bit_time();
+        uart_rx_count = 0;
+        uart_first_start = $realtime;
+        uart_last_stop = $realtime;
+
+        fork
+            for (int i = 0; i < uart_stream_length; i++) begin
+                uart_send_byte(uart_tx_bytes[i]);
+            end
+            while (uart_rx_count < uart_stream_length) begin
+                uart_receive_byte(uart_rx_bytes[uart_rx_count]);
+                uart_rx_count++;
+            end
+        join_none
+
+        // Wait for the sender, then give the echo time to drain
+        #(uart_bit_time * (10 + uart_idle_bits) * uart_stream_length);
+        fork
+            wait (uart_rx_count == uart_stream_length);
+            #(uart_bit_time * 11 * UART_DRAIN_FRAMES);
+        join_any
+        disable fork;
+
+        if (uart_rx_count > 0) begin
+            $writememh(uart_capture_file, uart_rx_bytes, 0, uart_rx_count - 1);
+        end
+        $display("UART_STREAM sent=%0d received=%0d bit_time_ns=%0.3f first_start_ns=%0.3f last_stop_ns=%0.3f",
+                 uart_stream_length, uart_rx_count, uart_bit_time, uart_first_start, uart_last_stop);
+    endtask
+
     // Test sequences
     initial begin
         // Initialize inputs
         sw = 16'h0000;
+        RsRx = 1'b1; // Idle line
 
         wait_for_reset_release();
-        
+
+        if ($value$plusargs("uart_stream_file=%s", uart_stream_file)) begin
+            void'($value$plusargs("uart_stream_length=%d", uart_stream_length));
+            void'($value$plusargs("uart_capture_file=%s", uart_capture_file));
+            void'($value$plusargs("uart_idle_bits=%d", uart_idle_bits));
+            run_uart_stream();
+            $finish;
+        end
+
         // Seven segment refresh is about 200_000 cycles = 2ms at 100MHz per digit
         // It will be a bit more than that because of the internal clock running at 16ns period
         // So wait wait about 10ms to be safe
@@ -0,0 +1,10 @@
+# Full-chip simulation of turtle_cpu_fpga_wrapper_tb: the CPU, the wrapper and its
+# testbench. Run from this directory with `make -f wrapper_tb.mk rebuild run`.
+# Needs the simulation model of the clk_wiz_0 IP.
+WRAPPER_FPGA_BASYS3_DIR := $(dir $(lastword $(MAKEFILE_LIST)))
+
+include ../turtle_cpu_top/Makefile
+
+INCLUDE_DIRS := $(INCLUDE_DIRS) $(WRAPPER_FPGA_BASYS3_DIR)/rtl $(WRAPPER_FPGA_BASYS3_DIR)/tb
+FILE_LIST := $(INCLUDE_FILES) turtle_cpu_fpga_wrapper.sv turtle_cpu_fpga_wrapper_tb.sv
+WAVE_FILE := waves.vcd
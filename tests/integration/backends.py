@@ -0,0 +1,124 @@
+"""
+RTL simulator backends for the Turtle CPU test framework
+A backend builds the turtle_cpu_top testbench and gives the command line that runs
+it. The testbench loads the program, runs it and dumps the final state as told by
+its plusargs, so every backend drives the same testbench:
+
+- make: the rtl-toolkit flow, `make rebuild` and `make run PLUSARGS=...`. Event
+  accurate, the one to debug with.
+- verilator: the testbench compiled once into a C++ model (verilator --binary
+  --timing) that runs directly, many times faster on long programs and fuzzing.
+"""
+
+import re
+from pathlib import Path
+
+DEFAULT_BACKEND = "make"
+
+TOP_MODULE = "turtle_cpu_top_tb"
+
+
+def program_plusargs(binstr_file, memory_dump, registers_dump) -> str:
+    """Testbench plusargs that load a program and name its final dumps"""
+    return (f"+initial_instruction_memory_file={binstr_file} "
+            f"+final_data_memory_file={memory_dump} "
+            f"+final_register_file={registers_dump}")
+
+
+# Each backend's build_stamp is written into the RTL directory after a build: the source
+# fingerprint it was built from and the build outputs, so a later run can skip the build
+# while both still match. Backends have their own stamps, switching keeps both builds.
+class MakeBackend:
+    """The rtl-toolkit make flow in the RTL directory"""
+    name = "make"
+    build_stamp = ".rtl_build_stamp.json"
+
+    def __init__(self, rtl_dir: Path):
+        self.rtl_dir = Path(rtl_dir)
+
+    def build_command(self) -> list:
+        return ["make", "rebuild"]
+
+    def run_command(self, plusargs: str) -> list:
+        return ["make", "run", f"PLUSARGS={plusargs}"]
+
+
+class VerilatorBackend:
+    """A Verilator model of the testbench, built into <rtl_dir>/obj_verilator
+
+    The sources are the ones the make flow compiles: the packages the Makefiles list
+    in INCLUDE_FILES, in their order, then turtle_cpu_top and its testbench. The other
+    modules are found in the blocks' rtl/ and tb/ directories like with make.
+    """
+    name = "verilator"
+    build_stamp = ".rtl_build_stamp_verilator.json"
+    build_dir = "obj_verilator"
+
+    def __init__(self, rtl_dir: Path):
+        self.rtl_dir = Path(rtl_dir).resolve()
+        self.executable = self.rtl_dir / self.build_dir / f"V{TOP_MODULE}"
+
+    def build_command(self) -> list:
+        rtl_dir = self.rtl_dir
+        block_dirs = _block_dirs(rtl_dir)
+        search_dirs = [block_dir / sub_dir for block_dir in block_dirs
+                       for sub_dir in ("rtl", "tb") if (block_dir / sub_dir).is_dir()]
+        packages = []
+        for name in _include_files(rtl_dir):
+            path = next((d / name for d in search_dirs if (d / name).exists()), None)
+            if path is not None and path not in packages:
+                packages.append(path)
+
+        cmd = ["verilator", "--binary", "--timing", "--trace", "-O3", "-j", "0",
+               "--timescale", "1ns/1ps", "-Wno-fatal", "-Wno-lint", "-Wno-style",
+               "--top-module", TOP_MODULE, "--Mdir", self.build_dir,
+               "-o", self.executable.name]
+        for search_dir in search_dirs:
+            cmd += [f"+incdir+{search_dir}", "-y", str(search_dir)]
+        return cmd + [str(path) for path in packages] + [
+            str(rtl_dir / "rtl" / "turtle_cpu_top.sv"), str(rtl_dir / "tb" / f"{TOP_MODULE}.sv")]
+
+    def run_command(self, plusargs: str) -> list:
+        # Paths in the plusargs never hold whitespace, see the batch manifest
+        return [str(self.executable), *plusargs.split()]
+
+
+BACKENDS = {backend.name: backend for backend in (MakeBackend, VerilatorBackend)}
+
+
+def make_backend(name: str, rtl_dir: Path):
+    """Backend called name for the turtle_cpu_top directory rtl_dir"""
+    return BACKENDS[name](rtl_dir)
+
+
+def _makefile_includes(block_dir: Path) -> list:
+    """Sibling block directories a block Makefile includes, in order"""
+    blocks = []
+    for line in (block_dir / "Makefile").read_text().splitlines():
+        match = re.match(r"include\s+\.\./(\w+)/Makefile", line.strip())
+        if match:
+            blocks.append(block_dir.parent / match.group(1))
+    return blocks
+
+
+def _block_dirs(block_dir: Path) -> list:
+    """A block directory and every block its Makefile includes, directly or not"""
+    blocks = [block_dir]
+    for included in _makefile_includes(block_dir):
+        for block in _block_dirs(included):
+            if block not in blocks:
+                blocks.append(block)
+    return blocks
+
+
+def _include_files(block_dir: Path) -> list:
+    """INCLUDE_FILES of a block Makefile expanded like make does: the included
+    blocks' files in include order, then the block's own"""
+    names = []
+    for included in _makefile_includes(block_dir):
+        names += _include_files(included)
+    for line in (block_dir / "Makefile").read_text().splitlines():
+        match = re.match(r"INCLUDE_FILES\s*:?=(.*)", line.strip())
+        if match:
+            names += [name for name in match.group(1).split() if name.endswith(".sv")]
+    return list(dict.fromkeys(names))
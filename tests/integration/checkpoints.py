@@ -0,0 +1,134 @@
+"""
+Long-running program support for the Turtle CPU test framework
+Reads per-program cycle budgets from .asm headers and checks the testbench's
+periodic CHECKPOINT dumps against the reference model while the RTL still runs
+
+turtle-toolkit's simulate_program only reports the final state, so checkpoints
+are compared against the instruction-level model in lockstep.py, which
+test_lockstep.py cross-checks against simulate_program on every suite program.
+The final state is still compared against the turtle-toolkit simulator.
+"""
+
+import re
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+try:
+    from .lockstep import REG_NAMES, REG_STATUS, RetireRecord, reference_trace
+    from .mem_dumps import find_mismatches, format_range, mismatch_ranges, parse_dump
+except ImportError:  # Run as a script from tests/integration
+    from lockstep import REG_NAMES, REG_STATUS, RetireRecord, reference_trace
+    from mem_dumps import find_mismatches, format_range, mismatch_ranges, parse_dump
+
+# `; max_cycles: N` in a program's leading comment block sets its cycle budget
+BUDGET_RE = re.compile(r"^;\s*max_cycles\s*:\s*(\d+)\s*$", re.IGNORECASE)
+
+CHECKPOINT_RE = re.compile(r"CHECKPOINT cycle=(\d+) memory=(\S+) registers=(\S+)")
+
+# Differing ranges shown per dump in a checkpoint mismatch report
+REPORT_RANGES = 4
+
+
+def read_cycle_budget(source: str) -> Optional[int]:
+    """Cycle budget from a `; max_cycles: N` line before the first instruction, or None"""
+    for line in source.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith(";"):
+            break
+        match = BUDGET_RE.match(line)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+class Checkpoint(NamedTuple):
+    """A testbench CHECKPOINT record: the dumps it wrote after `cycle` cycles"""
+    cycle: int
+    memory_file: Path
+    registers_file: Path
+
+
+def parse_checkpoint(line: str) -> Optional[Checkpoint]:
+    """Parse a testbench CHECKPOINT line, None for any other line"""
+    match = CHECKPOINT_RE.search(line)
+    if not match:
+        return None
+    return Checkpoint(int(match.group(1)), Path(match.group(2)), Path(match.group(3)))
+
+
+class ReferenceRun:
+    """The reference model of one program, advanced as the RTL's output arrives
+
+    Lockstep runs take one record per RETIRE line with next_record. Checkpoints
+    advance the model to their cycle and compare its memories, so only the current
+    state is ever held.
+    """
+
+    def __init__(self, program: bytes, max_cycles: int, dump_format: str):
+        self.state = {}
+        self.trace = reference_trace(program, max_cycles, self.state)
+        self.dump_format = dump_format
+        self.retired = 0
+        self.last = None  # Last record, for its unknown STATUS bits
+        self.ended = False  # The model halted or stopped on something it can't know
+
+    def next_record(self) -> Optional[RetireRecord]:
+        """The next retired instruction, None once the model has ended"""
+        record = None if self.ended else next(self.trace, None)
+        if record is None:
+            self.ended = True
+            return None
+        self.retired += 1
+        self.last = record
+        return record
+
+    def check_checkpoint(self, checkpoint: Checkpoint) -> Optional[str]:
+        """Compare a checkpoint's dumps with the model after as many cycles, then delete them
+
+        Returns a report of the differences, or None if they match or the model ended
+        before the checkpoint's cycle (then the final dumps decide).
+        """
+        try:
+            while self.retired < checkpoint.cycle and self.next_record() is not None:
+                pass
+            if self.retired < checkpoint.cycle:
+                return None
+
+            memory, memory_unknown = parse_dump(checkpoint.memory_file.read_text(),
+                                                self.dump_format)
+            registers, registers_unknown = parse_dump(checkpoint.registers_file.read_text(),
+                                                      self.dump_format)
+        finally:
+            checkpoint.memory_file.unlink(missing_ok=True)
+            checkpoint.registers_file.unlink(missing_ok=True)
+
+        expected_registers = bytearray(self.state['registers'])
+        status_unknown = self.last.status_unknown if self.last else 0
+        expected_registers[REG_STATUS] &= ~status_unknown & 0xFF
+        if REG_STATUS < len(registers):
+            registers[REG_STATUS] &= ~status_unknown & 0xFF
+        if status_unknown:
+            # x bits in the RTL's STATUS are the flags the model doesn't know either
+            registers_unknown.discard(REG_STATUS)
+
+        lines = []
+        for name, expected, actual, unknown in (
+                ("Memory", self.state['memory'], memory, memory_unknown),
+                ("Registers", expected_registers, registers, registers_unknown)):
+            ranges = mismatch_ranges(find_mismatches(expected, actual, unknown))
+            for first, last in ranges[:REPORT_RANGES]:
+                if name == "Registers":
+                    where = "-".join(REG_NAMES.get(reg, str(reg)) for reg in sorted({first, last}))
+                else:
+                    where = "-".join(f"0x{address:03x}" for address in sorted({first, last}))
+                lines += [f"    {name} {where}:",
+                          f"      reference: {format_range(expected, first, last)}",
+                          f"      rtl:       {format_range(actual, first, last, unknown)}"]
+            if len(ranges) > REPORT_RANGES:
+                lines.append(f"    ... and {len(ranges) - REPORT_RANGES} more {name.lower()} ranges")
+
+        if not lines:
+            return None
+        return "\n".join([f"Checkpoint at cycle {checkpoint.cycle} differs:"] + lines)
@@ -0,0 +1,91 @@
+"""
+Pytest plugin for the Turtle CPU integration tests
+Every suite program becomes one `test_program[<name>]` test, backed by
+TurtleCPUTestFramework. The RTL is built once per run, also under pytest-xdist.
+"""
+
+import fcntl
+import os
+from pathlib import Path
+
+import pytest
+
+from .backends import BACKENDS, DEFAULT_BACKEND, make_backend
+from .result_cache import ResultCache
+from .test_framework import DEFAULT_MAX_CYCLES, TurtleCPUTestFramework
+
+# Skips the program tests only, the helper tests need neither the RTL nor the toolkit
+RTL_BUILD_FAILED = "RTL build failed (no simulator installed?), see the captured build output"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("turtle", "Turtle CPU integration tests")
+    group.addoption("--turtle-max-cycles", type=int, default=DEFAULT_MAX_CYCLES,
+                    help=f"Cycle budget for the simulator and the RTL (default: {DEFAULT_MAX_CYCLES})")
+    group.addoption("--turtle-lockstep", action="store_true",
+                    help="Check every retired RTL instruction against the reference trace")
+    group.addoption("--turtle-checkpoint-interval", type=int, default=0,
+                    help="Check the RTL state against the reference model every N cycles")
+    group.addoption("--turtle-backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                    help=f"RTL simulator backend (default: {DEFAULT_BACKEND})")
+    group.addoption("--turtle-rtl-only", action="store_true",
+                    help="Check the RTL against the golden snapshots, without turtle-toolkit")
+    group.addoption("--turtle-no-cache", action="store_true",
+                    help="Don't use the result cache for assembly, simulation and RTL builds")
+
+
+def pytest_generate_tests(metafunc):
+    if "asm_file" in metafunc.fixturenames:
+        test_files = sorted(TurtleCPUTestFramework().default_test_files())
+        metafunc.parametrize("asm_file", test_files,
+                             ids=[test_file.stem for test_file in test_files])
+
+
+@pytest.fixture(scope="session")
+def turtle_framework(request, tmp_path_factory):
+    """Framework with the RTL built, shared by every test in the session
+
+    Under pytest-xdist each worker is its own session. The first worker to take the
+    lock runs `make rebuild`, the others reuse its build, and every worker gets a
+    private `make run` directory like run_tests_parallel's workers.
+    """
+    config = request.config
+    cache = None
+    if not config.getoption("turtle_no_cache"):
+        cache = ResultCache(Path(__file__).parent / ".result_cache")
+
+    framework = TurtleCPUTestFramework(max_cycles=config.getoption("turtle_max_cycles"),
+                                       cache=cache,
+                                       lockstep=config.getoption("turtle_lockstep"),
+                                       checkpoint_interval=config.getoption(
+                                           "turtle_checkpoint_interval"))
+    framework.rtl_only = config.getoption("turtle_rtl_only")
+    if framework.rtl_only and not framework.golden_store.has_snapshots():
+        pytest.exit(f"--turtle-rtl-only found no golden snapshots in "
+                    f"{framework.golden_store.golden_dir}, record them with `make golden`",
+                    returncode=1)
+    framework.backend = make_backend(config.getoption("turtle_backend"), framework.rtl_dir)
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker is None:
+        if not framework.ensure_rtl_built():
+            pytest.skip(RTL_BUILD_FAILED)
+        yield framework
+        framework.prune_outputs()
+        return
+
+    # getbasetemp() is per worker, its parent is shared by the whole xdist run
+    shared_dir = tmp_path_factory.getbasetemp().parent
+    with open(shared_dir / "rtl_build.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        built_marker = shared_dir / "rtl_built"
+        if not built_marker.exists():
+            if not framework.ensure_rtl_built():
+                pytest.skip(RTL_BUILD_FAILED)
+            built_marker.touch()
+
+    worker_dir = tmp_path_factory.mktemp(f"turtle_{worker}")
+    framework.scratch_dir = str(worker_dir)
+    framework.rtl_run_dir = framework.prepare_rtl_run_dir(worker_dir)
+    framework.rtl_built = True
+    yield framework
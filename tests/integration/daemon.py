@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test daemon for the Turtle CPU test framework
+`turtle-test --serve` keeps one framework alive, with turtle-toolkit imported, the
+RTL built and the result cache warm, and answers single-test requests over a Unix
+socket. The client in this module uses only the standard library, so a test run
+skips Poetry, the toolkit import and the RTL build check:
+
+    python3 tests/integration/daemon.py path/to/program.asm
+
+The protocol is JSON lines: one request line from the client, then any number of
+{"output": text} lines and a final {"done": result} line from the daemon.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import socket
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+DEFAULT_SOCKET = Path(__file__).parent / ".turtle_test.sock"
+
+# Client exit code when no daemon answers, the Makefile then runs the test in-process
+NO_DAEMON_EXIT = 3
+
+
+class _SocketWriter(io.TextIOBase):
+    """sys.stdout replacement that forwards the daemon's output to the client"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text: str) -> int:
+        if text:
+            _send(self.stream, {'output': text})
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def _send(stream, message: dict):
+    stream.write(json.dumps(message).encode() + b"\n")
+    stream.flush()
+
+
+def serve_requests(run_request: Callable[[dict], dict], socket_path: Path = DEFAULT_SOCKET):
+    """Answer client requests one at a time until interrupted
+
+    run_request runs with stdout forwarded to the client and returns the final
+    result. A result with 'stop' set shuts the daemon down after it is sent.
+    """
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        if _daemon_running(socket_path):
+            raise RuntimeError(f"a test daemon is already serving {socket_path}")
+        socket_path.unlink()  # Left behind by a daemon that was killed
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(str(socket_path))
+        server.listen()
+        print(f"Test daemon listening on {socket_path}")
+        stop = False
+        while not stop:
+            connection, _ = server.accept()
+            with connection, connection.makefile('rwb') as stream:
+                line = stream.readline()
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    continue
+                with contextlib.redirect_stdout(_SocketWriter(stream)):
+                    try:
+                        result = run_request(request)
+                    except Exception as e:
+                        print(f"❌ Request failed with exception: {e}")
+                        result = {'passed': False}
+                stop = bool(result.get('stop'))
+                with contextlib.suppress(OSError):  # The client went away
+                    _send(stream, {'done': result})
+    finally:
+        server.close()
+        socket_path.unlink(missing_ok=True)
+
+
+def _daemon_running(socket_path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def send_request(request: dict, socket_path: Path = DEFAULT_SOCKET) -> Optional[dict]:
+    """Send a request to the daemon and print its output as it arrives
+
+    Returns the daemon's result, or None if no daemon is listening.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(socket_path))
+        except OSError:
+            return None
+        with client.makefile('rwb') as stream:
+            _send(stream, request)
+            for line in stream:
+                message = json.loads(line)
+                if 'done' in message:
+                    return message['done']
+                sys.stdout.write(message['output'])
+                sys.stdout.flush()
+    return {'passed': False}  # The daemon died mid-request
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run one test on a running Turtle CPU test daemon (turtle-test --serve)")
+    parser.add_argument("test_file", help="Assembly file or test name")
+    parser.add_argument("--test-name", "-n",
+                        help="Name for the test (defaults to filename)")
+    parser.add_argument("--trace", type=int,
+                        help="RTL trace level for this test (defaults to the daemon's)")
+    parser.add_argument("--socket", default=str(DEFAULT_SOCKET),
+                        help=f"Daemon socket (default: {DEFAULT_SOCKET})")
+    args = parser.parse_args()
+
+    # The daemon has its own working directory, paths are sent resolved
+    test_file = Path(args.test_file)
+    request = {'test_file': str(test_file.resolve()) if test_file.exists() else args.test_file,
+               'test_name': args.test_name, 'trace': args.trace}
+    result = send_request(request, Path(args.socket))
+    if result is None:
+        print(f"No test daemon at {args.socket}, start one with `turtle-test --serve`",
+              file=sys.stderr)
+        sys.exit(NO_DAEMON_EXIT)
+    sys.exit(0 if result.get('passed') else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Debug artifact store for the Turtle CPU test framework
+Tests write their files into work directories inside debug_output/. A work
+directory a test keeps is renamed into place instead of copied, large logs and
+VCDs are gzipped as a stream, and the oldest debug directories are evicted once
+debug_output/ grows past its size limit
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+try:
+    from .result_cache import tree_size
+except ImportError:  # Run as a script from tests/integration
+    from result_cache import tree_size
+
+DEFAULT_DEBUG_SIZE_MB = 1024
+
+# Files at least this large are gzipped when their directory is kept
+DEFAULT_COMPRESS_KB = 256
+COMPRESS_SUFFIXES = {".txt", ".log", ".vcd"}
+
+# Work directories of running tests, on the same filesystem as the kept directories
+PENDING_DIR = ".pending"
+
+
+class DebugStore:
+    def __init__(self, debug_dir: str, max_size_mb: int = DEFAULT_DEBUG_SIZE_MB,
+                 compress_kb: int = DEFAULT_COMPRESS_KB):
+        self.debug_dir = Path(debug_dir)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.compress_bytes = compress_kb * 1024
+
+    def work_dir(self, prefix: str) -> tempfile.TemporaryDirectory:
+        """Temporary directory for a test's files, deleted unless keep() moves it first"""
+        pending = self.debug_dir / PENDING_DIR
+        pending.mkdir(parents=True, exist_ok=True)
+        return tempfile.TemporaryDirectory(prefix=prefix, dir=pending,
+                                           ignore_cleanup_errors=True)
+
+    def keep(self, work_dir: Path, name: str) -> Path:
+        """Rename a work directory to debug_output/<name>, replacing an earlier one
+
+        Large text files and VCDs in it are gzipped. Returns the kept directory.
+        """
+        kept = self.debug_dir / name
+        if kept.exists():
+            shutil.rmtree(kept)
+        kept.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(work_dir, kept)
+
+        for path in kept.iterdir():
+            if (path.is_file() and path.suffix in COMPRESS_SUFFIXES
+                    and path.stat().st_size >= self.compress_bytes):
+                compress_file(path)
+
+        # Kept directories are evicted oldest first, see prune()
+        os.utime(kept)
+        return kept
+
+    def prune(self):
+        """Evict the least recently kept debug directories until debug_output fits in max_size_bytes"""
+        if not self.debug_dir.exists():
+            return
+
+        entries = [(entry.stat().st_mtime, tree_size(entry), entry)
+                   for entry in self.debug_dir.iterdir()
+                   if entry.is_dir() and not entry.name.startswith('.')]
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+
+def compress_file(path: Path) -> Path:
+    """Replace a file with <name>.gz, streamed in chunks, return the compressed path"""
+    compressed = path.with_name(path.name + ".gz")
+    with open(path, 'rb') as src, gzip.open(compressed, 'wb', compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    path.unlink()
+    return compressed
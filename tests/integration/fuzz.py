@@ -0,0 +1,118 @@
+"""
+Random program generator for differential fuzzing of the Turtle CPU
+Generates valid programs that always reach HALT, and shrinks failing programs
+to a minimal reproducer
+"""
+
+import random
+import re
+from typing import Callable
+
+DEFAULT_FUZZ_LENGTH = 64
+
+ALU_REG_OPS = ("ADD", "SUB", "AND", "OR", "XOR")
+ALU_IMM_OPS = ("ADDI", "SUBI", "ANDI", "ORI", "XORI")
+BRANCH_OPS = ("BZ", "BNZ", "BP", "BN", "BCS", "BCC")
+GPRS = tuple(f"R{i}" for i in range(8))
+PUT_REGISTERS = GPRS + ("DOFF", "DBAR")
+GET_REGISTERS = PUT_REGISTERS + ("STATUS",)
+
+# Longest forward jump, in instructions
+MAX_BRANCH_DISTANCE = 8
+
+LABEL_RE = re.compile(r"^(L\d+):$")
+
+
+def generate_program(seed: int, index: int, length: int = DEFAULT_FUZZ_LENGTH) -> list:
+    """Generate the lines of random program `index` for a seed
+
+    Branches and jumps only go forward, so every program ends at its final HALT.
+    The same (seed, index) always gives the same program.
+    """
+    rng = random.Random(f"{seed}-{index}")
+    lines = ["start:"]
+    pending = {}  # label -> instructions left before it is placed
+    next_label = 0
+
+    for _ in range(length):
+        kind = rng.random()
+        if kind < 0.15:
+            lines.append(f"SET {rng.randrange(256)}")
+        elif kind < 0.35:
+            lines.append(f"{rng.choice(ALU_IMM_OPS)} {rng.randrange(256)}")
+        elif kind < 0.50:
+            lines.append(f"{rng.choice(ALU_REG_OPS)} {rng.choice(GPRS)}")
+        elif kind < 0.53:
+            lines.append("INV")
+        elif kind < 0.63:
+            lines.append(f"PUT {rng.choice(PUT_REGISTERS)}")
+        elif kind < 0.71:
+            lines.append(f"GET {rng.choice(GET_REGISTERS)}")
+        elif kind < 0.79:
+            lines.append(rng.choice(("LOAD", "STORE")))
+        else:
+            label = f"L{next_label}"
+            next_label += 1
+            op = "JMPI" if kind < 0.82 else rng.choice(BRANCH_OPS)
+            lines.append(f"{op} {label}")
+            pending[label] = rng.randint(1, MAX_BRANCH_DISTANCE)
+
+        for label in list(pending):
+            pending[label] -= 1
+            if pending[label] == 0:
+                del pending[label]
+                lines.append(f"{label}:")
+
+    lines.extend(f"{label}:" for label in pending)
+    lines.append("HALT")
+    return lines
+
+
+def format_program(lines: list, title: str) -> str:
+    """Assembly source for program lines, with labels flush left like the hand-written tests"""
+    source = [f"; {title}"]
+    for line in lines:
+        source.append(line if line.endswith(":") else f"    {line}")
+    return "\n".join(source) + "\n"
+
+
+def drop_dangling(lines: list) -> list:
+    """Remove branches whose label is gone and labels nothing branches to"""
+    labels = {match.group(1) for match in map(LABEL_RE.match, lines) if match}
+    lines = [line for line in lines
+             if not _branch_target(line) or _branch_target(line) in labels]
+    targets = {_branch_target(line) for line in lines}
+    return [line for line in lines
+            if not LABEL_RE.match(line) or LABEL_RE.match(line).group(1) in targets]
+
+
+def shrink_program(lines: list, still_fails: Callable[[list], bool]) -> list:
+    """Shrink a failing program to one where removing any single line makes it pass
+
+    Removes ever smaller chunks of the body (everything between `start:` and the
+    final HALT), keeping each removal after which still_fails(lines) holds.
+    """
+    head, body, tail = lines[:1], lines[1:-1], lines[-1:]
+    chunk = max(len(body) // 2, 1)
+
+    while body:
+        removed = False
+        start = 0
+        while start < len(body):
+            candidate = drop_dangling(body[:start] + body[start + chunk:])
+            if candidate != body and still_fails(head + candidate + tail):
+                body = candidate
+                removed = True
+            else:
+                start += chunk
+        if chunk == 1 and not removed:
+            break
+        chunk = max(chunk // 2, 1)
+
+    return head + body + tail
+
+
+def _branch_target(line: str) -> str:
+    """Label a branch or jump line goes to, empty for other lines"""
+    op, _, operand = line.partition(" ")
+    return operand if op in BRANCH_OPS or op == "JMPI" else ""
@@ -0,0 +1,106 @@
+"""
+Golden-result snapshots for the Turtle CPU test framework
+Records each program's machine code and the simulator's final memory and registers,
+so --rtl-only runs check the RTL against them without assembling or simulating.
+Only the non-zero bytes of each dump are stored.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Tuple
+
+DEFAULT_GOLDEN_DIR = Path(__file__).parent / "golden"
+
+# Bumped when the snapshot layout changes, older snapshots then need a refresh
+SNAPSHOT_VERSION = 1
+
+
+class SnapshotError(Exception):
+    """A program has no snapshot, or its snapshot doesn't match the run"""
+
+
+def source_hash(source: str) -> str:
+    """Identifies the program text a snapshot was recorded from"""
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def encode_sparse(data: bytes) -> dict:
+    """A dump as its size and its runs of non-zero bytes, [[start, hex bytes], ...]"""
+    runs = []
+    start = None
+    for address, value in enumerate(data + b"\0"):
+        if value and start is None:
+            start = address
+        elif not value and start is not None:
+            runs.append([start, data[start:address].hex()])
+            start = None
+    return {'size': len(data), 'runs': runs}
+
+
+def decode_sparse(sparse: dict) -> bytes:
+    """Inverse of encode_sparse"""
+    data = bytearray(sparse['size'])
+    for start, values in sparse['runs']:
+        values = bytes.fromhex(values)
+        data[start:start + len(values)] = values
+    return bytes(data)
+
+
+class GoldenStore:
+    """One JSON snapshot per test name in golden_dir, meant to be committed"""
+
+    def __init__(self, golden_dir: str = DEFAULT_GOLDEN_DIR):
+        self.golden_dir = Path(golden_dir)
+
+    def path(self, test_name: str) -> Path:
+        return self.golden_dir / f"{test_name}.json"
+
+    def has_snapshots(self) -> bool:
+        """Whether any snapshot has been recorded yet"""
+        return any(self.golden_dir.glob("*.json"))
+
+    def save(self, test_name: str, source: str, program: bytes, golden: dict):
+        """Record a program and its golden state from run_simulator"""
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'source': source_hash(source),
+            'cycle_count': golden['cycle_count'],
+            'program': program.hex(),
+            'memory': encode_sparse(golden['memory']),
+            'registers': encode_sparse(golden['registers']),
+        }
+        self.golden_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(test_name)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}")
+        temp_path.write_text(json.dumps(snapshot, separators=(",", ":")) + "\n")
+        os.replace(temp_path, path)
+
+    def load(self, test_name: str, source: str, max_cycles: int) -> Tuple[bytes, dict]:
+        """A program's machine code and golden state, as prepare_test would produce them
+
+        Raises SnapshotError if there's no snapshot, it was recorded from another
+        version of the source, or the program doesn't halt within max_cycles.
+        """
+        try:
+            snapshot = json.loads(self.path(test_name).read_text())
+        except OSError:
+            raise SnapshotError(f"no golden snapshot {self.path(test_name)}")
+        except ValueError as e:
+            raise SnapshotError(f"unreadable golden snapshot {self.path(test_name)}: {e}")
+
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            raise SnapshotError(f"golden snapshot {self.path(test_name)} has an old layout")
+        if snapshot['source'] != source_hash(source):
+            raise SnapshotError(f"golden snapshot {self.path(test_name)} is for an older "
+                                f"version of the program")
+        if snapshot['cycle_count'] > max_cycles:
+            # The simulator would have stopped without halting
+            raise SnapshotError(f"program halts after {snapshot['cycle_count']} cycles, "
+                                f"the budget is {max_cycles}")
+
+        golden = {'memory': decode_sparse(snapshot['memory']),
+                  'registers': decode_sparse(snapshot['registers']),
+                  'cycle_count': snapshot['cycle_count']}
+        return bytes.fromhex(snapshot['program']), golden
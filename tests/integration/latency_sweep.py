@@ -0,0 +1,85 @@
+"""
+Memory latency sweep for the Turtle CPU test framework
+Runs programs on the software simulator over a grid of instruction fetch and data
+memory latencies and reports each program's slowdown against zero-latency memories
+
+Only the simulator models latency so far. The RTL memories answer in the same
+cycle, so the sweep has no RTL side until data_memory.sv and instruction_memory.sv
+get a matching wait-state parameter.
+"""
+
+import csv
+from pathlib import Path
+from typing import NamedTuple
+
+DEFAULT_FETCH_LATENCIES = [0, 1, 2, 4]
+DEFAULT_DATA_LATENCIES = [0, 1, 2, 4]
+
+
+class LatencySetting(NamedTuple):
+    """Wait cycles of one sweep point, as passed to simulate_program"""
+    fetch: int
+    data: int
+
+    @property
+    def name(self) -> str:
+        return f"f{self.fetch}_d{self.data}"
+
+
+# Every slowdown is relative to this point, it is always part of the sweep
+BASELINE = LatencySetting(0, 0)
+
+
+def sweep_grid(fetch_latencies: list, data_latencies: list) -> list:
+    """Every fetch x data latency combination, the zero-latency baseline first"""
+    grid = [LatencySetting(fetch, data) for fetch in sorted(set(fetch_latencies))
+            for data in sorted(set(data_latencies))]
+    return [BASELINE] + [setting for setting in grid if setting != BASELINE]
+
+
+def slowdown(cycles: dict, setting: LatencySetting):
+    """Cycles at a setting relative to the baseline, None if either run didn't halt"""
+    baseline = cycles.get(BASELINE)
+    value = cycles.get(setting)
+    if not baseline or value is None:
+        return None
+    return value / baseline
+
+
+def sweep_report(results: dict, grid: list) -> list:
+    """Report entries: per program and setting, the cycle count and slowdown
+
+    results maps each program name to {LatencySetting: cycle count or None}.
+    """
+    return [{'program': program,
+             'fetch_latency': setting.fetch,
+             'data_latency': setting.data,
+             'cycles': cycles.get(setting),
+             'slowdown': slowdown(cycles, setting)}
+            for program, cycles in results.items() for setting in grid]
+
+
+def format_sweep_table(results: dict, grid: list) -> str:
+    """One line per program with its slowdown at every setting, '-' where it didn't halt"""
+    lines = [f"  {'Program':<30} {'Cycles':>8} "
+             + " ".join(f"{setting.name:>8}" for setting in grid[1:])]
+    for program, cycles in results.items():
+        baseline = cycles.get(BASELINE)
+        cells = []
+        for setting in grid[1:]:
+            factor = slowdown(cycles, setting)
+            cells.append(f"{'-':>8}" if factor is None else f"{factor:>7.2f}x")
+        lines.append(f"  {program:<30} {'-' if baseline is None else baseline:>8} "
+                     + " ".join(cells))
+    return "\n".join(lines)
+
+
+def write_sweep_csv(csv_file: str, report: list):
+    """Write the sweep report as CSV, one row per program and setting"""
+    with open(Path(csv_file), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['program', 'fetch_latency', 'data_latency',
+                                               'cycles', 'slowdown'])
+        writer.writeheader()
+        for row in report:
+            writer.writerow({**row, 'slowdown': '' if row['slowdown'] is None
+                             else f"{row['slowdown']:.4f}"})
@@ -0,0 +1,228 @@
+"""
+Lockstep co-simulation support for the Turtle CPU test framework
+Parses the testbench's per-retired-instruction RETIRE records and produces the
+same records from a reference model, so a run can stop at the first divergence
+
+turtle-toolkit's simulate_program only reports the final state, so the reference
+trace comes from the small instruction-level model below, built from the RTL's
+encodings (decoder_pkg.sv, alu_pkg.sv, program_counter_pkg.sv). test_lockstep.py
+checks the model's final state against simulate_program for every suite program.
+"""
+
+import re
+from typing import Iterator, NamedTuple, Optional
+
+I_ADDR_MASK = 0xFFF
+D_ADDR_MASK = 0xFFF
+INST_W_BYTES = 2
+
+# Register file addresses (register_file_pkg.sv)
+REG_ACC = 8
+REG_DBAR = 9
+REG_DOFF = 10
+REG_IBAR = 13
+REG_IOFF = 14
+REG_STATUS = 15
+READABLE_REGS = set(range(8)) | {REG_ACC, REG_DBAR, REG_DOFF, REG_IBAR, REG_IOFF, REG_STATUS}
+REG_NAMES = {**{i: f"R{i}" for i in range(8)}, REG_ACC: "ACC", REG_DBAR: "DBAR",
+             REG_DOFF: "DOFF", REG_IBAR: "IBAR", REG_IOFF: "IOFF", REG_STATUS: "STATUS"}
+
+# STATUS flag bits (register_file_pkg.sv)
+ZERO_FLAG = 1 << 0
+POSITIVE_FLAG = 1 << 1
+CARRY_FLAG = 1 << 2
+OVERFLOW_FLAG = 1 << 3
+
+# Opcodes and register/memory functions (decoder_pkg.sv)
+OPCODE_ARITH_LOGIC_IMM = 0b000
+OPCODE_ARITH_LOGIC = 0b001
+OPCODE_REG_MEMORY = 0b010
+OPCODE_JUMP_IMM = 0b100
+OPCODE_JUMP_REG = 0b111
+LOAD, STORE, GET, PUT, SET = range(5)
+
+# ALU functions (alu_pkg.sv)
+ALU_ADD = 0b000
+ALU_SUB = 0b001
+ALU_AND = 0b010
+ALU_OR = 0b100
+ALU_XOR = 0b101
+ALU_INV = 0b111
+
+# Branch conditions (program_counter_pkg.sv): (flag, taken when set)
+BRANCH_CONDITIONS = {
+    0b000: (ZERO_FLAG, True), 0b001: (ZERO_FLAG, False),
+    0b010: (POSITIVE_FLAG, True), 0b011: (POSITIVE_FLAG, False),
+    0b100: (CARRY_FLAG, True), 0b101: (CARRY_FLAG, False),
+    0b110: (OVERFLOW_FLAG, True), 0b111: (OVERFLOW_FLAG, False),
+}
+
+RETIRE_RE = re.compile(
+    r"RETIRE pc=(\S+) instruction=(\S+) acc=(\S+) reg=(-?\d+) value=(\S+) status=(\S+)")
+
+
+class RetireRecord(NamedTuple):
+    """One retired instruction: state after it retires
+
+    reg is the register a PUT wrote (-1 for none) and value its new contents. acc,
+    value and status are None where the RTL printed x/z bits, status_unknown masks
+    STATUS bits that are undefined (x in the RTL, or flags the model can't know).
+    """
+    pc: Optional[int]
+    instruction: Optional[int]
+    acc: Optional[int]
+    reg: int
+    value: Optional[int]
+    status: int
+    status_unknown: int = 0
+
+    def matches(self, other: "RetireRecord") -> bool:
+        """Whether two records agree on every field both sides know"""
+        unknown = self.status_unknown | other.status_unknown
+        return (self.pc == other.pc and self.instruction == other.instruction
+                and self.acc == other.acc and self.reg == other.reg
+                and (self.reg < 0 or self.value == other.value)
+                and (self.status & ~unknown) == (other.status & ~unknown))
+
+    def __str__(self) -> str:
+        def byte(value, digits=2):
+            return "x" * digits if value is None else f"{value:0{digits}x}"
+
+        status = "".join(
+            "x" if self.status_unknown >> bit & 1 else str(self.status >> bit & 1)
+            for bit in reversed(range(8)))
+        put = f" {REG_NAMES.get(self.reg, self.reg)}={byte(self.value)}" if self.reg >= 0 else ""
+        return (f"pc=0x{byte(self.pc, 3)} instruction=0x{byte(self.instruction, 4)} "
+                f"acc={byte(self.acc)}{put} status={status}")
+
+
+def parse_retire_record(line: str) -> Optional[RetireRecord]:
+    """Parse a testbench RETIRE line, None for any other line"""
+    match = RETIRE_RE.search(line)
+    if not match:
+        return None
+
+    def known(text, radix):
+        try:
+            return int(text, radix)
+        except ValueError:
+            return None
+
+    pc, instruction, acc, reg, value, status = match.groups()
+    status_unknown = sum(1 << bit for bit, char in enumerate(reversed(status))
+                         if char not in "01")
+    return RetireRecord(known(pc, 16), known(instruction, 16),
+                        known(acc, 16), int(reg), known(value, 16),
+                        int(status.replace("x", "0").replace("z", "0"), 2), status_unknown)
+
+
+def reference_trace(program: bytes, max_cycles: int,
+                    state: Optional[dict] = None) -> Iterator[RetireRecord]:
+    """Retire records for a program, one per cycle, ending with the HALT self-jump
+
+    Memories and registers start as after reset with cleared memories. The trace
+    stops early if a branch depends on a flag the model can't know. If a state dict
+    is given, its 'memory' (bytearray) and 'registers' (list of 16) entries are the
+    model's live data memory and register file, as of the last record yielded, and
+    'halted' is set once HALT retires.
+    """
+    imem = bytearray(program[:I_ADDR_MASK + 1]).ljust(I_ADDR_MASK + 1, b"\0")
+    dmem = bytearray(D_ADDR_MASK + 1)
+    regs = [0] * 16
+    regs[REG_STATUS] = ZERO_FLAG | POSITIVE_FLAG
+    if state is not None:
+        state.update(memory=dmem, registers=regs, halted=False)
+    status_unknown = 0
+    pc = 0
+
+    for _ in range(max_cycles):
+        instruction = imem[pc] | imem[(pc + 1) & I_ADDR_MASK] << 8
+        next_pc = (pc + INST_W_BYTES) & I_ADDR_MASK
+        put_reg = -1
+        halted = False
+
+        if instruction & 1:
+            # Conditional branch, always PC-relative
+            flag, when_set = BRANCH_CONDITIONS[instruction >> 1 & 0b111]
+            if status_unknown & flag:
+                return
+            if bool(regs[REG_STATUS] & flag) == when_set:
+                next_pc = (pc + (instruction >> 4)) & I_ADDR_MASK
+                halted = next_pc == pc
+        else:
+            op = instruction >> 1 & 0b111
+            function = instruction >> 4 & 0b1111
+            immediate = instruction >> 8
+            reg = instruction >> 8 & 0b1111
+
+            if op in (OPCODE_ARITH_LOGIC_IMM, OPCODE_ARITH_LOGIC):
+                operand_b = immediate if op == OPCODE_ARITH_LOGIC_IMM else _read_reg(regs, reg)
+                result = _alu(regs[REG_ACC], operand_b, function & 0b111)
+                if result is None:
+                    return
+                regs[REG_ACC], flags, unknown_flags = result
+                regs[REG_STATUS] = regs[REG_STATUS] & ~0b1111 | flags
+                status_unknown = status_unknown & ~0b1111 | unknown_flags
+            elif op == OPCODE_REG_MEMORY:
+                dmar = (regs[REG_DBAR] << 8 | regs[REG_DOFF]) & D_ADDR_MASK
+                if function == LOAD:
+                    regs[REG_ACC] = dmem[dmar]
+                elif function == STORE:
+                    dmem[dmar] = regs[REG_ACC]
+                elif function == GET:
+                    regs[REG_ACC] = _read_reg(regs, reg)
+                elif function == PUT:
+                    put_reg = reg
+                    if reg < REG_ACC or reg in (REG_DOFF, REG_IOFF):
+                        regs[reg] = regs[REG_ACC]
+                    elif reg in (REG_DBAR, REG_IBAR):
+                        regs[reg] = regs[REG_ACC] & 0x0F
+                elif function == SET:
+                    regs[REG_ACC] = immediate
+            elif op == OPCODE_JUMP_IMM:
+                next_pc = (pc + (instruction >> 4)) & I_ADDR_MASK
+                halted = next_pc == pc
+            elif op == OPCODE_JUMP_REG:
+                imar = regs[REG_IBAR] << 8 | regs[REG_IOFF]
+                next_pc = (imar if function & 1 else pc + imar) & I_ADDR_MASK
+                halted = next_pc == pc
+
+        yield RetireRecord(pc, instruction, regs[REG_ACC], put_reg,
+                           _read_reg(regs, put_reg) if put_reg >= 0 else None,
+                           regs[REG_STATUS], status_unknown)
+        if halted:
+            if state is not None:
+                state['halted'] = True
+            return
+        pc = next_pc
+
+
+def _read_reg(regs: list, reg: int) -> int:
+    """Register file read port, unimplemented addresses read as 0"""
+    return regs[reg] if reg in READABLE_REGS else 0
+
+
+def _alu(a: int, b: int, function: int) -> Optional[tuple]:
+    """(result, flags, unknown flags) of an ALU function, None if the result is undefined
+
+    Like the RTL, carry and overflow are only defined for ADD and SUB.
+    """
+    if function == ALU_ADD:
+        total = a + b
+        result = total & 0xFF
+        carry = total > 0xFF
+        overflow = (a ^ b) & 0x80 == 0 and (result ^ a) & 0x80 != 0
+    elif function == ALU_SUB:
+        result = (a - b) & 0xFF
+        carry = a >= b  # Not borrow
+        overflow = (a ^ b) & 0x80 != 0 and (result ^ a) & 0x80 != 0
+    elif function in (ALU_AND, ALU_OR, ALU_XOR, ALU_INV):
+        result = {ALU_AND: a & b, ALU_OR: a | b, ALU_XOR: a ^ b, ALU_INV: ~a & 0xFF}[function]
+        flags = (ZERO_FLAG if result == 0 else 0) | (0 if result & 0x80 else POSITIVE_FLAG)
+        return result, flags, CARRY_FLAG | OVERFLOW_FLAG
+    else:
+        return None
+
+    flags = ((ZERO_FLAG if result == 0 else 0) | (0 if result & 0x80 else POSITIVE_FLAG)
+             | (CARRY_FLAG if carry else 0) | (OVERFLOW_FLAG if overflow else 0))
+    return result, flags, 0
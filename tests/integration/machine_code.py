@@ -0,0 +1,32 @@
+"""
+Hand-encoded Turtle CPU machine code for the helper tests
+Builds instruction words and program images without turtle-toolkit's assembler
+"""
+
+try:
+    from .lockstep import OPCODE_JUMP_IMM
+except ImportError:  # Run as a script from tests/integration
+    from lockstep import OPCODE_JUMP_IMM
+
+# Branch conditions (program_counter_pkg.sv)
+BRANCH_ZERO = 0b000
+BRANCH_CARRY = 0b100
+
+
+def encode(op: int, function: int = 0, operand: int = 0) -> int:
+    """A non-branch instruction word: operand, function and opcode, bit 0 clear"""
+    return operand << 8 | function << 4 | op << 1
+
+
+def branch(condition: int, offset: int) -> int:
+    """A conditional branch word, bit 0 set"""
+    return offset << 4 | condition << 1 | 1
+
+
+# A JMPI to itself, what the assembler emits for HALT
+HALT = encode(OPCODE_JUMP_IMM)
+
+
+def program(*instructions: int) -> bytes:
+    """Instruction words as a little-endian program image"""
+    return b"".join(instruction.to_bytes(2, "little") for instruction in instructions)
@@ -0,0 +1,132 @@
+"""
+Memory dump helpers for the Turtle CPU test framework
+Converts between $readmemb/$readmemh text and bytes, and compares dumps in memory
+"""
+
+from typing import Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: comparisons fall back to pure Python
+    np = None
+
+# Dump formats the testbench can write with +dump_format=
+DUMP_FORMATS = ("bin", "hex")
+
+
+def format_memb(data: bytes) -> str:
+    """Format bytes as $readmemb text, one binary byte per line"""
+    return "".join(f"{byte:08b}\n" for byte in data)
+
+
+def format_memh(data: bytes) -> str:
+    """Format bytes as $readmemh text, one two-digit hex byte per line"""
+    return "".join(f"{byte:02x}\n" for byte in data)
+
+
+def format_dump(data: bytes, dump_format: str) -> str:
+    """Format bytes in one of DUMP_FORMATS"""
+    return format_memh(data) if dump_format == "hex" else format_memb(data)
+
+
+def parse_dump(text: str, dump_format: str) -> Tuple[bytearray, set]:
+    """Parse text in one of DUMP_FORMATS, see parse_memb for the return value"""
+    return parse_memh(text) if dump_format == "hex" else parse_memb(text)
+
+
+def parse_memh(text: str) -> Tuple[bytearray, set]:
+    """Parse $writememh text into bytes, see parse_memb for the return value
+
+    The testbench's fixed layout (one hex byte per line, no comments or addresses)
+    decodes in a single bytes.fromhex call. Anything else takes the general path.
+    """
+    try:
+        return bytearray.fromhex("".join(text.split())), set()
+    except ValueError:
+        return _parse_mem(text, 16)
+
+
+def parse_memb(text: str) -> Tuple[bytearray, set]:
+    """Parse $readmemb/$writememb text into bytes
+
+    `//` comments and `@address` directives are handled. Values with x/z bits read
+    as 0, and their addresses are returned as the second element.
+    """
+    return _parse_mem(text, 2)
+
+
+def _parse_mem(text: str, radix: int) -> Tuple[bytearray, set]:
+    """Parse $readmem style text in the given radix, see parse_memb"""
+    data = bytearray()
+    unknown = set()
+    address = 0
+
+    for line in text.splitlines():
+        for word in line.split('//')[0].split():
+            if word.startswith('@'):
+                address = int(word[1:], 16)
+                continue
+
+            if address >= len(data):
+                data.extend(bytes(address + 1 - len(data)))
+            try:
+                data[address] = int(word.replace('_', ''), radix)
+            except ValueError:
+                unknown.add(address)
+                data[address] = 0
+            address += 1
+
+    return data, unknown
+
+
+def find_mismatches(expected: bytes, actual: bytes, unknown: set = frozenset()) -> list:
+    """Sorted addresses where two dumps differ
+
+    Addresses present in only one dump and addresses in unknown (x/z values in the
+    actual dump) always count as mismatches.
+    """
+    common = min(len(expected), len(actual))
+    if expected[:common] == actual[:common] and len(expected) == len(actual) and not unknown:
+        return []
+
+    if np is not None:
+        # One vectorized compare over the whole dump
+        differs = (np.frombuffer(expected, dtype=np.uint8, count=common)
+                   != np.frombuffer(actual, dtype=np.uint8, count=common))
+        mismatches = set(np.flatnonzero(differs).tolist())
+    else:
+        mismatches = {address for address in range(common)
+                      if expected[address] != actual[address]}
+    mismatches.update(range(common, max(len(expected), len(actual))))
+    mismatches.update(unknown)
+    return sorted(mismatches)
+
+
+def mismatch_ranges(addresses: list) -> list:
+    """Group sorted addresses into (first, last) ranges of consecutive addresses"""
+    ranges = []
+    for address in addresses:
+        if ranges and address == ranges[-1][1] + 1:
+            ranges[-1][1] = address
+        else:
+            ranges.append([address, address])
+    return [tuple(address_range) for address_range in ranges]
+
+
+def format_range(data: bytes, first: int, last: int, unknown: set = frozenset(),
+                 limit: int = 16) -> str:
+    """Hex bytes of data[first:last + 1], "xx" for unknown and "--" for missing addresses
+
+    Only the first `limit` bytes are shown.
+    """
+    shown = []
+    for address in range(first, min(last, first + limit - 1) + 1):
+        if address in unknown:
+            shown.append("xx")
+        elif address < len(data):
+            shown.append(f"{data[address]:02x}")
+        else:
+            shown.append("--")
+    if last - first + 1 > limit:
+        shown.append("...")
+    return " ".join(shown)
@@ -0,0 +1,138 @@
+"""
+Performance counters of RTL runs for the Turtle CPU test framework
+Parses the testbench's PERF and PERF_PC records, checks them against the
+simulator's cycle count and formats a hot-PC and per-opcode profile
+"""
+
+import re
+from typing import Optional
+
+try:
+    from .lockstep import (OPCODE_ARITH_LOGIC, OPCODE_ARITH_LOGIC_IMM, OPCODE_JUMP_IMM,
+                           OPCODE_JUMP_REG, OPCODE_REG_MEMORY)
+except ImportError:  # Run as a script from tests/integration
+    from lockstep import (OPCODE_ARITH_LOGIC, OPCODE_ARITH_LOGIC_IMM, OPCODE_JUMP_IMM,
+                          OPCODE_JUMP_REG, OPCODE_REG_MEMORY)
+
+# Totals of the PERF record, in the order the testbench prints them
+PERF_COUNTERS = ['cycles', 'retired', 'branches_taken', 'branches_not_taken', 'jumps',
+                 'loads', 'stores']
+
+PERF_RE = re.compile(r"PERF " + " ".join(rf"{name}=(\d+)" for name in PERF_COUNTERS))
+PERF_PC_RE = re.compile(r"PERF_PC pc=(\S+) instruction=(\S+) count=(\d+)")
+
+# Hottest PCs listed per program
+HOT_PC_LIMIT = 8
+
+# Mnemonics by encoding (decoder_pkg.sv, alu_pkg.sv, program_counter_pkg.sv)
+BRANCH_MNEMONICS = ["BZ", "BNZ", "BP", "BN", "BCS", "BCC", "BOS", "BOC"]
+ALU_MNEMONICS = {0b000: "ADD", 0b001: "SUB", 0b010: "AND", 0b100: "OR", 0b101: "XOR",
+                 0b111: "INV"}
+REG_MEMORY_MNEMONICS = ["LOAD", "STORE", "GET", "PUT", "SET"]
+
+
+def parse_perf_counters(stdout: str) -> Optional[dict]:
+    """Counters of the last program in a testbench log, None if it printed no PERF record
+
+    Returns the PERF totals plus 'pc_counts', a {pc: (instruction, count)} histogram.
+    PCs whose instruction had x/z bits keep the instruction as None.
+    """
+    counters = None
+    for line in stdout.splitlines():
+        match = PERF_RE.search(line)
+        if match:
+            counters = dict(zip(PERF_COUNTERS, map(int, match.groups())))
+            counters['pc_counts'] = {}
+            continue
+
+        match = PERF_PC_RE.search(line)
+        if match and counters is not None:
+            pc, instruction, count = match.groups()
+            try:
+                instruction = int(instruction, 16)
+            except ValueError:
+                instruction = None
+            counters['pc_counts'][int(pc, 16)] = (instruction, int(count))
+    return counters
+
+
+def mnemonic(instruction: Optional[int]) -> str:
+    """Assembler mnemonic of an instruction word, '?' if it doesn't decode"""
+    if instruction is None:
+        return "?"
+    if instruction & 1:
+        return BRANCH_MNEMONICS[instruction >> 1 & 0b111]
+
+    op = instruction >> 1 & 0b111
+    function = instruction >> 4 & 0b1111
+    if op in (OPCODE_ARITH_LOGIC_IMM, OPCODE_ARITH_LOGIC):
+        name = ALU_MNEMONICS.get(function & 0b111)
+        if name is None:
+            return "?"
+        return f"{name}I" if op == OPCODE_ARITH_LOGIC_IMM and name != "INV" else name
+    if op == OPCODE_REG_MEMORY:
+        return REG_MEMORY_MNEMONICS[function] if function < len(REG_MEMORY_MNEMONICS) else "?"
+    if op == OPCODE_JUMP_IMM:
+        return "JMPI"
+    if op == OPCODE_JUMP_REG:
+        return "JMP" if function & 1 else "JMPR"
+    return "?"
+
+
+def opcode_profile(counters: dict) -> dict:
+    """Retired instructions per mnemonic, most frequent first"""
+    profile = {}
+    for instruction, count in counters['pc_counts'].values():
+        name = mnemonic(instruction)
+        profile[name] = profile.get(name, 0) + count
+    return dict(sorted(profile.items(), key=lambda item: (-item[1], item[0])))
+
+
+def check_counters(counters: dict, sim_cycles: Optional[int]) -> list:
+    """Inconsistencies between the counters and against the simulator's cycle count
+
+    The testbench counts a retirement every cycle, so the retired count can't tell
+    anything the cycle count doesn't; the simulator's cycle count is the independent
+    check. The PC histogram must add up to the retired count, or PERF_PC records
+    were lost. Returns a list of messages.
+    """
+    problems = []
+    if sim_cycles is not None and counters['cycles'] != sim_cycles:
+        problems.append(f"RTL ran {counters['cycles']} cycles, the simulator {sim_cycles} "
+                        f"({counters['cycles'] - sim_cycles:+d})")
+    histogram_total = sum(count for _, count in counters['pc_counts'].values())
+    if histogram_total != counters['retired']:
+        problems.append(f"PC histogram holds {histogram_total} of "
+                        f"{counters['retired']} retired instructions")
+    return problems
+
+
+def perf_summary(counters: dict) -> dict:
+    """Counters for the results and reports: the totals and the per-opcode profile"""
+    summary = {name: counters[name] for name in PERF_COUNTERS}
+    summary['opcodes'] = opcode_profile(counters)
+    return summary
+
+
+def format_profile(counters: dict, limit: int = HOT_PC_LIMIT) -> str:
+    """Counter totals, the hottest PCs and the per-opcode profile as printable lines"""
+    retired = counters['retired'] or 1
+    branches = counters['branches_taken'] + counters['branches_not_taken']
+    lines = [f"  cycles {counters['cycles']}, retired {counters['retired']}, "
+             f"branches {branches} ({counters['branches_taken']} taken), "
+             f"jumps {counters['jumps']}, loads {counters['loads']}, "
+             f"stores {counters['stores']}"]
+
+    hot = sorted(counters['pc_counts'].items(), key=lambda item: (-item[1][1], item[0]))
+    lines.append("  hot PCs:")
+    for pc, (instruction, count) in hot[:limit]:
+        word = "????" if instruction is None else f"{instruction:04x}"
+        lines.append(f"    0x{pc:03x}  {word}  {mnemonic(instruction):<6} "
+                     f"{count:8d}  {count / retired * 100:5.1f}%")
+    if len(hot) > limit:
+        lines.append(f"    ... and {len(hot) - limit} more PCs")
+
+    lines.append("  opcodes:")
+    for name, count in opcode_profile(counters).items():
+        lines.append(f"    {name:<6} {count:8d}  {count / retired * 100:5.1f}%")
+    return "\n".join(lines)
@@ -0,0 +1,79 @@
+"""
+Asyncio helpers for the Turtle CPU test framework's pipelined suite runs
+Routes each test's printed output into its own log while stages of several tests
+overlap, and runs a subprocess with its output checked line by line as it arrives
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import io
+import os
+import signal
+from typing import Callable, Optional, Tuple
+
+# Programs assembled and golden-simulated ahead of the RTL simulation in progress
+DEFAULT_PIPELINE_DEPTH = 2
+
+# Log of the test whose stage is running, None outside a test
+_current_log: contextvars.ContextVar = contextvars.ContextVar("turtle_test_log", default=None)
+
+
+class LogRouter(io.TextIOBase):
+    """sys.stdout replacement that sends each test's output to that test's log
+
+    The log is looked up in a context variable, which asyncio tasks and
+    asyncio.to_thread carry along, so overlapping stages never interleave their
+    output. Writes outside a test go to the real stdout.
+    """
+
+    def __init__(self, stdout):
+        self.stdout = stdout
+
+    def write(self, text: str) -> int:
+        log = _current_log.get()
+        return (log if log is not None else self.stdout).write(text)
+
+    def flush(self):
+        self.stdout.flush()
+
+    @staticmethod
+    def start_test() -> io.StringIO:
+        """Give the calling task (and the threads it starts) a fresh log, return it"""
+        log = io.StringIO()
+        _current_log.set(log)
+        return log
+
+
+async def stream_process(cmd: list, cwd: str,
+                         abort: Callable[[str], bool]) -> Tuple[int, str, Optional[str]]:
+    """Run a command and check each stdout/stderr line as it arrives
+
+    The process is killed with its whole group at the first line abort() accepts.
+    Returns (return code, merged output, the aborting line or None).
+    """
+    # A session of its own lets the whole make/simulator tree be killed at once
+    process = await asyncio.create_subprocess_exec(
+        *cmd, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+        start_new_session=True)
+    output = []
+    aborted = None
+    try:
+        async for raw_line in process.stdout:
+            line = raw_line.decode(errors="replace")
+            output.append(line)
+            if abort(line):
+                aborted = line.strip()
+                _kill_group(process.pid)
+                break
+    except BaseException:
+        _kill_group(process.pid)  # Cancelled while streaming
+        await process.wait()
+        raise
+    return await process.wait(), "".join(output), aborted
+
+
+def _kill_group(pid: int):
+    """SIGTERM a process group that may have exited already"""
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(pid, signal.SIGTERM)
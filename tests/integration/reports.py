@@ -0,0 +1,129 @@
+"""
+Machine-readable reports for the Turtle CPU test framework
+Writes JSON and JUnit XML reports of a run and compares a run against a baseline
+JSON report to flag phases that got slower
+"""
+
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Phases reported per test, in pipeline order. Framework overhead is whatever part of a
+# test's time none of the other phases account for. --rtl-only runs load a golden
+# snapshot in place of assembly and simulation.
+REPORT_PHASES = ['snapshot', 'assembly', 'simulation', 'rtl_simulation', 'comparison',
+                 'debug_trace']
+
+# Phases reported but outside a test's time: a failing test's traced rerun runs after
+# the test's time is taken
+UNTIMED_PHASES = {'debug_trace'}
+UNIT_REPORT_PHASES = ['unit_build', 'unit_run']
+
+# Testbench output counts reported per unit testbench
+UNIT_REPORT_COUNTS = ['errors', 'failed_checks', 'passed_checks']
+
+DEFAULT_REGRESSION_THRESHOLD = 20.0  # Percent
+
+# Phases faster than this in the baseline are too noisy to flag
+MIN_BASELINE_SECONDS = 0.05
+
+
+def test_report(result: dict) -> dict:
+    """JSON report entry of one test_results entry, an integration test or a unit testbench"""
+    kind = result.get('kind', 'integration')
+    report_phases = UNIT_REPORT_PHASES if kind == 'unit' else REPORT_PHASES
+    phases = {phase: result.get('phases', {}).get(phase, 0.0) for phase in report_phases}
+    timed = sum(seconds for phase, seconds in phases.items() if phase not in UNTIMED_PHASES)
+    phases['framework_overhead'] = max(0.0, result['time'] - timed)
+
+    rtl_cycles = result.get('rtl_cycles')
+    rtl_time = phases.get('rtl_simulation', 0.0)
+    report = {
+        'kind': kind,
+        'status': result['status'],
+        'time': result['time'],
+        'phases': phases,
+        'sim_cycles': result.get('sim_cycles'),
+        'rtl_cycles': rtl_cycles,
+        'rtl_cycles_per_second': rtl_cycles / rtl_time if rtl_cycles and rtl_time > 0 else None,
+    }
+    for key in UNIT_REPORT_COUNTS:
+        if key in result:
+            report[key] = result[key]
+    if 'perf' in result:
+        report['perf'] = result['perf']
+        report['perf_warnings'] = result.get('perf_warnings', [])
+    return report
+
+
+def build_report(test_results: dict, timing_data: dict, run_info: dict) -> dict:
+    """Whole-run report: run settings and totals, per-phase totals and one entry per test"""
+    tests = {name: test_report(result) for name, result in test_results.items()}
+    passed = sum(1 for test in tests.values() if test['status'] == 'PASSED')
+    return {
+        'run': {**run_info, 'tests': len(tests), 'passed': passed,
+                'failed': len(tests) - passed},
+        'phase_totals': {phase: sum(times) for phase, times in timing_data.items()},
+        'tests': tests,
+    }
+
+
+def write_json_report(report: dict, report_file: str):
+    """Write a report as JSON"""
+    Path(report_file).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def write_junit_report(report: dict, junit_file: str):
+    """Write a report as JUnit XML, phases and cycle counts as testcase properties"""
+    tests = report['tests']
+    suite = ET.Element('testsuite', {
+        'name': 'turtle-cpu-integration',
+        'tests': str(len(tests)),
+        'failures': str(report['run']['failed']),
+        'time': f"{sum(test['time'] for test in tests.values()):.3f}",
+    })
+
+    for name, test in tests.items():
+        case = ET.SubElement(suite, 'testcase', {
+            'classname': test['kind'], 'name': name, 'time': f"{test['time']:.3f}"})
+        properties = ET.SubElement(case, 'properties')
+        for phase, seconds in test['phases'].items():
+            ET.SubElement(properties, 'property',
+                          {'name': f"phase.{phase}", 'value': f"{seconds:.4f}"})
+        for key in ('sim_cycles', 'rtl_cycles', 'rtl_cycles_per_second'):
+            if test[key] is not None:
+                ET.SubElement(properties, 'property', {'name': key, 'value': str(test[key])})
+        for counter, value in test.get('perf', {}).items():
+            if counter != 'opcodes':
+                ET.SubElement(properties, 'property',
+                              {'name': f"perf.{counter}", 'value': str(value)})
+        if test['status'] != 'PASSED':
+            message = ('Unit testbench failed' if test['kind'] == 'unit'
+                       else 'RTL and simulator results differ')
+            ET.SubElement(case, 'failure', {'message': message})
+
+    tree = ET.ElementTree(ET.Element('testsuites'))
+    tree.getroot().append(suite)
+    ET.indent(tree)
+    tree.write(junit_file, encoding='utf-8', xml_declaration=True)
+
+
+def compare_reports(report: dict, baseline: dict,
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> list:
+    """Phases slower than in the baseline by more than threshold percent
+
+    Returns (test, phase, baseline seconds, current seconds) tuples for every test
+    and phase present in both reports.
+    """
+    regressions = []
+    for name, test in report['tests'].items():
+        baseline_test = baseline.get('tests', {}).get(name)
+        if baseline_test is None:
+            continue
+        for phase, seconds in test['phases'].items():
+            baseline_seconds = baseline_test.get('phases', {}).get(phase)
+            if baseline_seconds is None or baseline_seconds < MIN_BASELINE_SECONDS:
+                continue
+            if seconds > baseline_seconds * (1 + threshold / 100):
+                regressions.append((name, phase, baseline_seconds, seconds))
+    return regressions
@@ -0,0 +1,100 @@
+"""
+Content-addressed result cache for the Turtle CPU test framework
+Stores assembled programs, simulator golden dumps and RTL build outputs on disk,
+keyed by hashes of everything that determines them
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_SIZE_MB = 512
+
+
+class ResultCache:
+    def __init__(self, cache_dir: str, max_size_mb: int = DEFAULT_CACHE_SIZE_MB):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.stats = {}  # kind -> {'hits': n, 'misses': n}
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Hash str/bytes parts into a cache key (length-prefixed so parts can't run together)"""
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode()
+            digest.update(len(part).to_bytes(8, 'little'))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def entry_dir(self, kind: str, key: str) -> Path:
+        """Directory holding the files of one cache entry"""
+        return self.cache_dir / kind / key
+
+    def lookup(self, kind: str, key: str) -> Optional[Path]:
+        """Return the entry directory on a hit, None on a miss"""
+        entry = self.entry_dir(kind, key)
+        counts = self.stats.setdefault(kind, {'hits': 0, 'misses': 0})
+
+        if entry.is_dir():
+            # Touch the entry so prune() evicts least recently used entries first
+            os.utime(entry)
+            counts['hits'] += 1
+            return entry
+
+        counts['misses'] += 1
+        return None
+
+    def store(self, kind: str, key: str, files: dict = None, texts: dict = None):
+        """Store an entry from files ({name: path}, directories copied whole) and texts ({name: str})
+
+        The entry is staged next to its final location and renamed into place, so parallel
+        workers never see a partial entry. If another worker stored it first, ours is dropped.
+        """
+        entry = self.entry_dir(kind, key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key}_", dir=entry.parent))
+
+        try:
+            for name, src in (files or {}).items():
+                src = Path(src)
+                if src.is_dir():
+                    shutil.copytree(src, staging / name, symlinks=True)
+                else:
+                    shutil.copyfile(src, staging / name)
+            for name, text in (texts or {}).items():
+                (staging / name).write_text(text)
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def prune(self):
+        """Evict least recently used entries until the cache fits in max_size_bytes"""
+        if not self.cache_dir.exists():
+            return
+
+        entries = []
+        for kind_dir in self.cache_dir.iterdir():
+            if not kind_dir.is_dir():
+                continue
+            for entry in kind_dir.iterdir():
+                if entry.name.startswith('.'):
+                    continue  # Entry still being staged by another process
+                entries.append((entry.stat().st_mtime, tree_size(entry), entry))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+
+def tree_size(path: Path) -> int:
+    """Total size in bytes of the regular files under path"""
+    return sum(f.stat().st_size for f in path.rglob("*")
+               if f.is_file() and not f.is_symlink())
@@ -0,0 +1,411 @@
+"""
+Synthesis and formal scaling benchmarks for the Turtle CPU RTL blocks
+Defines yosys synthesis, eqy equivalence and sby proof runs over parameter grids,
+derives each point's scripts from the blocks' own synth/lec/formal files, and keeps
+a JSON history of cell counts, run times and results to flag regressions.
+run_rtl_bench runs the points in parallel, each in its own work directory (--rtl-bench).
+"""
+
+import contextlib
+import io
+import itertools
+import json
+import os
+import re
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+try:
+    from .reports import DEFAULT_REGRESSION_THRESHOLD
+except ImportError:  # Run as a script from tests/integration
+    from reports import DEFAULT_REGRESSION_THRESHOLD
+
+DEFAULT_BENCH_HISTORY = Path(__file__).parent / "rtl_bench_history.json"
+
+# Runs kept in the history file, oldest dropped first
+HISTORY_LIMIT = 50
+
+# Slowdowns under this many seconds are noise, whatever the percentage
+MIN_REGRESSION_SECONDS = 1.0
+
+# A passing proof that used this share of its sby timeout is about to time out
+TIMEOUT_HEADROOM = 0.8
+
+
+class Bench(NamedTuple):
+    """One benchmark: a tool run on a block's top module over a parameter grid
+
+    sources are relative to the block directory, packages (*_pkg.sv) first. Every
+    other source is converted by sv2v together with the packages into
+    scratch/<stem>.v. config is the block's .eqy or .sby file for lec and formal.
+    """
+    name: str
+    tool: str  # synth, lec or formal
+    block: str
+    top: str
+    sources: tuple
+    grid: tuple  # ((parameter, (values...)), ...)
+    config: str = ""
+    tasks: tuple = ()  # sby tasks, each its own point
+
+
+BENCHES = [
+    Bench("alu_synth", "synth", "alu", "alu", ("rtl/alu_pkg.sv", "rtl/alu.sv"),
+          (("DATA_W", (4, 8, 16, 32)),)),
+    Bench("alu_lec", "lec", "alu", "alu", ("rtl/alu_pkg.sv", "rtl/alu.sv", "rtl/alu_gates.sv"),
+          (("DATA_W", (4, 8, 16)),), config="lec.eqy"),
+    Bench("data_memory_synth", "synth", "data_memory", "data_memory",
+          ("rtl/data_memory.sv",), (("D_ADDR_W", (4, 6, 8)),)),
+    Bench("fifo_sync_synth", "synth", "wrapper_fpga_basys3", "fifo_sync",
+          ("rtl/fifo_sync.sv",), (("ENTRIES", (4, 12, 32)), ("DATA_W", (8,)))),
+    Bench("fifo_sync_formal", "formal", "wrapper_fpga_basys3", "fifo_sync",
+          ("rtl/fifo_sync.sv",), (("ENTRIES", (4, 12, 32)), ("DATA_W", (8,))),
+          config="rtl/formal.sby", tasks=("bmc", "prove")),
+]
+BENCH_NAMES = [bench.name for bench in BENCHES]
+
+
+class BenchPoint(NamedTuple):
+    """One run of a bench: its parameter values and, for sby, the task"""
+    bench: Bench
+    params: tuple  # ((parameter, value), ...)
+    task: str = ""
+
+    @property
+    def name(self) -> str:
+        task = f".{self.task}" if self.task else ""
+        values = ",".join(f"{param}={value}" for param, value in self.params)
+        return f"{self.bench.name}{task}[{values}]"
+
+
+def bench_points(names: list = None, overrides: dict = None) -> list:
+    """Points of the named benches (all by default) over their grids
+
+    overrides maps a parameter to the values to use instead of a bench's own.
+    """
+    overrides = overrides or {}
+    points = []
+    for bench in BENCHES:
+        if names and bench.name not in names:
+            continue
+        grid = [[(param, value) for value in overrides.get(param, values)]
+                for param, values in bench.grid]
+        for params in itertools.product(*grid):
+            for task in bench.tasks or ("",):
+                points.append(BenchPoint(bench, tuple(params), task))
+    return points
+
+
+def parse_overrides(specs: list) -> dict:
+    """--bench-param PARAM=V1,V2 values as {PARAM: (V1, V2)}, ValueError if malformed"""
+    overrides = {}
+    for spec in specs or []:
+        param, _, values = spec.partition("=")
+        if not param or not values:
+            raise ValueError(f"expected PARAM=V1,V2,..., got {spec!r}")
+        overrides[param] = tuple(int(value) for value in values.split(","))
+    return overrides
+
+
+def with_params(script: str, top: str, params: tuple) -> str:
+    """A yosys script with `chparam` lines for top before each of its `prep` commands"""
+    chparams = [f"chparam -set {param} {value} {top}" for param, value in params]
+    lines = []
+    for line in script.splitlines():
+        if re.match(r"\s*prep\b", line):
+            lines += chparams
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def synth_script(top: str, design_files: list, params: tuple) -> str:
+    """yosys script that synthesizes top and writes its statistics to stat.json"""
+    reads = [f"read_verilog {path}" for path in design_files]
+    return with_params("\n".join(reads + [f"prep -top {top}", f"synth -top {top}",
+                                          "tee -q -o stat.json stat -json"]), top, params)
+
+
+def sby_config(sby: str, sby_dir: Path, top: str, params: tuple) -> str:
+    """An sby file with the parameters set and its [files] made absolute, to run elsewhere"""
+    section = None
+    lines = []
+    for line in with_params(sby, top, params).splitlines():
+        match = re.match(r"\s*\[(\w+)\]", line)
+        if match:
+            section = match.group(1)
+        elif section == "files" and line.strip() and not Path(line.strip()).is_absolute():
+            line = str((sby_dir / line.strip()).resolve())
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def sby_timeout(sby: str, task: str) -> Optional[int]:
+    """The `timeout` option of a task in an sby file, None if it has none"""
+    match = re.search(rf"^\s*{re.escape(task)}:\s*timeout\s+(\d+)", sby, re.MULTILINE)
+    return int(match.group(1)) if match else None
+
+
+def parse_cell_count(stat: dict) -> Optional[int]:
+    """Total cell count from yosys `stat -json` output"""
+    if 'design' in stat and 'num_cells' in stat['design']:
+        return stat['design']['num_cells']
+    modules = stat.get('modules', {})
+    if not modules:
+        return None
+    return sum(module.get('num_cells', 0) for module in modules.values())
+
+
+def read_status(status_file: Path, returncode: int) -> str:
+    """PASS/FAIL/TIMEOUT/... from an sby or eqy status file, else from the return code"""
+    try:
+        words = status_file.read_text().split()
+    except OSError:
+        words = []
+    if words:
+        return words[0].upper()
+    return "PASS" if returncode == 0 else "ERROR"
+
+
+def load_history(history_file: Path) -> list:
+    """Earlier runs from a history file, oldest first"""
+    try:
+        return json.loads(Path(history_file).read_text()).get('runs', [])
+    except (OSError, ValueError):
+        return []
+
+
+def append_history(history_file: Path, results: list, runs: list = None):
+    """Add a run's results to the history file, keeping the last HISTORY_LIMIT runs"""
+    runs = (load_history(history_file) if runs is None else list(runs))
+    runs.append({'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 'results': {result['point']: result for result in results}})
+    Path(history_file).write_text(
+        json.dumps({'runs': runs[-HISTORY_LIMIT:]}, indent=2) + "\n")
+
+
+def previous_result(runs: list, point: str) -> Optional[dict]:
+    """The most recent earlier result of a point"""
+    for run in reversed(runs):
+        if point in run['results']:
+            return run['results'][point]
+    return None
+
+
+def find_regressions(results: list, runs: list, threshold: float) -> list:
+    """Messages for points that got worse than their previous result
+
+    A point regresses when it stops passing, or its cell count or run time grew by
+    more than threshold percent. Run times also have to grow by MIN_REGRESSION_SECONDS.
+    """
+    messages = []
+    for result in results:
+        before = previous_result(runs, result['point'])
+        if before is None:
+            continue
+        if before['status'] == "PASS" and result['status'] != "PASS":
+            messages.append(f"{result['point']}: {before['status']} -> {result['status']}")
+        if before.get('cells') and result.get('cells') is not None \
+                and result['cells'] > before['cells'] * (1 + threshold / 100):
+            messages.append(f"{result['point']}: {before['cells']} -> {result['cells']} cells "
+                            f"(+{(result['cells'] / before['cells'] - 1) * 100:.0f}%)")
+        slower = result['seconds'] - before['seconds']
+        if slower >= MIN_REGRESSION_SECONDS \
+                and result['seconds'] > before['seconds'] * (1 + threshold / 100):
+            messages.append(f"{result['point']}: {before['seconds']:.2f}s -> "
+                            f"{result['seconds']:.2f}s (+{slower:.2f}s)")
+    return messages
+
+
+def timeout_warnings(results: list) -> list:
+    """Passing points that used up most of their sby timeout"""
+    return [f"{result['point']}: {result['seconds']:.1f}s of a {result['timeout']}s timeout"
+            for result in results
+            if result['status'] == "PASS" and result.get('timeout')
+            and result['seconds'] >= result['timeout'] * TIMEOUT_HEADROOM]
+
+
+def format_bench_table(results: list) -> str:
+    """One line per point: result, run time and cell count"""
+    lines = [f"  {'Point':<48} {'Result':<8} {'Time':>9} {'Cells':>8}"]
+    for result in results:
+        cells = '-' if result.get('cells') is None else result['cells']
+        lines.append(f"  {result['point']:<48} {result['status']:<8} "
+                     f"{result['seconds']:>8.2f}s {cells:>8}")
+    return "\n".join(lines)
+
+
+def run_rtl_bench(framework, points: list, history_file: Path = DEFAULT_BENCH_HISTORY,
+                  threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> bool:
+    """Run synthesis, equivalence and proof benchmark points and check them for regressions
+
+    Points run in a process pool of framework.jobs workers, or one per CPU. The
+    results go into framework.bench_results and their run times into its
+    timing_data. Each result is compared against its last one in history_file,
+    then the run is appended. Fails if a point doesn't pass, or its run time or
+    cell count regressed by more than threshold percent.
+    """
+    workers = framework.jobs if framework.jobs > 1 else (os.cpu_count() or 1)
+    print(f"\n📐 Running {len(points)} synthesis and formal benchmark points "
+          f"with {workers} parallel jobs")
+    start_time = time.time()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="turtle_bench_",
+                                     dir=framework.scratch_dir) as scratch_root:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_bench_worker, framework.project_root, point,
+                                   Path(scratch_root), framework.debug_dir,
+                                   framework.save_debug): point
+                       for point in points}
+            for future in as_completed(futures):
+                point = futures[future]
+                try:
+                    result, log = future.result()
+                except Exception as e:
+                    print(f"❌ {point.name} FAILED with worker exception: {e}")
+                    result = {'point': point.name, 'status': 'ERROR', 'seconds': 0.0,
+                              'cells': None}
+                else:
+                    print(log, end="")
+                results[point] = result
+
+    framework.bench_results = [results[point] for point in points]
+    for point in points:
+        framework.timing_data.setdefault(f"bench_{point.bench.tool}", []).append(
+            results[point]['seconds'])
+
+    print("\n📐 SYNTHESIS AND FORMAL BENCHMARKS")
+    print(f"{'─'*78}")
+    print(format_bench_table(framework.bench_results))
+    print(f"{'─'*78}")
+    print(f"  {'Wall Time':<30}: {time.time() - start_time:.2f}s")
+
+    runs = load_history(history_file)
+    regressions = find_regressions(framework.bench_results, runs, threshold)
+    append_history(history_file, framework.bench_results, runs)
+    print(f"📄 Benchmark history written to {history_file}")
+
+    for warning in timeout_warnings(framework.bench_results):
+        print(f"⚠️  Close to the sby timeout: {warning}")
+    if regressions:
+        print(f"\n🐢 {len(regressions)} benchmark regressions against the last run "
+              f"(threshold {threshold:g}%):")
+        for message in regressions:
+            print(f"  • {message}")
+
+    passed = all(result['status'] == "PASS" for result in framework.bench_results)
+    return passed and not regressions
+
+
+def run_bench_point(project_root: Path, point: BenchPoint, scratch_root: Path,
+                    debug_dir: Path, save_debug: bool = False) -> dict:
+    """Run one benchmark point's tool in its own work directory, return its result
+
+    Only the tool run is timed, the sv2v conversion of the sources is not. The
+    tool output is saved to debug_dir/rtl_bench unless the point passed.
+    """
+    bench = point.bench
+    print(f"\n📐 {point.name}")
+    block_dir = project_root / "src" / bench.block
+    work_dir = Path(tempfile.mkdtemp(prefix=f"{bench.name}_", dir=scratch_root))
+    result = {'point': point.name, 'bench': bench.name, 'tool': bench.tool,
+              'task': point.task, 'params': dict(point.params),
+              'status': 'ERROR', 'seconds': 0.0, 'cells': None}
+
+    status_file = None
+    if bench.tool == "formal":
+        config_file = block_dir / bench.config
+        sby = config_file.read_text()
+        (work_dir / "bench.sby").write_text(
+            sby_config(sby, config_file.parent, bench.top, point.params))
+        cmd = ["sby", "-f", "bench.sby", point.task]
+        status_file = work_dir / f"bench_{point.task}" / "status"
+        result['timeout'] = sby_timeout(sby, point.task)
+    else:
+        design_files = convert_bench_sources(bench, block_dir, work_dir)
+        if design_files is None:
+            return result
+        if bench.tool == "lec":
+            eqy = (block_dir / bench.config).read_text()
+            (work_dir / "bench.eqy").write_text(with_params(eqy, bench.top, point.params))
+            cmd = ["eqy", "-f", "bench.eqy"]
+            status_file = work_dir / "bench" / "status"
+        else:
+            (work_dir / "synth.ys").write_text(
+                synth_script(bench.top, design_files, point.params))
+            cmd = ["yosys", "-q", "-s", "synth.ys"]
+
+    start_time = time.time()
+    returncode, stdout, stderr = run_tool(cmd, work_dir)
+    result['seconds'] = time.time() - start_time
+
+    if status_file is not None:
+        result['status'] = read_status(status_file, returncode)
+    elif returncode == 0:
+        try:
+            stat = json.loads((work_dir / "stat.json").read_text())
+        except (OSError, ValueError):
+            stat = {}
+        result['cells'] = parse_cell_count(stat)
+        result['status'] = "PASS" if result['cells'] is not None else "ERROR"
+
+    cells = f", {result['cells']} cells" if result['cells'] is not None else ""
+    if result['status'] == "PASS":
+        print(f"✅ {bench.tool} passed in {result['seconds']:.2f}s{cells}")
+    else:
+        print(f"❌ {bench.tool} {result['status']} after {result['seconds']:.2f}s "
+              f"(return code {returncode})")
+    if save_debug or result['status'] != "PASS":
+        bench_debug_dir = debug_dir / "rtl_bench"
+        bench_debug_dir.mkdir(parents=True, exist_ok=True)
+        log_file = bench_debug_dir / (re.sub(r"[^\w.=-]", "_", point.name) + ".log")
+        log_file.write_text(stdout + stderr)
+        print(f"💾 Tool output saved to: {log_file}")
+    return result
+
+
+def convert_bench_sources(bench: Bench, block_dir: Path, work_dir: Path) -> Optional[list]:
+    """sv2v each non-package source of a bench, with the packages, into scratch/<stem>.v
+
+    Returns the converted files relative to work_dir, None if sv2v failed.
+    """
+    sources = [block_dir / source for source in bench.sources]
+    packages = [source for source in sources if source.stem.endswith("_pkg")]
+    scratch_dir = work_dir / "scratch"
+    scratch_dir.mkdir()
+    design_files = []
+    for source in sources:
+        if source in packages:
+            continue
+        returncode, stdout, stderr = run_tool(
+            ["sv2v", *map(str, packages), str(source)], work_dir)
+        if returncode != 0:
+            print(f"❌ sv2v failed on {source.name} (return code {returncode})")
+            print(f"STDERR: {stderr}")
+            return None
+        (scratch_dir / f"{source.stem}.v").write_text(stdout)
+        design_files.append(f"scratch/{source.stem}.v")
+    return design_files
+
+
+def run_tool(cmd: list, work_dir: Path) -> Tuple[int, str, str]:
+    """Run a tool in a work directory, return (return code, stdout, stderr)"""
+    print(f"Running: {' '.join(cmd)}")
+    try:
+        result = subprocess.run(cmd, cwd=work_dir, capture_output=True, text=True, check=False)
+    except OSError as e:
+        return -1, "", str(e)
+    return result.returncode, result.stdout, result.stderr
+
+
+def _run_bench_worker(project_root: Path, point: BenchPoint, scratch_root: Path,
+                      debug_dir: Path, save_debug: bool) -> Tuple[dict, str]:
+    """Run one benchmark point in a worker process, return (result, log)"""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        result = run_bench_point(project_root, point, scratch_root, debug_dir, save_debug)
+    return result, log.getvalue()
@@ -0,0 +1,10 @@
+"""
+Pytest entry point for the Turtle CPU integration tests
+Each suite program is one parametrized test, see conftest.py
+"""
+
+
+def test_program(turtle_framework, asm_file):
+    """Assemble and simulate a program, run it on the RTL and compare the results"""
+    assert turtle_framework.test_assembly_program(str(asm_file)), \
+        f"{asm_file.name}: RTL and simulator results differ (see captured stdout)"
@@ -0,0 +1,85 @@
+"""
+Tests for backend selection and the Verilator source list in backends.py
+"""
+
+from pathlib import Path
+
+import pytest
+
+from .backends import (BACKENDS, DEFAULT_BACKEND, TOP_MODULE, MakeBackend, VerilatorBackend,
+                       _block_dirs, _include_files, make_backend, program_plusargs)
+
+SRC_DIR = Path(__file__).parent.parent.parent / "src"
+
+# top includes mid and leaf, mid includes leaf again, the way the block Makefiles do
+MAKEFILES = {
+    "leaf": "include ../../rtl-toolkit/tools/tool_flows.mk\n"
+            "INCLUDE_FILES := leaf_pkg.sv\n",
+    "mid": "include ../leaf/Makefile\n"
+           "LEAF_INCLUDE_FILES := $(INCLUDE_FILES)\n"
+           "INCLUDE_FILES := $(LEAF_INCLUDE_FILES) mid_pkg.sv mid_defs.svh\n",
+    "top": "include ../mid/Makefile\n"
+           "include ../leaf/Makefile\n"
+           "INCLUDE_FILES := top_pkg.sv\n",
+}
+
+
+@pytest.fixture
+def blocks(tmp_path):
+    for block, makefile in MAKEFILES.items():
+        (tmp_path / block / "rtl").mkdir(parents=True)
+        (tmp_path / block / "rtl" / f"{block}_pkg.sv").touch()
+        (tmp_path / block / "Makefile").write_text(makefile)
+    return tmp_path
+
+
+def test_make_backend():
+    assert DEFAULT_BACKEND in BACKENDS
+    assert isinstance(make_backend("make", SRC_DIR), MakeBackend)
+    assert isinstance(make_backend("verilator", SRC_DIR), VerilatorBackend)
+    with pytest.raises(KeyError):
+        make_backend("iverilog", SRC_DIR)
+
+
+def test_backends_keep_their_own_stamps():
+    assert MakeBackend.build_stamp != VerilatorBackend.build_stamp
+
+
+def test_run_commands():
+    plusargs = program_plusargs("/tmp/p.binstr", "/tmp/m.hex", "/tmp/r.hex")
+    assert MakeBackend(SRC_DIR).run_command(plusargs) == ["make", "run", f"PLUSARGS={plusargs}"]
+    command = make_backend("verilator", SRC_DIR / "turtle_cpu_top").run_command(plusargs)
+    assert command[0].endswith(f"obj_verilator/V{TOP_MODULE}")
+    assert command[1:] == ["+initial_instruction_memory_file=/tmp/p.binstr",
+                           "+final_data_memory_file=/tmp/m.hex", "+final_register_file=/tmp/r.hex"]
+
+
+def test_block_dirs(blocks):
+    assert _block_dirs(blocks / "top") == [blocks / "top", blocks / "mid", blocks / "leaf"]
+    assert _block_dirs(blocks / "leaf") == [blocks / "leaf"]
+
+
+def test_include_files(blocks):
+    # Included blocks first, in include order, each file once; only .sv files
+    assert _include_files(blocks / "top") == ["leaf_pkg.sv", "mid_pkg.sv", "top_pkg.sv"]
+    assert _include_files(blocks / "leaf") == ["leaf_pkg.sv"]
+
+
+def test_include_files_project():
+    names = _include_files(SRC_DIR / "decoder")
+    assert names.index("register_file_pkg.sv") < names.index("program_counter_pkg.sv") \
+        < names.index("decoder_pkg.sv")
+    assert "alu_pkg.sv" in names
+
+
+def test_verilator_build_command(blocks):
+    (blocks / "top" / "tb").mkdir()
+    command = VerilatorBackend(blocks / "top").build_command()
+    assert command[0] == "verilator"
+    assert command[command.index("--top-module") + 1] == TOP_MODULE
+    assert f"+incdir+{blocks.resolve() / 'top' / 'tb'}" in command
+    assert command.count("-y") == 4  # top/rtl, top/tb, mid/rtl, leaf/rtl
+    # Packages in INCLUDE_FILES order, then the top module and its testbench
+    sources = [arg for arg in command if arg.endswith(".sv")]
+    assert [Path(source).name for source in sources] == [
+        "leaf_pkg.sv", "mid_pkg.sv", "top_pkg.sv", "turtle_cpu_top.sv", f"{TOP_MODULE}.sv"]
@@ -0,0 +1,94 @@
+"""
+Tests for cycle budgets and checkpoint checking in checkpoints.py
+"""
+
+from pathlib import Path
+
+import pytest
+
+from .checkpoints import Checkpoint, ReferenceRun, parse_checkpoint, read_cycle_budget
+from .lockstep import OPCODE_REG_MEMORY, PUT, REG_DOFF, SET, STORE
+from .machine_code import HALT, encode, program
+from .mem_dumps import format_dump
+
+
+def test_read_cycle_budget():
+    assert read_cycle_budget("; max_cycles: 250000\nSET 1\n") == 250000
+    assert read_cycle_budget("\n; A long program\n\n;MAX_CYCLES:7\n") == 7
+
+
+def test_read_cycle_budget_missing():
+    assert read_cycle_budget("") is None
+    assert read_cycle_budget("; A short program\nSET 1\nHALT\n") is None
+    # Only the leading comment block counts
+    assert read_cycle_budget("SET 1\n; max_cycles: 100\n") is None
+
+
+@pytest.mark.parametrize("line", ["; max_cycles: lots", "; max_cycles 100", "; max_cycles: -5",
+                                  "; max_cycles: 100 cycles", "; max_cycles:", "max_cycles: 100"])
+def test_read_cycle_budget_malformed(line):
+    assert read_cycle_budget(f"{line}\nSET 1\n") is None
+
+
+def test_read_cycle_budget_repeated():
+    # The first budget wins, a malformed one doesn't hide a later one
+    assert read_cycle_budget("; max_cycles: 10\n; max_cycles: 20\n") == 10
+    assert read_cycle_budget("; max_cycles: ten\n; max_cycles: 20\n") == 20
+
+
+def test_parse_checkpoint():
+    assert parse_checkpoint("CHECKPOINT cycle=1000 memory=/tmp/m.hex registers=/tmp/r.hex") == \
+        Checkpoint(1000, Path("/tmp/m.hex"), Path("/tmp/r.hex"))
+    assert parse_checkpoint("RETIRE pc=004 instruction=0348") is None
+
+
+# SET 2, PUT DOFF, SET 0x42, STORE: 0x42 lands at data address 2 after four cycles
+STORE_PROGRAM = program(encode(OPCODE_REG_MEMORY, SET, 2), encode(OPCODE_REG_MEMORY, PUT, REG_DOFF),
+                        encode(OPCODE_REG_MEMORY, SET, 0x42), encode(OPCODE_REG_MEMORY, STORE),
+                        HALT)
+
+
+def write_checkpoint(tmp_path: Path, cycle: int, memory: bytes, registers: bytes) -> Checkpoint:
+    checkpoint = Checkpoint(cycle, tmp_path / f"memory_{cycle}.hex",
+                            tmp_path / f"registers_{cycle}.hex")
+    checkpoint.memory_file.write_text(format_dump(memory, "hex"))
+    checkpoint.registers_file.write_text(format_dump(registers, "hex"))
+    return checkpoint
+
+
+def model_state(cycles: int) -> tuple:
+    """The model's memory and registers after `cycles` cycles of STORE_PROGRAM"""
+    run = ReferenceRun(STORE_PROGRAM, 100, "hex")
+    for _ in range(cycles):
+        run.next_record()
+    return bytes(run.state['memory']), bytes(run.state['registers'])
+
+
+def test_check_checkpoint_matches(tmp_path):
+    run = ReferenceRun(STORE_PROGRAM, 100, "hex")
+    memory, registers = model_state(4)
+    assert memory[2] == 0x42
+    checkpoint = write_checkpoint(tmp_path, 4, memory, registers)
+    assert run.check_checkpoint(checkpoint) is None
+    assert run.retired == 4
+    # The dumps are deleted once checked
+    assert not checkpoint.memory_file.exists() and not checkpoint.registers_file.exists()
+
+
+def test_check_checkpoint_mismatch(tmp_path):
+    run = ReferenceRun(STORE_PROGRAM, 100, "hex")
+    memory, registers = model_state(4)
+    memory = bytearray(memory)
+    memory[2] = 0x43
+    report = run.check_checkpoint(write_checkpoint(tmp_path, 4, memory, registers))
+    assert report.startswith("Checkpoint at cycle 4 differs:")
+    assert "Memory 0x002" in report
+
+
+def test_check_checkpoint_after_model_ended(tmp_path):
+    # The model halts after five cycles, the final dumps decide instead
+    run = ReferenceRun(STORE_PROGRAM, 100, "hex")
+    checkpoint = write_checkpoint(tmp_path, 50, bytes(4096), bytes(16))
+    assert run.check_checkpoint(checkpoint) is None
+    assert run.ended
+    assert not checkpoint.memory_file.exists()
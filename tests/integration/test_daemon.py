@@ -0,0 +1,118 @@
+"""
+Tests for the test daemon's request loop and client in daemon.py, with a stub in
+place of the framework's single-test runner
+
+The daemon redirects sys.stdout while it runs a request, so it runs in a process of
+its own, apart from the client.
+"""
+
+import multiprocessing
+import socket
+import time
+
+import pytest
+
+from .daemon import send_request, serve_requests
+
+# Seconds to wait for the daemon to start listening or to stop
+DAEMON_TIMEOUT = 10
+
+
+def run_request(request: dict) -> dict:
+    """Stand-in for TurtleCPUTestFramework.serve's runner"""
+    if request.get('raise'):
+        raise ValueError("no such test")
+    print(f"🧪 Testing: {request['test_file']}")
+    print("✅ Test PASSED")
+    return {'passed': True, 'test_file': request['test_file'],
+            'stop': bool(request.get('stop'))}
+
+
+def start_daemon(socket_path) -> multiprocessing.Process:
+    process = multiprocessing.Process(target=serve_requests, args=(run_request, socket_path))
+    process.start()
+    return process
+
+
+def wait_for(condition, what: str):
+    deadline = time.monotonic() + DAEMON_TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, what
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Socket path of a daemon serving run_request, stopped after the test"""
+    socket_path = tmp_path / "d.sock"
+    process = start_daemon(socket_path)
+    wait_for(socket_path.exists, "daemon did not start")
+
+    yield socket_path
+
+    if process.is_alive():
+        send_request({'test_file': "stop.asm", 'stop': True}, socket_path)
+    process.join(DAEMON_TIMEOUT)
+    if process.is_alive():
+        process.kill()
+        pytest.fail("daemon did not stop")
+
+
+def test_request_output_and_result(daemon, capsys):
+    result = send_request({'test_file': "add.asm"}, daemon)
+    assert result == {'passed': True, 'test_file': "add.asm", 'stop': False}
+    assert capsys.readouterr().out.endswith("🧪 Testing: add.asm\n✅ Test PASSED\n")
+
+
+def test_requests_are_served_one_after_another(daemon, capsys):
+    for name in ("a.asm", "b.asm", "c.asm"):
+        assert send_request({'test_file': name}, daemon)['test_file'] == name
+    out = capsys.readouterr().out
+    assert out.index("a.asm") < out.index("b.asm") < out.index("c.asm")
+
+
+def test_exception_fails_the_request(daemon, capsys):
+    assert send_request({'raise': True}, daemon) == {'passed': False}
+    assert "❌ Request failed with exception: no such test" in capsys.readouterr().out
+    assert send_request({'test_file': "next.asm"}, daemon)['passed']
+
+
+def test_malformed_request_is_dropped(daemon):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(daemon))
+        client.sendall(b"not json\n")
+        assert client.recv(1) == b""  # Closed without an answer
+    assert send_request({'test_file': "next.asm"}, daemon)['passed']
+
+
+def test_stop_shuts_down_and_removes_socket(daemon):
+    assert send_request({'test_file': "last.asm", 'stop': True}, daemon)['stop']
+    wait_for(lambda: not daemon.exists(), "daemon did not stop")
+    assert send_request({'test_file': "late.asm"}, daemon) is None
+
+
+def test_second_daemon_refuses_a_live_socket(daemon):
+    with pytest.raises(RuntimeError, match="already serving"):
+        serve_requests(run_request, daemon)
+    assert send_request({'test_file': "still.asm"}, daemon)['passed']
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    socket_path = tmp_path / "d.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(socket_path))
+    stale.close()  # The file stays, nothing listens on it
+
+    process = start_daemon(socket_path)
+    deadline = time.monotonic() + DAEMON_TIMEOUT
+    result = None
+    while result is None:  # Connections fail until the daemon replaced the socket
+        assert time.monotonic() < deadline, "daemon did not replace the stale socket"
+        result = send_request({'test_file': "stale.asm", 'stop': True}, socket_path)
+        time.sleep(0.01)
+    process.join(DAEMON_TIMEOUT)
+    assert result['passed'] and not socket_path.exists()
+
+
+def test_no_daemon(tmp_path):
+    assert send_request({'test_file': "add.asm"}, tmp_path / "missing.sock") is None
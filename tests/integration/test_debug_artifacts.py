@@ -0,0 +1,91 @@
+"""
+Tests for keeping, compressing and evicting debug output in debug_artifacts.py
+"""
+
+import gzip
+import os
+from pathlib import Path
+
+from .debug_artifacts import PENDING_DIR, DebugStore, compress_file
+
+
+def small_store(debug_dir: Path, max_size_bytes: int = 1 << 20,
+                compress_bytes: int = 100) -> DebugStore:
+    store = DebugStore(debug_dir)
+    store.max_size_bytes = max_size_bytes
+    store.compress_bytes = compress_bytes
+    return store
+
+
+def kept_dir(store: DebugStore, name: str, files: dict, mtime: float = None) -> Path:
+    """Keep a work directory holding files ({name: text})"""
+    with store.work_dir(f"{name}_") as work_dir:
+        for file_name, text in files.items():
+            (Path(work_dir) / file_name).write_text(text)
+        kept = store.keep(Path(work_dir), name)
+    if mtime is not None:
+        os.utime(kept, (mtime, mtime))
+    return kept
+
+
+def test_work_dir_removed_unless_kept(tmp_path):
+    store = small_store(tmp_path)
+    with store.work_dir("add_test_") as work_dir:
+        assert Path(work_dir).parent == tmp_path / PENDING_DIR
+        (Path(work_dir) / "rtl_stdout.txt").write_text("run\n")
+    assert not Path(work_dir).exists()
+    assert list(tmp_path.iterdir()) == [tmp_path / PENDING_DIR]
+
+
+def test_keep_renames_and_compresses(tmp_path):
+    store = small_store(tmp_path)
+    kept = kept_dir(store, "add_test", {'rtl_stdout.txt': "x" * 200, 'wave.vcd': "#0\n" * 100,
+                                        'small.log': "ok\n", 'memory.hex': "00\n" * 100})
+    assert kept == tmp_path / "add_test"
+    assert sorted(path.name for path in kept.iterdir()) == [
+        "memory.hex", "rtl_stdout.txt.gz", "small.log", "wave.vcd.gz"]
+    with gzip.open(kept / "rtl_stdout.txt.gz", 'rt') as f:
+        assert f.read() == "x" * 200
+    # Nothing is left pending
+    assert list((tmp_path / PENDING_DIR).iterdir()) == []
+
+
+def test_keep_replaces_earlier_directory(tmp_path):
+    store = small_store(tmp_path)
+    kept_dir(store, "add_test", {'old.txt': "old\n"})
+    kept = kept_dir(store, "add_test", {'new.txt': "new\n"})
+    assert [path.name for path in kept.iterdir()] == ["new.txt"]
+
+
+def test_prune_evicts_oldest(tmp_path):
+    store = small_store(tmp_path, max_size_bytes=250, compress_bytes=1 << 20)
+    for index, name in enumerate(["first", "second", "third"]):
+        kept_dir(store, name, {'rtl_stdout.txt': "x" * 100}, mtime=1000 + index)
+    store.prune()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [PENDING_DIR, "second", "third"]
+
+
+def test_prune_within_budget(tmp_path):
+    store = small_store(tmp_path, max_size_bytes=1000)
+    store.prune()
+    kept_dir(store, "add_test", {'rtl_stdout.txt': "x" * 100})
+    store.prune()
+    assert (tmp_path / "add_test").exists()
+
+    # Running tests' work directories never count or get evicted
+    store.max_size_bytes = 0
+    with store.work_dir("running_") as work_dir:
+        (Path(work_dir) / "rtl_stdout.txt").write_text("x" * 100)
+        store.prune()
+        assert Path(work_dir).exists()
+    assert not (tmp_path / "add_test").exists()
+
+
+def test_compress_file(tmp_path):
+    path = tmp_path / "trace.log"
+    path.write_bytes(os.urandom(1000))
+    data = path.read_bytes()
+    compressed = compress_file(path)
+    assert compressed == tmp_path / "trace.log.gz"
+    assert not path.exists()
+    assert gzip.decompress(compressed.read_bytes()) == data
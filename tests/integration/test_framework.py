@@ -7,20 +7,99 @@ Date: 2025-07-20
 """
 
 import argparse
+import asyncio
+import contextlib
+import copy
+import importlib.metadata
+import io
+import json
 import os
+import random
+import re
+import shutil
+import signal
 import subprocess
 import sys
 import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Tuple, Optional
 
-# Import turtle-toolkit functions directly (now that it's a proper dependency)
-from turtle_toolkit import assemble_program, simulate_program, compare_files
+try:
+    from .mem_dumps import (DUMP_FORMATS, find_mismatches, format_dump, format_memb,
+                            format_range, mismatch_ranges, parse_dump, parse_memb)
+    from .result_cache import ResultCache, DEFAULT_CACHE_SIZE_MB
+    from .debug_artifacts import DebugStore, DEFAULT_DEBUG_SIZE_MB
+    from .backends import BACKENDS, DEFAULT_BACKEND, make_backend, program_plusargs
+    from .daemon import DEFAULT_SOCKET, serve_requests
+    from .golden import DEFAULT_GOLDEN_DIR, GoldenStore, SnapshotError
+    from .fuzz import DEFAULT_FUZZ_LENGTH, format_program, generate_program, shrink_program
+    from .checkpoints import ReferenceRun, parse_checkpoint, read_cycle_budget
+    from .lockstep import parse_retire_record
+    from .latency_sweep import (DEFAULT_DATA_LATENCIES, DEFAULT_FETCH_LATENCIES,
+                                BASELINE as LATENCY_BASELINE, LatencySetting,
+                                format_sweep_table, sweep_grid, sweep_report,
+                                write_sweep_csv)
+    from .perf_counters import (check_counters, format_profile, parse_perf_counters,
+                                perf_summary)
+    from .reports import (DEFAULT_REGRESSION_THRESHOLD, build_report, compare_reports,
+                          write_json_report, write_junit_report)
+    from .pipeline import DEFAULT_PIPELINE_DEPTH, LogRouter, stream_process
+    from .rtl_bench import (BENCH_NAMES, DEFAULT_BENCH_HISTORY, bench_points, parse_overrides,
+                            run_rtl_bench)
+    from .units import ERROR_RE, mirror_block_dir, run_unit_tests
+    from .uart_host import (DEFAULT_BAUD_RATES, DEFAULT_IDLE_BITS, DEFAULT_OVERSAMPLE_RATES,
+                            UartSetting, oversample_clocks, run_uart_stream)
+except ImportError:  # Run as a script from tests/integration
+    from mem_dumps import (DUMP_FORMATS, find_mismatches, format_dump, format_memb,
+                           format_range, mismatch_ranges, parse_dump, parse_memb)
+    from result_cache import ResultCache, DEFAULT_CACHE_SIZE_MB
+    from debug_artifacts import DebugStore, DEFAULT_DEBUG_SIZE_MB
+    from backends import BACKENDS, DEFAULT_BACKEND, make_backend, program_plusargs
+    from daemon import DEFAULT_SOCKET, serve_requests
+    from golden import DEFAULT_GOLDEN_DIR, GoldenStore, SnapshotError
+    from fuzz import DEFAULT_FUZZ_LENGTH, format_program, generate_program, shrink_program
+    from checkpoints import ReferenceRun, parse_checkpoint, read_cycle_budget
+    from lockstep import parse_retire_record
+    from latency_sweep import (DEFAULT_DATA_LATENCIES, DEFAULT_FETCH_LATENCIES,
+                               BASELINE as LATENCY_BASELINE, LatencySetting,
+                               format_sweep_table, sweep_grid, sweep_report,
+                               write_sweep_csv)
+    from perf_counters import (check_counters, format_profile, parse_perf_counters,
+                               perf_summary)
+    from reports import (DEFAULT_REGRESSION_THRESHOLD, build_report, compare_reports,
+                         write_json_report, write_junit_report)
+    from pipeline import DEFAULT_PIPELINE_DEPTH, LogRouter, stream_process
+    from rtl_bench import (BENCH_NAMES, DEFAULT_BENCH_HISTORY, bench_points, parse_overrides,
+                           run_rtl_bench)
+    from units import ERROR_RE, mirror_block_dir, run_unit_tests
+    from uart_host import (DEFAULT_BAUD_RATES, DEFAULT_IDLE_BITS, DEFAULT_OVERSAMPLE_RATES,
+                           UartSetting, oversample_clocks, run_uart_stream)
+
+# Files a `make run` writes into its working directory. These are never shared
+# between parallel workers, everything else in the RTL directory is linked.
+RTL_RUN_OUTPUTS = {"waves.vcd", "final_data_memory.mem", "final_register_file.mem"}
+
+# Cycle budget shared by simulate_program and the testbench's +max_cycles= plusarg
+DEFAULT_MAX_CYCLES = 10000
+
+# Testbench +trace_level= values
+TRACE_QUIET = 0  # No VCD and no per-cycle monitor text
+TRACE_TEXT = 1  # Per-cycle monitor text only
+TRACE_FULL = 2  # Per-cycle monitor text and VCD
+
+# Failing fuzz programs shrunk per run, shrinking runs every candidate serially
+FUZZ_SHRINK_LIMIT = 3
 
 
 class TurtleCPUTestFramework:
-    def __init__(self, project_root: str = None, save_debug: bool = False):
+    def __init__(self, project_root: str = None, save_debug: bool = False,
+                 jobs: int = 1, batch: bool = False,
+                 max_cycles: int = DEFAULT_MAX_CYCLES, trace_level: int = TRACE_QUIET,
+                 cache: Optional[ResultCache] = None, dump_format: str = "hex",
+                 lockstep: bool = False, force_rebuild: bool = False,
+                 checkpoint_interval: int = 0):
         # If no project root specified, go up two levels from this script
         if project_root:
             self.project_root = Path(project_root)
@@ -29,11 +108,33 @@ class TurtleCPUTestFramework:
 
         self.turtle_toolkit_dir = self.project_root / "turtle-toolkit"
         self.rtl_dir = self.project_root / "src" / "turtle_cpu_top"
+        self.rtl_run_dir = self.rtl_dir  # Working directory for `make run`
+        self.backend = make_backend(DEFAULT_BACKEND, self.rtl_dir)  # Builds and runs the RTL
+        self.scratch_dir = None  # Parent for per-test temp dirs (None = system default)
         self.save_debug = save_debug
         self.debug_dir = self.project_root / "tests" / "integration" / "debug_output"
+        self.debug_store = DebugStore(self.debug_dir)  # Work dirs and kept debug output
+        self.jobs = max(1, jobs)  # Number of tests to run at the same time
+        self.batch = batch  # Run suite programs through one RTL simulator process
+        self.max_cycles = max_cycles  # Cycle budget for both the simulator and the RTL
+        self.trace_level = trace_level  # Testbench trace level for normal RTL runs
+        self.cache = cache  # Result cache for assembly, golden dumps and RTL builds
+        self.dump_format = dump_format  # RTL dump format, one of DUMP_FORMATS
+        self.lockstep = lockstep  # Compare every retired instruction against the reference trace
+        self.checkpoint_interval = checkpoint_interval  # Cycles between RTL checkpoints, 0 for none
+        self.pipeline_depth = 0  # Programs prepared ahead of the running RTL simulation, 0 = no pipelining
+        self.golden_store = GoldenStore()  # Golden snapshots of --rtl-only and --refresh-golden
+        self.rtl_only = False  # Take programs and golden states from snapshots, no toolkit
+        self.refresh_golden = False  # Record a snapshot of every prepared program
+        self._toolkit_fingerprint = None  # Lazily computed turtle-toolkit cache key part
         self.rtl_built = False  # Track if RTL has been built
+        self.force_rebuild = force_rebuild  # Run `make rebuild` even if the build is current
         self.timing_data = {}  # Store timing information
         self.test_results = {}  # Store individual test results
+        self.suite_wall_time = None  # Wall clock time of a parallel suite run
+        self.uart_reports = []  # UART host model throughput per setting
+        self.latency_reports = []  # Simulator cycles per program and latency setting
+        self.bench_results = []  # Synthesis and formal benchmark results per point
 
     def resolve_test_file(self, test_name_or_path: str) -> Optional[str]:
         """Resolve a test name or path to a full file path"""
@@ -84,33 +185,43 @@ class TurtleCPUTestFramework:
 
         return None
 
-    def run_command(self, cmd: list, cwd: str = None, capture_output: bool = True) -> Tuple[int, str, str]:
-        """Run a shell command and return (return_code, stdout, stderr)"""
+    def run_command(self, cmd: list, cwd: str = None, capture_output: bool = True,
+                    output_files: Tuple[Path, Path] = None) -> Tuple[int, str, str]:
+        """Run a shell command and return (return_code, stdout, stderr)
+
+        With output_files, stdout and stderr go straight into those two files instead
+        of memory, and are returned empty.
+        """
         print(f"Running: {' '.join(cmd)}")
         if cwd:
             print(f"  in directory: {cwd}")
 
         start_time = time.time()
         try:
-            result = subprocess.run(
-                cmd,
-                cwd=cwd,
-                capture_output=capture_output,
-                text=True,
-                check=False
-            )
+            with contextlib.ExitStack() as files:
+                outputs = {'capture_output': capture_output}
+                if output_files:
+                    outputs = {'stdout': files.enter_context(open(output_files[0], 'w')),
+                               'stderr': files.enter_context(open(output_files[1], 'w'))}
+                result = subprocess.run(
+                    cmd,
+                    cwd=cwd,
+                    text=True,
+                    check=False,
+                    **outputs
+                )
             elapsed = time.time() - start_time
             cmd_name = cmd[0] if cmd else "unknown"
             print(f"  ⏱️  {cmd_name} took {elapsed:.2f}s")
-            return result.returncode, result.stdout, result.stderr
+            return result.returncode, result.stdout or "", result.stderr or ""
         except Exception as e:
             elapsed = time.time() - start_time
             print(f"  ⏱️  Command failed after {elapsed:.2f}s")
             return -1, "", str(e)
 
-    def assemble_program(self, asm_file: str, output_file: str) -> bool:
-        """Assemble an assembly program to binary string format"""
-        print(f"🔧 Assembling {asm_file} to {output_file}")
+    def assemble_program(self, asm_file: str) -> Optional[bytes]:
+        """Assemble an assembly program, return its machine code (None on failure)"""
+        print(f"🔧 Assembling {asm_file}")
 
         # Convert to absolute path
         asm_path = Path(asm_file)
@@ -120,7 +231,7 @@ class TurtleCPUTestFramework:
         # Make sure the file exists
         if not asm_path.exists():
             print(f"Assembly failed: File not found: {asm_path}")
-            return False
+            return None
 
         try:
             start_time = time.time()
@@ -129,66 +240,99 @@ class TurtleCPUTestFramework:
             with open(asm_path, 'r') as f:
                 source_code = f.read()
 
-            # Use the Assembler class directly to get both binary and formatted text
+            if self.cache:
+                cache_key = ResultCache.key(
+                    self.toolkit_fingerprint(), "program.bin", asm_path.name, source_code)
+                cached = self.cache.lookup('assembly', cache_key)
+                if cached:
+                    binary_data = (cached / "program.bin").read_bytes()
+                    elapsed = time.time() - start_time
+                    self.timing_data.setdefault('assembly', []).append(elapsed)
+                    print(f"✅ Assembly cached ({elapsed:.2f}s)")
+                    return binary_data
+
+            # Use the Assembler class directly; only the machine code is needed
             from turtle_toolkit.assembler import Assembler
-            binary_data, formatted_text = Assembler.assemble_to_binary_string(
+            binary_data, _ = Assembler.assemble_to_binary_string(
                 source_code, asm_path.name, "stripped"
             )
+            binary_data = bytes(binary_data)
 
-            # Write the formatted text to output file
-            with open(output_file, 'w') as f:
-                f.write(formatted_text)
+            if self.cache:
+                with tempfile.TemporaryDirectory(dir=self.scratch_dir) as temp_dir:
+                    program_file = Path(temp_dir) / "program.bin"
+                    program_file.write_bytes(binary_data)
+                    self.cache.store('assembly', cache_key,
+                                     files={"program.bin": program_file})
 
             elapsed = time.time() - start_time
             self.timing_data.setdefault('assembly', []).append(elapsed)
 
             print(f"✅ Assembly successful ({elapsed:.2f}s)")
-            return True
+            return binary_data
 
         except Exception as e:
             elapsed = time.time() - start_time
             self.timing_data.setdefault('assembly', []).append(elapsed)
             print(f"Assembly failed with exception: {e} ({elapsed:.2f}s)")
-            return False
+            return None
+
+    def run_simulator(self, binary_data: bytes,
+                      latency: LatencySetting = LATENCY_BASELINE) -> Optional[dict]:
+        """Run the software simulator on machine code
 
-    def run_simulator(self, binstr_file: str, memory_dump: str, registers_dump: str) -> bool:
-        """Run the software simulator"""
-        print(f"🐢 Running simulator on {binstr_file}")
+        latency sets the simulator's instruction fetch and data memory wait cycles,
+        the RTL's memories have none. Returns the golden state as
+        {'memory': bytes, 'registers': bytes, 'cycle_count': int}, or None if the
+        simulation failed or didn't halt.
+        """
+        print(f"🐢 Running simulator on {len(binary_data)} bytes of machine code")
 
         try:
             start_time = time.time()
 
-            # Read the binary string file and convert to bytes
-            with open(binstr_file, 'r') as f:
-                binstr_content = f.read().strip()
-
-            # Convert binary string to bytes (assuming format like "01000100 00000001")
-            # Remove comments and whitespace, then convert
-            clean_binary_str = ""
-            for line in binstr_content.split('\n'):
-                # Remove comments (everything after //)
-                line = line.split('//')[0].strip()
-                # Remove all whitespace
-                clean_binary_str += ''.join(line.split())
-
-            # Convert binary string to bytes
-            if len(clean_binary_str) % 8 != 0:
-                print(
-                    f"Error: Binary string length ({len(clean_binary_str)}) not divisible by 8")
-                return False
-
-            binary_data = bytes([int(clean_binary_str[i:i+8], 2)
-                                for i in range(0, len(clean_binary_str), 8)])
-
-            # Use library function to simulate
-            result = simulate_program(
-                binary_data,
-                max_cycles=10000,
-                dump_memory=memory_dump,
-                dump_registers=registers_dump,
-                instruction_fetch_latency_cycles=0,
-                data_memory_latency_cycles=0,
-            )
+            cached = None
+            if self.cache:
+                cache_key = ResultCache.key(
+                    self.toolkit_fingerprint(), "state.bin", binary_data,
+                    str(self.max_cycles), str(latency.fetch), str(latency.data))
+                cached = self.cache.lookup('simulation', cache_key)
+
+            if cached:
+                result = json.loads((cached / "result.json").read_text())
+                memory = (cached / "memory.bin").read_bytes()
+                registers = (cached / "registers.bin").read_bytes()
+            else:
+                # simulate_program only exposes the final state through its dump files,
+                # so they go to a scratch directory and are read back once
+                with tempfile.TemporaryDirectory(dir=self.scratch_dir) as temp_dir:
+                    memory_dump = Path(temp_dir) / "memory.binstr.txt"
+                    registers_dump = Path(temp_dir) / "registers.binstr.txt"
+
+                    # Use library function to simulate
+                    from turtle_toolkit import simulate_program
+                    result = simulate_program(
+                        binary_data,
+                        max_cycles=self.max_cycles,
+                        dump_memory=str(memory_dump),
+                        dump_registers=str(registers_dump),
+                        instruction_fetch_latency_cycles=latency.fetch,
+                        data_memory_latency_cycles=latency.data,
+                    )
+                    memory, _ = parse_memb(memory_dump.read_text())
+                    registers, _ = parse_memb(registers_dump.read_text())
+                    memory, registers = bytes(memory), bytes(registers)
+
+                    if self.cache:
+                        summary = {'halted': result['halted'],
+                                   'cycle_count': result['cycle_count']}
+                        (Path(temp_dir) / "memory.bin").write_bytes(memory)
+                        (Path(temp_dir) / "registers.bin").write_bytes(registers)
+                        self.cache.store(
+                            'simulation', cache_key,
+                            files={"memory.bin": Path(temp_dir) / "memory.bin",
+                                   "registers.bin": Path(temp_dir) / "registers.bin"},
+                            texts={"result.json": json.dumps(summary)})
 
             elapsed = time.time() - start_time
             self.timing_data.setdefault('simulation', []).append(elapsed)
@@ -196,34 +340,164 @@ class TurtleCPUTestFramework:
             if result['halted']:
                 print(
                     f"✅ Simulation successful - halted after {result['cycle_count']} cycles ({elapsed:.2f}s)")
-                return True
+                return {'memory': memory, 'registers': registers,
+                        'cycle_count': result['cycle_count']}
             else:
                 print(
                     f"Simulation reached max cycles without halting ({elapsed:.2f}s)")
-                return False
+                return None
 
         except Exception as e:
             elapsed = time.time() - start_time
             self.timing_data.setdefault('simulation', []).append(elapsed)
             print(f"Simulation failed with exception: {e} ({elapsed:.2f}s)")
-            return False
+            return None
 
     def ensure_rtl_built(self) -> bool:
-        """Ensure RTL is built (build only once)"""
+        """Ensure RTL is built (build only once)
+
+        The build is skipped when the RTL directory already holds a build of the current
+        sources, and restored from the result cache when one is cached.
+        """
         if not self.rtl_built:
-            print("Building RTL (one-time setup)...")
+            fingerprint = self.rtl_fingerprint()
+            if not self.force_rebuild and self.rtl_build_current(fingerprint):
+                print("RTL build is current, skipping rebuild")
+                self.rtl_built = True
+                return True
+
+            cache_key = None
+            if self.cache:
+                cache_key = ResultCache.key(fingerprint)
+                cached = None if self.force_rebuild else self.cache.lookup('rtl_build', cache_key)
+                if cached:
+                    self.restore_rtl_build(cached)
+                    self.write_rtl_build_stamp(
+                        fingerprint, [item.name for item in cached.iterdir()])
+                    print("RTL build restored from cache")
+                    self.rtl_built = True
+                    return True
+
+            print(f"Building RTL with the {self.backend.name} backend (one-time setup)...")
+            (self.rtl_dir / self.backend.build_stamp).unlink(missing_ok=True)
+            before = self.rtl_dir_snapshot()
             ret_code, stdout, stderr = self.run_command(
-                ["make", "rebuild"], cwd=str(self.rtl_dir))
+                self.backend.build_command(), cwd=str(self.rtl_dir))
             if ret_code != 0:
                 print(f"RTL rebuild failed: {stderr}")
                 return False
             print("RTL build successful")
             self.rtl_built = True
+
+            # Whatever the build created or rewrote is the simulator it produced
+            after = self.rtl_dir_snapshot()
+            outputs = {name: self.rtl_dir / name for name, mtime in after.items()
+                       if before.get(name) != mtime and name not in RTL_RUN_OUTPUTS}
+            self.write_rtl_build_stamp(fingerprint, list(outputs))
+            if self.cache:
+                self.cache.store('rtl_build', cache_key, files=outputs)
         return True
 
+    def rtl_build_current(self, fingerprint: str) -> bool:
+        """Whether the RTL directory's build stamp matches fingerprint and its outputs exist"""
+        try:
+            stamp = json.loads((self.rtl_dir / self.backend.build_stamp).read_text())
+        except (OSError, ValueError):
+            return False
+        return (stamp.get('fingerprint') == fingerprint and bool(stamp.get('outputs'))
+                and all((self.rtl_dir / name).exists() for name in stamp['outputs']))
+
+    def write_rtl_build_stamp(self, fingerprint: str, outputs: list):
+        """Record which sources the RTL directory's build outputs were built from"""
+        (self.rtl_dir / self.backend.build_stamp).write_text(
+            json.dumps({'fingerprint': fingerprint, 'outputs': sorted(outputs)}) + "\n")
+
+    def rtl_dir_snapshot(self) -> dict:
+        """Map each top-level entry of the RTL directory to its newest modification time
+
+        A directory counts as modified when anything inside it is, so a rebuild that only
+        rewrites files in an existing build directory still shows up.
+        """
+        snapshot = {}
+        for entry in self.rtl_dir.iterdir():
+            mtimes = [entry.lstat().st_mtime_ns]
+            if entry.is_dir() and not entry.is_symlink():
+                mtimes.extend(path.lstat().st_mtime_ns for path in entry.rglob("*"))
+            snapshot[entry.name] = max(mtimes)
+        return snapshot
+
+    def restore_rtl_build(self, cached: Path):
+        """Copy cached build outputs back into the RTL directory"""
+        for item in cached.iterdir():
+            dest = self.rtl_dir / item.name
+            if dest.is_dir() and not dest.is_symlink():
+                shutil.rmtree(dest)
+            elif dest.exists() or dest.is_symlink():
+                dest.unlink()
+
+            # Plain copies get fresh mtimes, so make sees them as newer than the sources
+            if item.is_dir():
+                shutil.copytree(item, dest, symlinks=True, copy_function=shutil.copy)
+            else:
+                shutil.copy(item, dest)
+
+    def rtl_source_files(self) -> list:
+        """Files the top-level RTL build depends on
+
+        These are the Makefile, rtl/ and tb/ sources of turtle_cpu_top and of every block its
+        Makefile includes, plus the rtl-toolkit flow makefile. The blocks' FILE_LIST and
+        INCLUDE_FILES only name their packages and testbenches, the simulator finds the
+        other modules in their INCLUDE_DIRS, so every source in those directories counts.
+        """
+        block_dirs = [self.rtl_dir]
+        for line in (self.rtl_dir / "Makefile").read_text().splitlines():
+            match = re.match(r"include\s+\.\./(\w+)/Makefile", line.strip())
+            if match:
+                block_dirs.append(self.rtl_dir.parent / match.group(1))
+
+        files = []
+        for block_dir in block_dirs:
+            files.append(block_dir / "Makefile")
+            for sub_dir in ("rtl", "tb"):
+                files.extend(sorted((block_dir / sub_dir).glob("*.sv")))
+                files.extend(sorted((block_dir / sub_dir).glob("*.svh")))
+
+        tool_flows = self.project_root / "rtl-toolkit" / "tools" / "tool_flows.mk"
+        if tool_flows.exists():
+            files.append(tool_flows)
+        return files
+
+    def rtl_fingerprint(self) -> str:
+        """Hash of the backend and the path and contents of every RTL source file"""
+        parts = [self.backend.name]
+        for path in self.rtl_source_files():
+            parts.append(path.relative_to(self.project_root).as_posix())
+            parts.append(path.read_bytes())
+        return ResultCache.key(*parts)
+
+    def toolkit_fingerprint(self) -> str:
+        """Hash of the turtle-toolkit version and sources (develop installs change without a bump)"""
+        if self._toolkit_fingerprint is None:
+            import turtle_toolkit
+            try:
+                version = importlib.metadata.version("turtle-toolkit")
+            except importlib.metadata.PackageNotFoundError:
+                version = getattr(turtle_toolkit, "__version__", "unknown")
+
+            package_dir = Path(turtle_toolkit.__file__).parent
+            parts = [version]
+            for path in sorted(package_dir.rglob("*.py")):
+                parts.append(path.relative_to(package_dir).as_posix())
+                parts.append(path.read_bytes())
+            self._toolkit_fingerprint = ResultCache.key(*parts)
+        return self._toolkit_fingerprint
+
     def run_rtl_simulation(self, binstr_file: str, memory_dump: str,
-                           registers_dump: str) -> tuple[bool, str, str]:
-        """Run the RTL simulation"""
+                           registers_dump: str, trace_level: int = None,
+                           wave_file: str = None,
+                           timing_key: str = 'rtl_simulation',
+                           output_files: Tuple[Path, Path] = None) -> tuple[bool, str, str]:
+        """Run the RTL simulation, see run_command for output_files"""
         print(f"⚡ Running RTL simulation with {binstr_file}")
 
         # Ensure RTL is built (only builds once)
@@ -231,13 +505,43 @@ class TurtleCPUTestFramework:
             return False, "", ""
 
         # Run the simulation with plusargs
-        plusargs = f"+initial_instruction_memory_file={binstr_file} +final_data_memory_file={memory_dump} +final_register_file={registers_dump}"
+        plusargs = program_plusargs(binstr_file, memory_dump, registers_dump)
+        return self.run_rtl_plusargs(plusargs, trace_level, wave_file, timing_key, output_files)
+
+    def run_rtl_batch(self, entries: list, manifest_file: str) -> tuple[bool, str, str]:
+        """Run many programs through one RTL simulation
+
+        entries is a list of (binstr_file, memory_dump, registers_dump) tuples. They are
+        written to manifest_file, one entry per line, and the testbench resets the core
+        and reloads instruction memory between programs.
+        """
+        print(f"⚡ Running RTL batch simulation with {len(entries)} programs")
+
+        # Ensure RTL is built (only builds once)
+        if not self.ensure_rtl_built():
+            return False, "", ""
+
+        with open(manifest_file, 'w') as f:
+            for binstr_file, memory_dump, registers_dump in entries:
+                f.write(f"{binstr_file} {memory_dump} {registers_dump}\n")
+
+        return self.run_rtl_plusargs(f"+batch_manifest={manifest_file}")
+
+    def rtl_trace_level(self) -> int:
+        """Trace level for normal RTL runs, full when every test saves debug output"""
+        return TRACE_FULL if self.save_debug else self.trace_level
 
-        cmd = ["make", "run", f"PLUSARGS={plusargs}"]
+    def run_rtl_plusargs(self, plusargs: str, trace_level: int = None,
+                         wave_file: str = None,
+                         timing_key: str = 'rtl_simulation',
+                         output_files: Tuple[Path, Path] = None) -> tuple[bool, str, str]:
+        """Run the testbench in the RTL run directory with the given plusargs"""
+        cmd = self.rtl_run_command(plusargs, trace_level, wave_file)
         start_time = time.time()
-        ret_code, stdout, stderr = self.run_command(cmd, cwd=str(self.rtl_dir))
+        ret_code, stdout, stderr = self.run_command(cmd, cwd=str(self.rtl_run_dir),
+                                                    output_files=output_files)
         elapsed = time.time() - start_time
-        self.timing_data.setdefault('rtl_simulation', []).append(elapsed)
+        self.timing_data.setdefault(timing_key, []).append(elapsed)
 
         if ret_code != 0:
             print(f"RTL simulation failed: {stderr}")
@@ -246,24 +550,183 @@ class TurtleCPUTestFramework:
         print(f"✅ RTL simulation successful ({elapsed:.2f}s)")
         return True, stdout, stderr
 
-    def compare_dumps(self, file1: str, file2: str, dump_type: str) -> bool:
-        """Compare two memory/register dumps"""
-        print(f"🔍 Comparing {dump_type}: {file1} vs {file2}")
+    def rtl_run_command(self, plusargs: str, trace_level: int = None,
+                        wave_file: str = None) -> list:
+        """The backend's command line for the given plusargs plus the run-wide ones"""
+        if trace_level is None:
+            trace_level = self.rtl_trace_level()
+        if wave_file is None:
+            wave_file = self.rtl_run_dir / "waves.vcd"
+        plusargs = f"{plusargs} +max_cycles={self.max_cycles} +trace_level={trace_level} +dump_format={self.dump_format} +wave_file={wave_file}"
+        return self.backend.run_command(plusargs)
+
+    def run_rtl_streaming(self, paths: dict) -> Tuple[bool, str, str, Optional[str]]:
+        """Run the RTL and check its output against the reference model as it arrives
+
+        In lockstep runs every RETIRE record is compared, with checkpoints every
+        CHECKPOINT dump. The simulation is killed at the first divergence. Returns
+        (rtl_success, stdout, stderr, divergence), divergence being a report of the
+        first difference or None. stderr is merged into stdout.
+        """
+        checks = ["lockstep"] if self.lockstep else []
+        if self.checkpoint_interval:
+            checks.append(f"checkpoints every {self.checkpoint_interval} cycles")
+        print(f"⚡ Running RTL simulation ({', '.join(checks)}) with {paths['binstr']}")
+
+        # Ensure RTL is built (only builds once)
+        if not self.ensure_rtl_built():
+            return False, "", "", None
+
+        program, _ = parse_memb(paths['binstr'].read_text())
+        reference = ReferenceRun(bytes(program), self.max_cycles, self.dump_format)
+        plusargs = program_plusargs(paths['binstr'], paths['rtl_memory'], paths['rtl_registers'])
+        if self.lockstep:
+            plusargs += " +retire_trace=1"
+        if self.checkpoint_interval:
+            checkpoint_prefix = paths['rtl_memory'].parent / "checkpoint"
+            plusargs += (f" +checkpoint_interval={self.checkpoint_interval}"
+                         f" +checkpoint_prefix={checkpoint_prefix}")
+        cmd = self.rtl_run_command(plusargs)
+
+        start_time = time.time()
+        output = []
+        recent = []  # Last few matching records, shown before a divergence
+        checked = 0
+        checkpoints = 0
+        divergence = None
+
+        # A session of its own lets the whole make/simulator tree be killed at once
+        with subprocess.Popen(cmd, cwd=str(self.rtl_run_dir), stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT, text=True,
+                              start_new_session=True) as process:
+            for line in process.stdout:
+                checkpoint = parse_checkpoint(line)
+                if checkpoint:
+                    # Checkpoint dumps are deleted once checked, so a long run keeps none
+                    divergence = reference.check_checkpoint(checkpoint)
+                    if divergence:
+                        os.killpg(process.pid, signal.SIGTERM)
+                        break
+                    checkpoints += 1
+                    continue
+
+                output.append(line)
+                actual = parse_retire_record(line)
+                expected = reference.next_record() if actual else None
+                if expected is None:
+                    continue  # Not a RETIRE record, or past the end of the reference trace
+
+                if not expected.matches(actual):
+                    divergence = "\n".join(
+                        [f"First divergence at instruction {checked}:"]
+                        + [f"    matched:   {record}" for record in recent]
+                        + [f"    reference: {expected}", f"    rtl:       {actual}"])
+                    os.killpg(process.pid, signal.SIGTERM)
+                    break
+
+                checked += 1
+                recent = recent[-3:] + [actual]
+            ret_code = process.wait()
+
+        elapsed = time.time() - start_time
+        self.timing_data.setdefault('rtl_simulation', []).append(elapsed)
+        stdout = "".join(output)
+        matched = f"{checked} instructions" if self.lockstep else f"{checkpoints} checkpoints"
+
+        if divergence:
+            print(f"❌ Divergence after {matched} matched ({elapsed:.2f}s)")
+            return True, stdout, "", divergence
+        if ret_code != 0:
+            print(f"RTL simulation failed: {stdout[-2000:]}")
+            return False, stdout, "", None
+
+        print(f"✅ RTL simulation matched {matched} ({elapsed:.2f}s)")
+        return True, stdout, "", None
+
+    def rtl_halted(self, rtl_stdout: str) -> bool:
+        """Check whether the testbench saw HALT retire before running out of cycles"""
+        cycles = self.rtl_cycles(rtl_stdout)
+        if cycles is not None:
+            print(f"✅ RTL halted after {cycles} cycles")
+            return True
+
+        print(f"RTL reached max cycles ({self.max_cycles}) without halting")
+        return False
+
+    def rtl_cycles(self, rtl_stdout: str) -> Optional[int]:
+        """Cycles the testbench ran until HALT retired, None if it never did"""
+        halt = re.search(r"HALT retired after (\d+) cycles", rtl_stdout)
+        return int(halt.group(1)) if halt else None
+
+    def report_perf_counters(self, rtl_stdout: str, sim_cycles: Optional[int]) -> dict:
+        """Print the profile of the testbench's performance counters and check them
+
+        Returns the result entries to record: 'perf' with the counters and
+        'perf_warnings' with any inconsistencies, empty when the run printed no
+        counters (a lockstep run killed at a divergence).
+        """
+        counters = parse_perf_counters(rtl_stdout)
+        if counters is None:
+            return {}
+
+        print("📈 RTL profile:")
+        print(format_profile(counters))
+        warnings = check_counters(counters, sim_cycles)
+        for warning in warnings:
+            print(f"⚠️  {warning}")
+        return {'perf': perf_summary(counters), 'perf_warnings': warnings}
+
+    def split_batch_output(self, stdout: str, count: int) -> list:
+        """Split batch testbench stdout into one log per program at its BATCH_PROGRAM markers"""
+        logs = [[] for _ in range(count)]
+        current = None
+        for line in stdout.splitlines(keepends=True):
+            marker = re.search(r"BATCH_PROGRAM (\d+)", line)
+            if marker:
+                current = int(marker.group(1))
+            if current is not None and current < count:
+                logs[current].append(line)
+        return [''.join(log) for log in logs]
+
+    def prepare_rtl_run_dir(self, worker_dir: Path) -> Path:
+        """Mirror the RTL directory under worker_dir to get a private `make run` directory
+
+        The top-level Makefile includes its sibling blocks and the rtl-toolkit through
+        relative paths, so the project root and src/ entries are linked into the mirror.
+        Only the outputs in RTL_RUN_OUTPUTS are left out, so each worker writes its own.
+        """
+        run_dir = mirror_block_dir(self.project_root, self.rtl_dir, worker_dir)
+        for entry in self.rtl_dir.iterdir():
+            if entry.name not in RTL_RUN_OUTPUTS:
+                (run_dir / entry.name).symlink_to(entry)
+
+        return run_dir
+
+    def compare_dumps(self, expected: bytes, rtl_dump: str, dump_type: str) -> bool:
+        """Compare golden simulator state against an RTL dump file, printing differing ranges"""
+        print(f"🔍 Comparing {dump_type}: simulator vs {rtl_dump}")
 
         try:
             start_time = time.time()
-            # Use library function directly
-            success = compare_files(
-                file1, file2, ignore_comments=True, verbose=True)
+            actual, unknown = parse_dump(Path(rtl_dump).read_text(), self.dump_format)
+            mismatches = find_mismatches(expected, actual, unknown)
             elapsed = time.time() - start_time
             self.timing_data.setdefault('comparison', []).append(elapsed)
 
-            if success:
+            if not mismatches:
                 print(f"✅ {dump_type} comparison passed! ({elapsed:.2f}s)")
                 return True
-            else:
-                print(f"{dump_type} comparison failed! ({elapsed:.2f}s)")
-                return False
+
+            ranges = mismatch_ranges(mismatches)
+            print(f"{dump_type} comparison failed! {len(mismatches)} differing addresses "
+                  f"in {len(ranges)} ranges ({elapsed:.2f}s)")
+            for first, last in ranges[:16]:
+                print(f"  0x{first:03x}-0x{last:03x}:")
+                print(f"    simulator: {format_range(expected, first, last)}")
+                print(f"    rtl:       {format_range(actual, first, last, unknown)}")
+            if len(ranges) > 16:
+                print(f"  ... and {len(ranges) - 16} more ranges")
+            return False
 
         except Exception as e:
             elapsed = time.time() - start_time
@@ -272,11 +735,167 @@ class TurtleCPUTestFramework:
                 f"{dump_type} comparison failed with exception: {e} ({elapsed:.2f}s)")
             return False
 
+    def test_file_paths(self, temp_path: Path, test_name: str) -> dict:
+        """Paths of the files a test writes into its temporary directory"""
+        dump_ext = "hex" if self.dump_format == "hex" else "binstr"
+        return {
+            'binstr': temp_path / f"{test_name}_instructions.binstr.txt",
+            'sim_memory': temp_path / f"{test_name}_sim_memory.{dump_ext}.txt",
+            'sim_registers': temp_path / f"{test_name}_sim_registers.{dump_ext}.txt",
+            'rtl_memory': temp_path / f"{test_name}_rtl_memory.{dump_ext}.txt",
+            'rtl_registers': temp_path / f"{test_name}_rtl_registers.{dump_ext}.txt",
+            'rtl_stdout': temp_path / f"{test_name}_rtl_stdout.txt",
+            'rtl_stderr': temp_path / f"{test_name}_rtl_stderr.txt",
+        }
+
+    def prepare_test(self, asm_file: str, paths: dict) -> Optional[dict]:
+        """Assemble a program, hand it to the RTL and produce the simulator's golden state
+
+        Returns the golden state from run_simulator, or None on failure. --rtl-only
+        runs take both from the program's golden snapshot instead.
+        """
+        if self.rtl_only:
+            return self.prepare_from_snapshot(asm_file, paths)
+
+        # Step 1: Assemble the program
+        binary_data = self.assemble_program(asm_file)
+        if binary_data is None:
+            print("❌ Test FAILED: Assembly failed")
+            return None
+
+        # The RTL loads the program with $readmemb, the only file the pipeline needs
+        paths['binstr'].write_text(format_memb(binary_data))
+
+        # Step 2: Run simulator
+        golden = self.run_simulator(binary_data)
+        if golden is None:
+            print("❌ Test FAILED: Simulator failed")
+            return None
+
+        if self.refresh_golden:
+            self.golden_store.save(Path(asm_file).stem, Path(asm_file).read_text(),
+                                   binary_data, golden)
+            print(f"📸 Golden snapshot saved to {self.golden_store.path(Path(asm_file).stem)}")
+
+        return golden
+
+    def prepare_from_snapshot(self, asm_file: str, paths: dict) -> Optional[dict]:
+        """Steps 1-2 of an --rtl-only run: the program and golden state from its snapshot"""
+        start_time = time.time()
+        try:
+            binary_data, golden = self.golden_store.load(
+                Path(asm_file).stem, Path(asm_file).read_text(), self.max_cycles)
+        except (OSError, SnapshotError) as e:
+            print(f"❌ Test FAILED: {e} (record it with --refresh-golden)")
+            return None
+
+        paths['binstr'].write_text(format_memb(binary_data))
+        elapsed = time.time() - start_time
+        self.timing_data.setdefault('snapshot', []).append(elapsed)
+        print(f"📸 Golden snapshot loaded, halts after {golden['cycle_count']} cycles "
+              f"({elapsed:.2f}s)")
+        return golden
+
+    def rerun_rtl_traced(self, test_name: str, temp_path: Path, paths: dict):
+        """Rerun a test's RTL simulation with full tracing for its debug output
+
+        The VCD and the testbench output are written straight into the test's work
+        directory, the traced output never passes through memory.
+        """
+        print("🔁 Rerunning RTL simulation with full tracing for debug output")
+        self.run_rtl_simulation(
+            str(paths['binstr']), str(paths['rtl_memory']), str(paths['rtl_registers']),
+            trace_level=TRACE_FULL, wave_file=str(temp_path / f"{test_name}_waves.vcd"),
+            timing_key='debug_trace', output_files=(paths['rtl_stdout'], paths['rtl_stderr']))
+
+    def finish_test(self, test_name: str, temp_path: Path, paths: dict, golden: dict,
+                    rtl_stdout: str, rtl_stderr: str, test_start_time: float,
+                    divergence: str = None) -> bool:
+        """Compare the RTL dumps against the simulator, record the result and save debug files
+
+        A lockstep divergence report fails the test without comparing dumps, the
+        stopped simulation never wrote them.
+        """
+        # Step 4: Compare results
+        if divergence:
+            print(divergence)
+            passed = False
+        else:
+            rtl_halted = self.rtl_halted(rtl_stdout)
+            memory_match = self.compare_dumps(
+                golden['memory'], str(paths['rtl_memory']), "Memory")
+            registers_match = self.compare_dumps(
+                golden['registers'], str(paths['rtl_registers']), "Registers")
+            passed = rtl_halted and memory_match and registers_match
+
+        test_elapsed = time.time() - test_start_time
+        self.timing_data.setdefault('full_test', []).append(test_elapsed)
+        cycles = {'sim_cycles': golden.get('cycle_count'),
+                  'rtl_cycles': self.rtl_cycles(rtl_stdout)}
+        cycles.update(self.report_perf_counters(rtl_stdout, golden.get('cycle_count')))
+
+        if not passed and self.rtl_trace_level() < TRACE_FULL:
+            self.rerun_rtl_traced(test_name, temp_path, paths)
+        elif self.save_debug or not passed:
+            paths['rtl_stdout'].write_text(rtl_stdout)
+            paths['rtl_stderr'].write_text(rtl_stderr)
+
+        # The golden state only becomes text when it is saved as debug output
+        if self.save_debug or not passed:
+            paths['sim_memory'].write_text(
+                format_dump(golden['memory'], self.dump_format))
+            paths['sim_registers'].write_text(
+                format_dump(golden['registers'], self.dump_format))
+
+        if passed:
+            print(
+                f"✅ Test PASSED: RTL and simulator results match! ({test_elapsed:.2f}s total)")
+            self.test_results[test_name] = {
+                'status': 'PASSED', 'time': test_elapsed, **cycles}
+        else:
+            print(
+                f"❌ Test FAILED: Results don't match ({test_elapsed:.2f}s total)")
+            self.test_results[test_name] = {
+                'status': 'FAILED', 'time': test_elapsed, **cycles}
+
+        # The test already wrote everything into its work directory, keeping it is a rename
+        if self.save_debug or not passed:
+            debug_dir = self.debug_store.keep(temp_path, test_name)
+            print(f"Debug files saved to: {debug_dir}")
+        return passed
+
     def test_assembly_program(self, asm_file: str, test_name: str = None) -> bool:
         """Test an assembly program through both simulator and RTL"""
         if test_name is None:
             test_name = Path(asm_file).stem
 
+        snapshot = self.timing_snapshot()
+        try:
+            with self.cycle_budget(self.program_max_cycles(asm_file)):
+                return self.run_test(asm_file, test_name)
+        finally:
+            self.record_phases(test_name, self.timing_since(snapshot))
+
+    def program_max_cycles(self, asm_file: str) -> int:
+        """A program's cycle budget: its `; max_cycles: N` header, else the run's budget"""
+        try:
+            budget = read_cycle_budget(Path(asm_file).read_text())
+        except OSError:
+            budget = None  # Assembly reports the missing file
+        return budget or self.max_cycles
+
+    @contextlib.contextmanager
+    def cycle_budget(self, max_cycles: int):
+        """Run the simulator and the RTL with another cycle budget inside the block"""
+        run_max_cycles = self.max_cycles
+        self.max_cycles = max_cycles
+        try:
+            yield
+        finally:
+            self.max_cycles = run_max_cycles
+
+    def run_test(self, asm_file: str, test_name: str) -> bool:
+        """Body of test_assembly_program"""
         print(f"\n{'='*60}")
         print(f"🧪 Testing: {asm_file}")
         print(f"Test name: {test_name}")
@@ -285,106 +904,260 @@ class TurtleCPUTestFramework:
         test_start_time = time.time()
 
         # Create temporary directory for test outputs
-        with tempfile.TemporaryDirectory(prefix=f"turtle_test_{test_name}_") as temp_dir:
+        with self.debug_store.work_dir(f"turtle_test_{test_name}_") as temp_dir:
             temp_path = Path(temp_dir)
+            paths = self.test_file_paths(temp_path, test_name)
 
-            # File paths
-            binstr_file = temp_path / f"{test_name}_instructions.binstr.txt"
-
-            sim_memory_dump = temp_path / f"{test_name}_sim_memory.binstr.txt"
-            sim_registers_dump = temp_path / \
-                f"{test_name}_sim_registers.binstr.txt"
-
-            rtl_memory_dump = temp_path / f"{test_name}_rtl_memory.binstr.txt"
-            rtl_registers_dump = temp_path / \
-                f"{test_name}_rtl_registers.binstr.txt"
-
-            # Step 1: Assemble the program
-            if not self.assemble_program(asm_file, str(binstr_file)):
-                print("❌ Test FAILED: Assembly failed")
-                self.test_results[test_name] = {
-                    'status': 'FAILED', 'time': time.time() - test_start_time}
-                return False
-
-            # Step 2: Run simulator
-            if not self.run_simulator(str(binstr_file), str(sim_memory_dump), str(sim_registers_dump)):
-                print("❌ Test FAILED: Simulator failed")
+            # Steps 1-2: Assemble the program and run the simulator
+            golden = self.prepare_test(asm_file, paths)
+            if golden is None:
                 self.test_results[test_name] = {
                     'status': 'FAILED', 'time': time.time() - test_start_time}
                 return False
 
             # Step 3: Run RTL simulation
-            rtl_success, rtl_stdout, rtl_stderr = self.run_rtl_simulation(
-                str(binstr_file), str(rtl_memory_dump),
-                str(rtl_registers_dump))
+            divergence = None
+            if self.lockstep or self.checkpoint_interval:
+                rtl_success, rtl_stdout, rtl_stderr, divergence = self.run_rtl_streaming(paths)
+            else:
+                rtl_success, rtl_stdout, rtl_stderr = self.run_rtl_simulation(
+                    str(paths['binstr']), str(paths['rtl_memory']),
+                    str(paths['rtl_registers']))
             if not rtl_success:
                 print("❌ Test FAILED: RTL simulation failed")
                 self.test_results[test_name] = {
                     'status': 'FAILED', 'time': time.time() - test_start_time}
                 return False
 
-            # Save testbench output to temp files for debug saving
-            rtl_stdout_file = temp_path / f"{test_name}_rtl_stdout.txt"
-            rtl_stderr_file = temp_path / f"{test_name}_rtl_stderr.txt"
+            return self.finish_test(test_name, temp_path, paths, golden,
+                                    rtl_stdout, rtl_stderr, test_start_time, divergence)
 
-            with open(rtl_stdout_file, 'w') as f:
-                f.write(rtl_stdout)
-            with open(rtl_stderr_file, 'w') as f:
-                f.write(rtl_stderr)
-
-            # Step 4: Compare results
-            memory_match = self.compare_dumps(
-                str(sim_memory_dump), str(rtl_memory_dump), "Memory")
-            registers_match = self.compare_dumps(
-                str(sim_registers_dump), str(rtl_registers_dump), "Registers")
+    def run_tests_pipelined(self, test_files: list) -> Tuple[int, int]:
+        """Run tests with their stages overlapping, return (passed, failed)
 
-            test_elapsed = time.time() - test_start_time
-            self.timing_data.setdefault('full_test', []).append(test_elapsed)
+        An asyncio scheduler runs one RTL simulation at a time, while the next
+        self.pipeline_depth programs are assembled and golden-simulated in threads.
+        Each test's output is collected in its own log and printed as one block when
+        the test finishes.
+        """
+        print(f"Running tests pipelined, preparing up to {self.pipeline_depth} programs ahead")
 
-            if memory_match and registers_match:
-                print(
-                    f"✅ Test PASSED: RTL and simulator results match! ({test_elapsed:.2f}s total)")
-                self.test_results[test_name] = {
-                    'status': 'PASSED', 'time': test_elapsed}
+        # Build before the scheduler starts, so no test waits on it holding the RTL
+        if not self.ensure_rtl_built():
+            for test_file in test_files:
+                self.test_results[Path(test_file).stem] = {
+                    'status': 'FAILED', 'time': 0.0}
+            return 0, len(test_files)
+
+        router = LogRouter(sys.stdout)
+        with contextlib.redirect_stdout(router):
+            results = asyncio.run(self.run_pipeline(test_files, router))
+        passed = sum(results)
+        return passed, len(results) - passed
+
+    async def run_pipeline(self, test_files: list, router: LogRouter) -> list:
+        """Schedule every test of a pipelined run, return whether each one passed"""
+        rtl_lock = asyncio.Lock()
+        # The test in the RTL simulation plus the ones prepared behind it
+        lookahead = asyncio.Semaphore(self.pipeline_depth + 1)
+
+        async def run_one(test_file: str) -> bool:
+            log = LogRouter.start_test()
+            test_name = Path(test_file).stem
+            # Every test gets its own copy of the framework for its results and timing
+            test = copy.copy(self)
+            test.test_results = {}
+            test.timing_data = {}
+
+            async with lookahead:
+                try:
+                    passed = await test.run_test_pipelined(test_file, test_name, rtl_lock)
+                except Exception as e:
+                    print(f"❌ Test FAILED with exception: {e}")
+                    test.test_results[test_name] = {'status': 'FAILED', 'time': 0.0}
+                    passed = False
+
+            self.merge_results(test.test_results, test.timing_data)
+            router.stdout.write(log.getvalue())
+            return passed
+
+        return await asyncio.gather(*(run_one(str(test_file)) for test_file in test_files))
+
+    async def run_test_pipelined(self, asm_file: str, test_name: str,
+                                 rtl_lock: asyncio.Lock) -> bool:
+        """Pipelined counterpart of test_assembly_program
+
+        Preparation runs in a thread, so it overlaps with the RTL simulation of an
+        earlier test. The RTL run and the comparison hold rtl_lock, a traced rerun
+        of a failing test shares the RTL run directory.
+        """
+        print(f"\n{'='*60}")
+        print(f"🧪 Testing: {asm_file}")
+        print(f"Test name: {test_name}")
+        print(f"{'='*60}")
 
-                # Save debug files if requested
-                if self.save_debug:
-                    debug_dir = self.debug_dir / test_name
-                    debug_dir.mkdir(parents=True, exist_ok=True)
+        test_start_time = time.time()
+        try:
+            with self.cycle_budget(self.program_max_cycles(asm_file)), \
+                    self.debug_store.work_dir(f"turtle_test_{test_name}_") as temp_dir:
+                temp_path = Path(temp_dir)
+                paths = self.test_file_paths(temp_path, test_name)
+
+                # Steps 1-2: Assemble the program and run the simulator
+                golden = await asyncio.to_thread(self.prepare_test, asm_file, paths)
+                if golden is None:
+                    self.test_results[test_name] = {
+                        'status': 'FAILED', 'time': time.time() - test_start_time}
+                    return False
+
+                # Steps 3-4: Run RTL simulation and compare
+                async with rtl_lock:
+                    rtl_success, rtl_stdout, rtl_stderr, divergence = await self.run_rtl_async(paths)
+                    if not rtl_success:
+                        print("❌ Test FAILED: RTL simulation failed")
+                        self.test_results[test_name] = {
+                            'status': 'FAILED', 'time': time.time() - test_start_time}
+                        return False
+
+                    return await asyncio.to_thread(
+                        self.finish_test, test_name, temp_path, paths, golden,
+                        rtl_stdout, rtl_stderr, test_start_time, divergence)
+        finally:
+            self.record_phases(test_name, self.timing_since({}))
+
+    async def run_rtl_async(self, paths: dict) -> Tuple[bool, str, str, Optional[str]]:
+        """Run a test's RTL simulation without blocking the scheduler
+
+        Returns (rtl_success, stdout, stderr, divergence) like run_rtl_streaming. A
+        plain run streams the testbench output and is killed at the first
+        $error/$fatal line. Lockstep and checkpoint runs run in a thread.
+        """
+        if self.lockstep or self.checkpoint_interval:
+            return await asyncio.to_thread(self.run_rtl_streaming, paths)
+
+        print(f"⚡ Running RTL simulation with {paths['binstr']}")
+        cmd = self.rtl_run_command(
+            program_plusargs(paths['binstr'], paths['rtl_memory'], paths['rtl_registers']))
+        print(f"Running: {' '.join(cmd)}")
+        start_time = time.time()
+        ret_code, stdout, aborted = await stream_process(
+            cmd, str(self.rtl_run_dir), lambda line: bool(ERROR_RE.search(line)))
+        elapsed = time.time() - start_time
+        self.timing_data.setdefault('rtl_simulation', []).append(elapsed)
 
-                    for src_file in temp_path.glob("*"):
-                        if src_file.is_file():
-                            dst_file = debug_dir / src_file.name
-                            subprocess.run(
-                                ["cp", str(src_file), str(dst_file)])
+        if aborted:
+            print(f"❌ RTL simulation aborted at: {aborted} ({elapsed:.2f}s)")
+            return False, stdout, "", None
+        if ret_code != 0:
+            print(f"RTL simulation failed: {stdout[-2000:]}")
+            return False, stdout, "", None
 
-                    # Save testbench output for debugging
-                    if rtl_stdout:
-                        testbench_log = debug_dir / \
-                            f"{test_name}_testbench.log"
-                        with open(testbench_log, 'w') as f:
-                            f.write(rtl_stdout)
+        print(f"✅ RTL simulation successful ({elapsed:.2f}s)")
+        return True, stdout, "", None
 
-                    print(f"Debug files saved to: {debug_dir}")
+    def run_tests_batch(self, test_files: list) -> Tuple[int, int]:
+        """Run tests with a single RTL simulation for all programs, return (passed, failed)
 
-                return True
-            else:
-                print(
-                    f"❌ Test FAILED: Results don't match ({test_elapsed:.2f}s total)")
-                self.test_results[test_name] = {
-                    'status': 'FAILED', 'time': test_elapsed}
+        Every program is assembled and simulated first, then one batch RTL run produces
+        all RTL dumps and each result is compared against the simulator in one pass.
+        """
+        passed = 0
+        failed = 0
 
-                # Copy files to a persistent location for debugging
-                debug_dir = self.debug_dir / test_name
-                debug_dir.mkdir(parents=True, exist_ok=True)
+        with self.debug_store.work_dir("turtle_batch_") as batch_dir:
+            batch_path = Path(batch_dir)
+            prepared = []  # (test_name, temp_path, paths, golden, prepare_time, phases)
+            budgets = []  # Cycle budget of every prepared program
 
-                for src_file in temp_path.glob("*"):
-                    if src_file.is_file():
-                        dst_file = debug_dir / src_file.name
-                        subprocess.run(["cp", str(src_file), str(dst_file)])
+            # Steps 1-2 for every program
+            for index, test_file in enumerate(test_files):
+                test_name = Path(test_file).stem
+                print(f"\n{'='*60}")
+                print(f"🧪 Preparing: {test_file}")
+                print(f"{'='*60}")
+
+                start_time = time.time()
+                snapshot = self.timing_snapshot()
+                temp_path = batch_path / f"{index:04d}_{test_name}"
+                temp_path.mkdir()
+                paths = self.test_file_paths(temp_path, test_name)
+
+                max_cycles = self.program_max_cycles(str(test_file))
+                try:
+                    with self.cycle_budget(max_cycles):
+                        golden = self.prepare_test(str(test_file), paths)
+                except Exception as e:
+                    print(f"❌ Test FAILED with exception: {e}")
+                    golden = None
+
+                if golden is not None:
+                    prepared.append((test_name, temp_path, paths, golden,
+                                     time.time() - start_time, self.timing_since(snapshot)))
+                    budgets.append(max_cycles)
+                else:
+                    self.test_results[test_name] = {
+                        'status': 'FAILED', 'time': time.time() - start_time}
+                    self.record_phases(test_name, self.timing_since(snapshot))
+                    failed += 1
 
-                print(f"Debug files saved to: {debug_dir}")
-                return False
+            if not prepared:
+                return passed, failed
+
+            # Step 3: One RTL simulation for every prepared program. The testbench has one
+            # budget for the whole batch, programs that need less were held to theirs above.
+            rtl_start_time = time.time()
+            with self.cycle_budget(max(budgets)):
+                rtl_success, rtl_stdout, rtl_stderr = self.run_rtl_batch(
+                    [(str(paths['binstr']), str(paths['rtl_memory']), str(paths['rtl_registers']))
+                     for _, _, paths, _, _, _ in prepared],
+                    str(batch_path / "batch_manifest.txt"))
+            rtl_share = (time.time() - rtl_start_time) / len(prepared)
+            rtl_logs = self.split_batch_output(rtl_stdout, len(prepared))
+
+            # Step 4: Compare every program, charging each an equal share of the RTL run
+            for (test_name, temp_path, paths, golden, prepare_time, phases), rtl_log, max_cycles in zip(
+                    prepared, rtl_logs, budgets):
+                print(f"\n{'='*60}")
+                print(f"🧪 Checking: {test_name}")
+                print(f"{'='*60}")
+
+                test_start_time = time.time() - prepare_time - rtl_share
+                snapshot = self.timing_snapshot()
+                if not rtl_success:
+                    print("❌ Test FAILED: RTL simulation failed")
+                    self.test_results[test_name] = {
+                        'status': 'FAILED', 'time': time.time() - test_start_time}
+                    failed += 1
+                else:
+                    with self.cycle_budget(max_cycles):
+                        test_passed = self.finish_test(test_name, temp_path, paths, golden,
+                                                       rtl_log, rtl_stderr, test_start_time)
+                    if test_passed:
+                        passed += 1
+                    else:
+                        failed += 1
+
+                phases['rtl_simulation'] = rtl_share
+                for phase, seconds in self.timing_since(snapshot).items():
+                    phases[phase] = phases.get(phase, 0.0) + seconds
+                self.record_phases(test_name, phases)
+
+        return passed, failed
+
+    def timing_snapshot(self) -> dict:
+        """Number of timing_data entries per operation, see timing_since"""
+        return {operation: len(times) for operation, times in self.timing_data.items()}
+
+    def timing_since(self, snapshot: dict) -> dict:
+        """Seconds spent per operation since a timing_snapshot"""
+        return {operation: sum(times[snapshot.get(operation, 0):])
+                for operation, times in self.timing_data.items()
+                if operation != 'full_test' and len(times) > snapshot.get(operation, 0)}
+
+    def record_phases(self, test_name: str, phases: dict):
+        """Attach per-phase seconds to a recorded test result for the reports"""
+        if test_name in self.test_results:
+            self.test_results[test_name]['phases'] = phases
 
     def print_timing_summary(self):
         """Print a concise summary of timing data collected during tests"""
@@ -400,7 +1173,7 @@ class TurtleCPUTestFramework:
             total_test_time = sum(self.timing_data['full_test'])
 
         # Show breakdown by individual operations
-        operation_order = ['assembly', 'simulation',
+        operation_order = ['assembly', 'simulation', 'snapshot',
                            'rtl_simulation', 'comparison']
 
         for operation in operation_order:
@@ -431,8 +1204,156 @@ class TurtleCPUTestFramework:
                 print(
                     f"  {'Framework':<15}: {overhead_percentage:4.1f}% (overhead)")
 
+        # Traced reruns of failing tests happen outside the per-test time
+        if self.timing_data.get('debug_trace'):
+            reruns = self.timing_data['debug_trace']
+            print(
+                f"  {'Debug Trace':<15}: {len(reruns)} reruns ({sum(reruns):.2f}s)")
+
         print(f"{'─'*40}")
         print(f"  {'Total Time':<15}: {total_test_time:.2f}s")
+        if self.suite_wall_time is not None:
+            mode = f"{self.jobs} jobs" if self.jobs > 1 else f"pipelined, depth {self.pipeline_depth}"
+            print(f"  {'Wall Time':<15}: {self.suite_wall_time:.2f}s ({mode})")
+
+        if self.cache and self.cache.stats:
+            print("\n💾 RESULT CACHE")
+            print(f"{'─'*40}")
+            for kind, counts in self.cache.stats.items():
+                print(
+                    f"  {kind.replace('_', ' ').title():<15}: {counts['hits']} hits, {counts['misses']} misses")
+
+    def write_reports(self, json_file: str = None, junit_file: str = None,
+                      baseline_file: str = None,
+                      threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> bool:
+        """Write the requested JSON/JUnit reports and check the run against a baseline report
+
+        Returns False if any phase regressed beyond threshold percent.
+        """
+        report = build_report(self.test_results, self.timing_data, {
+            'jobs': self.jobs,
+            'batch': self.batch,
+            'lockstep': self.lockstep,
+            'checkpoint_interval': self.checkpoint_interval,
+            'rtl_only': self.rtl_only,
+            'backend': self.backend.name,
+            'max_cycles': self.max_cycles,
+            'wall_time': self.suite_wall_time,
+        })
+        if self.uart_reports:
+            report['uart_stream'] = self.uart_reports
+        if self.latency_reports:
+            report['latency_sweep'] = self.latency_reports
+        if self.bench_results:
+            report['rtl_bench'] = self.bench_results
+
+        if json_file:
+            write_json_report(report, json_file)
+            print(f"📄 JSON report written to {json_file}")
+        if junit_file:
+            write_junit_report(report, junit_file)
+            print(f"📄 JUnit report written to {junit_file}")
+        if not baseline_file:
+            return True
+
+        baseline = json.loads(Path(baseline_file).read_text())
+        regressions = compare_reports(report, baseline, threshold)
+        if not regressions:
+            print(f"✅ No phase regressed more than {threshold:g}% against {baseline_file}")
+            return True
+
+        print(f"\n🐢 {len(regressions)} phases regressed more than {threshold:g}% against {baseline_file}:")
+        for test_name, phase, before, after in regressions:
+            print(f"  • {test_name:<30} {phase:<18} {before:.3f}s -> {after:.3f}s "
+                  f"(+{(after / before - 1) * 100:.0f}%)")
+        return False
+
+    def worker_settings(self) -> dict:
+        """Attributes copied onto the framework instance of each parallel worker"""
+        return {
+            'save_debug': self.save_debug,
+            'batch': self.batch,
+            'max_cycles': self.max_cycles,
+            'trace_level': self.trace_level,
+            'cache': self.cache,
+            'debug_store': self.debug_store,
+            'dump_format': self.dump_format,
+            'lockstep': self.lockstep,
+            'checkpoint_interval': self.checkpoint_interval,
+            'backend': self.backend,
+            'golden_store': self.golden_store,
+            'rtl_only': self.rtl_only,
+            'refresh_golden': self.refresh_golden,
+        }
+
+    def merge_results(self, test_results: dict, timing_data: dict,
+                      cache_stats: dict = None):
+        """Merge test results, timing data and cache stats collected by another framework instance"""
+        self.test_results.update(test_results)
+        for operation, times in timing_data.items():
+            self.timing_data.setdefault(operation, []).extend(times)
+        if self.cache and cache_stats:
+            for kind, counts in cache_stats.items():
+                merged = self.cache.stats.setdefault(kind, {'hits': 0, 'misses': 0})
+                merged['hits'] += counts['hits']
+                merged['misses'] += counts['misses']
+
+    def serve(self, socket_path: Path = DEFAULT_SOCKET) -> bool:
+        """Run single tests for daemon clients until interrupted, see daemon.py
+
+        turtle-toolkit is imported and the RTL built up front, so requests only pay
+        for the test itself. Returns False if the RTL build failed.
+        """
+        from turtle_toolkit import simulate_program  # noqa: F401, imported once for all requests
+        from turtle_toolkit.assembler import Assembler  # noqa: F401
+        toolkit = self.toolkit_fingerprint()
+        if not self.ensure_rtl_built():
+            return False
+
+        run_trace_level = self.trace_level
+
+        def run_request(request: dict) -> dict:
+            # An edited toolkit can't be reimported in place, the daemon has to restart
+            self._toolkit_fingerprint = None
+            if self.toolkit_fingerprint() != toolkit:
+                print("❌ turtle-toolkit changed since the daemon started, restart it")
+                return {'passed': False, 'stop': True}
+
+            self.test_results = {}
+            self.timing_data = {}
+            if self.cache:
+                self.cache.stats = {}
+            # Rechecks the RTL build stamp, so edited RTL is rebuilt before the test
+            self.rtl_built = False
+            trace = request.get('trace')
+            self.trace_level = run_trace_level if trace is None else trace
+            try:
+                test_file = self.resolve_test_file(request['test_file'])
+                if not Path(test_file).exists():
+                    print(f"❌ Test file not found: {test_file}")
+                    return {'passed': False}
+
+                print(f"🧪 Testing: {test_file}")
+                passed = self.test_assembly_program(test_file, request.get('test_name'))
+                self.prune_outputs()
+                if self.test_results:
+                    self.print_test_results_summary()
+                    self.print_timing_summary()
+                return {'passed': passed, 'results': self.test_results}
+            finally:
+                self.trace_level = run_trace_level
+
+        try:
+            serve_requests(run_request, socket_path)
+        except KeyboardInterrupt:
+            print("\nTest daemon stopped")
+        return True
+
+    def prune_outputs(self):
+        """Evict old result cache entries and debug directories beyond their size limits"""
+        if self.cache:
+            self.cache.prune()
+        self.debug_store.prune()
 
     def print_test_results_summary(self):
         """Print a detailed summary of all test results"""
@@ -464,6 +1385,16 @@ class TurtleCPUTestFramework:
             avg_time = total_time / total_tests
             print(f"Average Time:   {avg_time:5.2f}s per test")
 
+        # Counter inconsistencies don't fail a test, but an RTL change that adds cycles should show
+        cycle_warnings = {name: result['perf_warnings']
+                          for name, result in self.test_results.items()
+                          if result.get('perf_warnings')}
+        if cycle_warnings:
+            print("\n⚠️  PERFORMANCE COUNTER WARNINGS:")
+            for test_name, warnings in cycle_warnings.items():
+                for warning in warnings:
+                    print(f"  • {test_name:<30} {warning}")
+
         # Show failed tests if any
         if failed_tests:
             print(f"\n❌ FAILED TESTS:")
@@ -480,19 +1411,23 @@ class TurtleCPUTestFramework:
 
         print(f"{'='*60}")
 
+    def default_test_files(self) -> list:
+        """The suite's programs: .asm files in the toolkit examples and test_programs"""
+        examples_dir = self.turtle_toolkit_dir / "examples"
+        test_programs_dir = self.project_root / \
+            "tests" / "integration" / "test_programs"
+
+        test_files = []
+        if examples_dir.exists():
+            test_files.extend(list(examples_dir.glob("*.asm")))
+        if test_programs_dir.exists():
+            test_files.extend(list(test_programs_dir.glob("*.asm")))
+        return test_files
+
     def run_test_suite(self, test_patterns: list = None) -> bool:
         """Run a suite of tests"""
         if test_patterns is None:
-            # Default test patterns - look for .asm files in examples and test_programs
-            examples_dir = self.turtle_toolkit_dir / "examples"
-            test_programs_dir = self.project_root / \
-                "tests" / "integration" / "test_programs"
-
-            test_patterns = []
-            if examples_dir.exists():
-                test_patterns.extend(list(examples_dir.glob("*.asm")))
-            if test_programs_dir.exists():
-                test_patterns.extend(list(test_programs_dir.glob("*.asm")))
+            test_patterns = self.default_test_files()
 
         print(f"\n🚀 Running test suite with {len(test_patterns)} tests")
         suite_start_time = time.time()
@@ -500,20 +1435,31 @@ class TurtleCPUTestFramework:
         passed = 0
         failed = 0
 
-        for test_file in test_patterns:
-            try:
-                if self.test_assembly_program(str(test_file)):
-                    passed += 1
-                else:
+        if self.jobs > 1:
+            passed, failed = self.run_tests_parallel(test_patterns)
+        elif self.batch:
+            passed, failed = self.run_tests_batch(test_patterns)
+        elif self.pipeline_depth:
+            passed, failed = self.run_tests_pipelined(test_patterns)
+        else:
+            for test_file in test_patterns:
+                try:
+                    if self.test_assembly_program(str(test_file)):
+                        passed += 1
+                    else:
+                        failed += 1
+                except Exception as e:
+                    test_name = Path(test_file).stem
+                    print(f"❌ Test FAILED with exception: {e}")
+                    self.test_results[test_name] = {
+                        'status': 'FAILED', 'time': 0.0}
                     failed += 1
-            except Exception as e:
-                test_name = Path(test_file).stem
-                print(f"❌ Test FAILED with exception: {e}")
-                self.test_results[test_name] = {
-                    'status': 'FAILED', 'time': 0.0}
-                failed += 1
 
         suite_elapsed = time.time() - suite_start_time
+        if self.jobs > 1 or self.pipeline_depth:
+            self.suite_wall_time = suite_elapsed
+
+        self.prune_outputs()
 
         # Print comprehensive summary
         self.print_test_results_summary()
@@ -521,6 +1467,264 @@ class TurtleCPUTestFramework:
 
         return failed == 0
 
+    def run_fuzz(self, count: int, seed: int, length: int = DEFAULT_FUZZ_LENGTH) -> bool:
+        """Run `count` random programs through the suite pipeline and shrink failures
+
+        Runs serially, batched or in parallel like the suite. The first
+        FUZZ_SHRINK_LIMIT failing programs are shrunk to a minimal reproducer, saved
+        with the original program in the test's debug directory.
+        """
+        print(f"\n🎲 Fuzzing {count} programs of {length} instructions (seed {seed})")
+
+        with tempfile.TemporaryDirectory(prefix="turtle_fuzz_",
+                                         dir=self.scratch_dir) as fuzz_dir:
+            programs = {}  # asm file -> program lines
+            for index in range(count):
+                asm_file = Path(fuzz_dir) / f"fuzz_{seed}_{index:06d}.asm"
+                lines = generate_program(seed, index, length)
+                asm_file.write_text(format_program(
+                    lines, f"Fuzz program {index} (seed {seed}, length {length})"))
+                programs[asm_file] = lines
+
+            success = self.run_test_suite(list(programs))
+
+            failing = [asm_file for asm_file in programs
+                       if self.test_results.get(asm_file.stem, {}).get('status') != 'PASSED']
+            for asm_file in failing[:FUZZ_SHRINK_LIMIT]:
+                self.shrink_fuzz_failure(asm_file, programs[asm_file])
+            if len(failing) > FUZZ_SHRINK_LIMIT:
+                print(f"Not shrinking the other {len(failing) - FUZZ_SHRINK_LIMIT} failing programs")
+
+        return success
+
+    def shrink_fuzz_failure(self, asm_file: Path, lines: list):
+        """Shrink a failing fuzz program and save the original and minimal programs"""
+        test_name = asm_file.stem
+        print(f"\n🔍 Shrinking {test_name} ({len(lines)} lines)")
+        start_time = time.time()
+
+        def still_fails(candidate: list) -> bool:
+            candidate_file = asm_file.with_name(f"{test_name}_shrink.asm")
+            candidate_file.write_text(format_program(candidate, f"Shrinking {test_name}"))
+            return self.program_fails(str(candidate_file))
+
+        # Candidate runs don't count towards the suite's timing or output
+        timing_data = self.timing_data
+        self.timing_data = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            minimal = shrink_program(lines, still_fails)
+        self.timing_data = timing_data
+
+        debug_dir = self.debug_dir / test_name
+        debug_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copy(asm_file, debug_dir / asm_file.name)
+        minimal_file = debug_dir / f"{test_name}_min.asm"
+        minimal_file.write_text(format_program(
+            minimal, f"Minimal reproducer shrunk from {asm_file.name}"))
+        print(f"Shrunk {test_name} to {len(minimal)} lines in {time.time() - start_time:.2f}s: "
+              f"{minimal_file}")
+
+    def program_fails(self, asm_file: str) -> bool:
+        """Whether a program fails the RTL vs simulator comparison, without recording a result
+
+        A program that doesn't assemble or simulate counts as passing, so shrinking
+        never trades the original failure for a broken program.
+        """
+        with tempfile.TemporaryDirectory(prefix="turtle_shrink_",
+                                         dir=self.scratch_dir) as temp_dir:
+            paths = self.test_file_paths(Path(temp_dir), Path(asm_file).stem)
+            golden = self.prepare_test(asm_file, paths)
+            if golden is None:
+                return False
+
+            rtl_success, rtl_stdout, _ = self.run_rtl_simulation(
+                str(paths['binstr']), str(paths['rtl_memory']),
+                str(paths['rtl_registers']))
+            return not (rtl_success and self.rtl_halted(rtl_stdout)
+                        and self.compare_dumps(golden['memory'], str(paths['rtl_memory']), "Memory")
+                        and self.compare_dumps(golden['registers'], str(paths['rtl_registers']), "Registers"))
+
+    def run_tests_parallel(self, test_files: list) -> Tuple[int, int]:
+        """Run tests in a process pool of self.jobs workers, return (passed, failed)
+
+        In batch mode the tests are split into one batch per worker instead.
+        """
+        print(f"Running tests with {self.jobs} parallel jobs")
+
+        # Build once here so the workers never race on `make rebuild`
+        if not self.ensure_rtl_built():
+            for test_file in test_files:
+                self.test_results[Path(test_file).stem] = {
+                    'status': 'FAILED', 'time': 0.0}
+            return 0, len(test_files)
+
+        passed = 0
+        failed = 0
+
+        with tempfile.TemporaryDirectory(prefix="turtle_suite_") as scratch_root:
+            with ProcessPoolExecutor(
+                    max_workers=self.jobs,
+                    initializer=_init_test_worker,
+                    initargs=(str(self.project_root), self.worker_settings(),
+                              scratch_root)) as pool:
+                if self.batch:
+                    chunks = [[str(f) for f in test_files[i::self.jobs]]
+                              for i in range(self.jobs)]
+                    futures = {pool.submit(_run_batch_worker, chunk): chunk
+                               for chunk in chunks if chunk}
+                else:
+                    futures = {pool.submit(_run_test_worker, str(test_file)): [test_file]
+                               for test_file in test_files}
+
+                for future in as_completed(futures):
+                    try:
+                        worker_passed, worker_failed, test_results, timing_data, cache_stats, log = \
+                            future.result()
+                    except Exception as e:
+                        for test_file in futures[future]:
+                            test_name = Path(test_file).stem
+                            print(f"❌ Test {test_name} FAILED with worker exception: {e}")
+                            self.test_results[test_name] = {
+                                'status': 'FAILED', 'time': 0.0}
+                            failed += 1
+                        continue
+
+                    # Print each worker's output as one block so they don't interleave
+                    print(log, end="")
+                    self.merge_results(test_results, timing_data, cache_stats)
+                    passed += worker_passed
+                    failed += worker_failed
+
+        return passed, failed
+
+    def run_latency_sweep(self, test_files: list, grid: list, csv_file: str = None) -> bool:
+        """Simulate every program at every latency setting and report its slowdown
+
+        Each program is assembled once, then the (program, setting) simulations run
+        in a process pool of self.jobs workers, or one per CPU. Fails if a program
+        doesn't assemble or doesn't halt within the cycle budget at some setting.
+        """
+        workers = self.jobs if self.jobs > 1 else (os.cpu_count() or 1)
+        print(f"\n🐌 Sweeping {len(test_files)} programs over {len(grid)} latency settings "
+              f"with {workers} parallel jobs")
+        start_time = time.time()
+
+        programs = {}  # name -> (machine code, cycle budget)
+        for test_file in test_files:
+            binary_data = self.assemble_program(str(test_file))
+            if binary_data is not None:
+                programs[Path(test_file).stem] = (binary_data,
+                                                  self.program_max_cycles(str(test_file)))
+        success = len(programs) == len(test_files)
+
+        results = {name: {} for name in programs}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_latency_worker, str(self.project_root), self.cache,
+                                   max_cycles, binary_data, setting): (name, setting)
+                       for name, (binary_data, max_cycles) in programs.items()
+                       for setting in grid}
+            for future in as_completed(futures):
+                name, setting = futures[future]
+                try:
+                    cycles, elapsed = future.result()
+                except Exception as e:
+                    print(f"❌ {name} at {setting.name} FAILED with worker exception: {e}")
+                    cycles, elapsed = None, 0.0
+                self.timing_data.setdefault('simulation', []).append(elapsed)
+                results[name][setting] = cycles
+
+        not_halted = [f"{name}@{setting.name}" for name, cycles in results.items()
+                      for setting in grid if cycles.get(setting) is None]
+        if not_halted:
+            print(f"❌ No halt within the cycle budget: {', '.join(not_halted)}")
+            success = False
+
+        self.latency_reports = sweep_report(results, grid)
+        print("\n🐌 SLOWDOWN AGAINST ZERO-LATENCY MEMORIES (fetch/data wait cycles)")
+        print(f"{'─'*72}")
+        print(format_sweep_table(results, grid))
+        print(f"{'─'*72}")
+        print(f"  {'Wall Time':<30}: {time.time() - start_time:.2f}s")
+        if csv_file:
+            write_sweep_csv(csv_file, self.latency_reports)
+            print(f"📄 Latency sweep CSV written to {csv_file}")
+
+        self.prune_outputs()
+        return success
+
+
+# Framework instance owned by each run_tests_parallel worker process
+_worker_framework = None
+
+
+def _init_test_worker(project_root: str, settings: dict, scratch_root: str):
+    """Process pool initializer: give the worker its own temp and RTL run directory"""
+    global _worker_framework
+    framework = TurtleCPUTestFramework(project_root)
+    for name, value in settings.items():
+        setattr(framework, name, value)
+    worker_dir = Path(tempfile.mkdtemp(prefix=f"worker_{os.getpid()}_",
+                                       dir=scratch_root))
+    framework.scratch_dir = str(worker_dir)
+    framework.rtl_run_dir = framework.prepare_rtl_run_dir(worker_dir)
+    framework.rtl_built = True  # The parent process builds before starting workers
+    _worker_framework = framework
+
+
+def _reset_worker_framework() -> "TurtleCPUTestFramework":
+    """Clear the results a worker collected for its previous task"""
+    framework = _worker_framework
+    framework.test_results = {}
+    framework.timing_data = {}
+    if framework.cache:
+        framework.cache.stats = {}
+    return framework
+
+
+def _run_test_worker(test_file: str) -> Tuple[int, int, dict, dict, dict, str]:
+    """Run one test in a worker
+
+    Returns (passed, failed, test_results, timing_data, cache_stats, log).
+    """
+    framework = _reset_worker_framework()
+
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            success = framework.test_assembly_program(test_file)
+        except Exception as e:
+            print(f"❌ Test FAILED with exception: {e}")
+            framework.test_results[Path(test_file).stem] = {
+                'status': 'FAILED', 'time': 0.0}
+            success = False
+
+    cache_stats = framework.cache.stats if framework.cache else {}
+    return (int(success), int(not success), framework.test_results,
+            framework.timing_data, cache_stats, log.getvalue())
+
+
+def _run_batch_worker(test_files: list) -> Tuple[int, int, dict, dict, dict, str]:
+    """Run a batch of tests in a worker, same return value as _run_test_worker"""
+    framework = _reset_worker_framework()
+
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        passed, failed = framework.run_tests_batch(test_files)
+
+    cache_stats = framework.cache.stats if framework.cache else {}
+    return (passed, failed, framework.test_results, framework.timing_data,
+            cache_stats, log.getvalue())
+
+
+def _run_latency_worker(project_root: str, cache: Optional[ResultCache], max_cycles: int,
+                        binary_data: bytes, setting: LatencySetting) -> Tuple[Optional[int], float]:
+    """Simulate one program at one latency setting, return (cycle count or None, seconds)"""
+    framework = TurtleCPUTestFramework(project_root, max_cycles=max_cycles, cache=cache)
+    start_time = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        state = framework.run_simulator(binary_data, setting)
+    return (state['cycle_count'] if state else None), time.time() - start_time
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -539,12 +1743,192 @@ def main():
                         help="Project root directory (defaults to script location)")
     parser.add_argument("--save-debug", "-d", action="store_true",
                         help="Save debug files even when tests pass")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of suite tests to run in parallel (default: 1)")
+    parser.add_argument("--batch", "-b", action="store_true",
+                        help="Run all suite programs in one RTL simulator process (one per job)")
+    parser.add_argument("--pipeline", nargs="?", type=int, const=DEFAULT_PIPELINE_DEPTH,
+                        default=0, metavar="DEPTH",
+                        help=f"Assemble and simulate up to DEPTH programs (default: {DEFAULT_PIPELINE_DEPTH}) "
+                             "while the RTL simulates an earlier one, aborting an RTL run at "
+                             "its first error line")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="RTL simulator: 'make' runs the rtl-toolkit flow (event accurate, "
+                             "for debugging), 'verilator' a compiled model built once "
+                             f"(default: {DEFAULT_BACKEND})")
+    parser.add_argument("--max-cycles", type=int, default=DEFAULT_MAX_CYCLES,
+                        help=f"Cycle budget for the simulator and the RTL, a program's "
+                             f"`; max_cycles: N` header overrides it (default: {DEFAULT_MAX_CYCLES})")
+    parser.add_argument("--trace", type=int, default=TRACE_QUIET,
+                        choices=[TRACE_QUIET, TRACE_TEXT, TRACE_FULL],
+                        help="RTL trace level: 0 = quiet, 1 = per-cycle text, 2 = text and VCD "
+                             "(default: 0, failing tests are rerun at 2)")
+    parser.add_argument("--force-rebuild", action="store_true",
+                        help="Run `make rebuild` even if the RTL build is current or cached")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't use the result cache for assembly, simulation and RTL builds")
+    parser.add_argument("--cache-dir",
+                        help="Result cache directory (defaults to tests/integration/.result_cache)")
+    parser.add_argument("--cache-size-mb", type=int, default=DEFAULT_CACHE_SIZE_MB,
+                        help=f"Evict least recently used cache entries above this size (default: {DEFAULT_CACHE_SIZE_MB})")
+    parser.add_argument("--debug-size-mb", type=int, default=DEFAULT_DEBUG_SIZE_MB,
+                        help=f"Evict the oldest debug_output directories above this size "
+                             f"(default: {DEFAULT_DEBUG_SIZE_MB})")
+    parser.add_argument("--dump-format", choices=DUMP_FORMATS, default="hex",
+                        help="Format of the RTL memory/register dumps (default: hex)")
+    parser.add_argument("--lockstep", action="store_true",
+                        help="Check every retired RTL instruction against a reference trace, "
+                             "stopping at the first divergence (not with --batch)")
+    parser.add_argument("--checkpoint-interval", type=int, default=0, metavar="CYCLES",
+                        help="Dump the RTL state every CYCLES cycles and check each dump against "
+                             "the reference model while the run goes on (not with --batch)")
+    parser.add_argument("--report", metavar="FILE",
+                        help="Write a JSON report with per-test, per-phase timings and cycle counts")
+    parser.add_argument("--junit", metavar="FILE",
+                        help="Write a JUnit XML report")
+    parser.add_argument("--compare-baseline", metavar="FILE",
+                        help="Fail if a phase got slower than in this earlier --report file")
+    parser.add_argument("--regression-threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        metavar="PERCENT",
+                        help=f"Slowdown flagged by --compare-baseline and --rtl-bench "
+                             f"(default: {DEFAULT_REGRESSION_THRESHOLD:g}%%)")
+    parser.add_argument("--fuzz", type=int, metavar="N",
+                        help="Run N randomly generated programs instead of the suite")
+    parser.add_argument("--seed", type=int,
+                        help="Seed for --fuzz (defaults to a random seed, printed for reruns)")
+    parser.add_argument("--fuzz-length", type=int, default=DEFAULT_FUZZ_LENGTH,
+                        help=f"Instructions per fuzz program (default: {DEFAULT_FUZZ_LENGTH})")
+    parser.add_argument("--uart-stream", metavar="PROGRAM",
+                        help="Stream a program over the FPGA wrapper's UART in simulation and "
+                             "measure throughput instead of running the suite")
+    parser.add_argument("--uart-baud-rates", type=int, nargs="+", default=DEFAULT_BAUD_RATES,
+                        metavar="BAUD",
+                        help=f"BAUD_RATE settings for --uart-stream (default: {' '.join(map(str, DEFAULT_BAUD_RATES))})")
+    parser.add_argument("--uart-oversample-rates", type=int, nargs="+",
+                        default=DEFAULT_OVERSAMPLE_RATES, metavar="OSR",
+                        help=f"OVERSAMPLE_RATE settings for --uart-stream (default: {' '.join(map(str, DEFAULT_OVERSAMPLE_RATES))})")
+    parser.add_argument("--uart-idle-bits", type=int, default=DEFAULT_IDLE_BITS,
+                        help=f"Idle bit times the host leaves between frames (default: {DEFAULT_IDLE_BITS})")
+    parser.add_argument("--latency-sweep", action="store_true",
+                        help="Simulate the programs over a grid of memory latencies and report "
+                             "each one's slowdown instead of running the suite")
+    parser.add_argument("--fetch-latencies", type=int, nargs="+",
+                        default=DEFAULT_FETCH_LATENCIES, metavar="CYCLES",
+                        help=f"Instruction fetch wait cycles for --latency-sweep "
+                             f"(default: {' '.join(map(str, DEFAULT_FETCH_LATENCIES))})")
+    parser.add_argument("--data-latencies", type=int, nargs="+",
+                        default=DEFAULT_DATA_LATENCIES, metavar="CYCLES",
+                        help=f"Data memory wait cycles for --latency-sweep "
+                             f"(default: {' '.join(map(str, DEFAULT_DATA_LATENCIES))})")
+    parser.add_argument("--latency-csv", metavar="FILE",
+                        help="Write the --latency-sweep results as CSV")
+    parser.add_argument("--rtl-only", action="store_true",
+                        help="Check the RTL against recorded golden snapshots instead of "
+                             "assembling and simulating (no turtle-toolkit needed)")
+    parser.add_argument("--refresh-golden", action="store_true",
+                        help="Record a golden snapshot of every program the run simulates")
+    parser.add_argument("--golden-dir",
+                        help=f"Golden snapshot directory (default: {DEFAULT_GOLDEN_DIR})")
+    parser.add_argument("--serve", action="store_true",
+                        help="Keep running and test single programs sent by "
+                             "`python3 tests/integration/daemon.py FILE`")
+    parser.add_argument("--socket", default=str(DEFAULT_SOCKET),
+                        help=f"Unix socket of --serve (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--units", action="store_true",
+                        help="Also build and run every RTL block's unit testbench, in parallel "
+                             "(--jobs workers, or one per CPU)")
+    parser.add_argument("--rtl-bench", nargs="*", choices=BENCH_NAMES, metavar="BENCH",
+                        help="Run the yosys/eqy/sby benchmarks over their parameter grids "
+                             f"(default: all of {', '.join(BENCH_NAMES)}) and check them "
+                             "against the benchmark history")
+    parser.add_argument("--bench-param", action="append", metavar="PARAM=V1,V2",
+                        help="Values of a parameter for --rtl-bench instead of the grid's, "
+                             "e.g. DATA_W=8,64 (repeatable)")
+    parser.add_argument("--bench-history", default=str(DEFAULT_BENCH_HISTORY), metavar="FILE",
+                        help=f"Benchmark history of --rtl-bench (default: {DEFAULT_BENCH_HISTORY})")
 
     args = parser.parse_args()
+    if args.lockstep and args.batch:
+        parser.error("--lockstep runs each program in its own simulation, drop --batch")
+    if args.checkpoint_interval and args.batch:
+        parser.error("--checkpoint-interval needs a simulation per program, drop --batch")
+    if args.pipeline and (args.batch or args.jobs > 1):
+        parser.error("--pipeline overlaps the stages of a serial run, drop --batch and --jobs")
+    if args.rtl_only and args.refresh_golden:
+        parser.error("--refresh-golden simulates every program, drop --rtl-only")
+    if args.rtl_only and (args.fuzz or args.latency_sweep):
+        parser.error("--fuzz and --latency-sweep need the simulator, drop --rtl-only")
+    if args.checkpoint_interval < 0:
+        parser.error("--checkpoint-interval can't be negative")
+    try:
+        bench_overrides = parse_overrides(args.bench_param)
+    except ValueError as e:
+        parser.error(f"--bench-param: {e}")
+
+    cache = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or Path(__file__).parent / ".result_cache"
+        cache = ResultCache(cache_dir, args.cache_size_mb)
+
+    framework = TurtleCPUTestFramework(args.project_root, args.save_debug,
+                                       args.jobs, args.batch, args.max_cycles,
+                                       args.trace, cache, args.dump_format, args.lockstep,
+                                       args.force_rebuild,
+                                       checkpoint_interval=args.checkpoint_interval)
+    framework.debug_store = DebugStore(framework.debug_dir, args.debug_size_mb)
+    framework.pipeline_depth = max(0, args.pipeline)
+    framework.backend = make_backend(args.backend, framework.rtl_dir)
+    if args.golden_dir:
+        framework.golden_store = GoldenStore(args.golden_dir)
+    if args.rtl_only and not framework.golden_store.has_snapshots():
+        parser.error(f"--rtl-only found no golden snapshots in "
+                     f"{framework.golden_store.golden_dir}, record them with `make golden` "
+                     "where turtle-toolkit is installed")
+    framework.rtl_only = args.rtl_only
+    framework.refresh_golden = args.refresh_golden
+
+    units_passed = run_unit_tests(framework) if args.units else True
+
+    def finish(success: bool):
+        """Write the requested reports and exit, also failing on unit testbenches and regressions"""
+        if not units_passed:
+            success = False
+        if not framework.write_reports(args.report, args.junit, args.compare_baseline,
+                                       args.regression_threshold):
+            success = False
+        sys.exit(0 if success else 1)
 
-    framework = TurtleCPUTestFramework(args.project_root, args.save_debug)
-
-    if args.test_file:
+    if args.serve:
+        finish(framework.serve(Path(args.socket)))
+    elif args.rtl_bench is not None:
+        success = run_rtl_bench(framework, bench_points(args.rtl_bench, bench_overrides),
+                                Path(args.bench_history), args.regression_threshold)
+        finish(success)
+    elif args.uart_stream:
+        settings = [UartSetting(baud_rate, oversample_rate, args.uart_idle_bits)
+                    for baud_rate in args.uart_baud_rates
+                    for oversample_rate in args.uart_oversample_rates]
+        too_fast = [setting.name for setting in settings if oversample_clocks(setting) < 2]
+        if too_fast:
+            parser.error(f"baud and oversample rates too high for the UART clock: {', '.join(too_fast)}")
+        success = run_uart_stream(framework, framework.resolve_test_file(args.uart_stream),
+                                  settings)
+        finish(success)
+    elif args.latency_sweep:
+        if any(latency < 0 for latency in args.fetch_latencies + args.data_latencies):
+            parser.error("latencies can't be negative")
+        test_files = framework.default_test_files()
+        if args.test_file:
+            test_files = [framework.resolve_test_file(args.test_file)]
+        success = framework.run_latency_sweep(
+            test_files, sweep_grid(args.fetch_latencies, args.data_latencies),
+            args.latency_csv)
+        finish(success)
+    elif args.fuzz:
+        seed = args.seed if args.seed is not None else random.randrange(2**32)
+        success = framework.run_fuzz(args.fuzz, seed, args.fuzz_length)
+        finish(success)
+    elif args.test_file:
         # Resolve the test file path
         resolved_test_file = framework.resolve_test_file(args.test_file)
 
@@ -559,13 +1943,14 @@ def main():
         # Test a single file
         success = framework.test_assembly_program(resolved_test_file,
                                                   args.test_name)
+        framework.prune_outputs()
 
         # Print summary for single test
         if framework.test_results:
             framework.print_test_results_summary()
             framework.print_timing_summary()
 
-        sys.exit(0 if success else 1)
+        finish(success)
     elif args.tests:
         # Find test by name
         test_file = framework.find_test_by_name(args.tests)
@@ -585,21 +1970,22 @@ def main():
 
         # Test the found file
         success = framework.test_assembly_program(test_file, args.tests)
+        framework.prune_outputs()
 
         # Print summary for single test
         if framework.test_results:
             framework.print_test_results_summary()
             framework.print_timing_summary()
 
-        sys.exit(0 if success else 1)
+        finish(success)
     elif args.test_suite:
         # Run the full test suite
         success = framework.run_test_suite()
-        sys.exit(0 if success else 1)
+        finish(success)
     else:
         # Default: run test suite
         success = framework.run_test_suite()
-        sys.exit(0 if success else 1)
+        finish(success)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+"""
+Tests for the fuzz program generator and shrinker in fuzz.py
+"""
+
+import pytest
+
+from .fuzz import (BRANCH_OPS, LABEL_RE, drop_dangling, format_program, generate_program,
+                   shrink_program)
+
+SEEDS = range(20)
+
+
+def branch_targets(lines: list) -> list:
+    """Labels the branches and jumps of a program go to"""
+    targets = []
+    for line in lines:
+        op, _, operand = line.partition(" ")
+        if op in BRANCH_OPS or op == "JMPI":
+            targets.append(operand)
+    return targets
+
+
+def labels(lines: list) -> list:
+    return [match.group(1) for match in map(LABEL_RE.match, lines) if match]
+
+
+def assert_no_dangling(lines: list):
+    """Every branch has its label and every label has a branch"""
+    assert set(branch_targets(lines)) == set(labels(lines))
+
+
+def is_subsequence(short: list, long: list) -> bool:
+    remaining = iter(long)
+    return all(line in remaining for line in short)
+
+
+def fails_on_store_after_branch(lines: list) -> bool:
+    """Stand-in for a failing RTL run: a STORE somewhere after a conditional branch"""
+    seen_branch = False
+    for line in lines:
+        if line.split(" ")[0] in BRANCH_OPS:
+            seen_branch = True
+        elif line == "STORE" and seen_branch:
+            return True
+    return False
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_generate_program_shape(seed):
+    lines = generate_program(seed, 0)
+    assert lines[0] == "start:"
+    assert lines[-1] == "HALT"
+    assert_no_dangling(lines)
+    # Branches only go forward
+    for index, line in enumerate(lines):
+        for target in branch_targets([line]):
+            assert f"{target}:" in lines[index + 1:]
+
+
+def test_generate_program_deterministic():
+    assert generate_program(1, 2) == generate_program(1, 2)
+    assert generate_program(1, 2) != generate_program(1, 3)
+
+
+def test_format_program():
+    source = format_program(["start:", "SET 1", "L0:", "HALT"], "title")
+    assert source == "; title\nstart:\n    SET 1\nL0:\n    HALT\n"
+
+
+def test_drop_dangling():
+    lines = ["BZ L0", "SET 1", "L1:", "JMPI L2", "L2:", "BNZ L3"]
+    assert drop_dangling(lines) == ["SET 1", "JMPI L2", "L2:"]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_shrink_program(seed):
+    lines = generate_program(seed, 0)
+    if not fails_on_store_after_branch(lines):
+        pytest.skip("program doesn't fail")
+    calls = []
+
+    def still_fails(candidate):
+        calls.append(candidate)
+        return fails_on_store_after_branch(candidate)
+
+    shrunk = shrink_program(lines, still_fails)
+
+    # Still fails, only ever removed lines and left no dangling references
+    assert fails_on_store_after_branch(shrunk)
+    assert is_subsequence(shrunk, lines)
+    assert len(shrunk) <= len(lines)
+    assert shrunk[0] == "start:" and shrunk[-1] == "HALT"
+    assert_no_dangling(shrunk)
+    for candidate in calls:
+        assert_no_dangling(candidate)
+
+    # A branch, its label and the STORE are all a failure needs
+    assert len(shrunk) == 5
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_shrink_program_one_minimal(seed):
+    """Removing any one more body line makes the program pass"""
+    lines = generate_program(seed, 0)
+    if not fails_on_store_after_branch(lines):
+        pytest.skip("program doesn't fail")
+    shrunk = shrink_program(lines, fails_on_store_after_branch)
+    body = shrunk[1:-1]
+    for index in range(len(body)):
+        candidate = drop_dangling(body[:index] + body[index + 1:])
+        assert not fails_on_store_after_branch(shrunk[:1] + candidate + shrunk[-1:])
+
+
+def test_shrink_program_passing_body_kept():
+    lines = ["start:", "SET 1", "HALT"]
+    assert shrink_program(lines, lambda candidate: False) == lines
@@ -0,0 +1,88 @@
+"""
+Tests for the golden snapshots in golden.py
+"""
+
+import json
+import random
+
+import pytest
+
+from .golden import (SNAPSHOT_VERSION, GoldenStore, SnapshotError, decode_sparse,
+                     encode_sparse)
+
+SOURCE = "start:\n    SET 1\n    HALT\n"
+
+
+def golden_state(cycle_count: int = 3) -> dict:
+    memory = bytearray(4096)
+    memory[2:5] = b"\x01\x02\x03"
+    memory[4095] = 0xff
+    registers = bytearray(16)
+    registers[1] = 0x2a
+    return {'memory': bytes(memory), 'registers': bytes(registers), 'cycle_count': cycle_count}
+
+
+@pytest.mark.parametrize("data", [b"", b"\0\0\0", b"\x01", b"\x01\0\x02",
+                                  b"\0\x01\x02\0\0\x03\x04"])
+def test_sparse_round_trip(data):
+    assert decode_sparse(encode_sparse(data)) == data
+
+
+def test_sparse_random_round_trip():
+    rng = random.Random(0)
+    for _ in range(200):
+        data = bytes(rng.choice((0, 0, 0, rng.randrange(256))) for _ in range(rng.randrange(64)))
+        assert decode_sparse(encode_sparse(data)) == data
+
+
+def test_encode_sparse_runs():
+    assert encode_sparse(b"\0\x01\x02\0\0\x03") == {'size': 6, 'runs': [[1, "0102"], [5, "03"]]}
+    assert encode_sparse(bytes(8)) == {'size': 8, 'runs': []}
+
+
+def test_save_load(tmp_path):
+    store = GoldenStore(tmp_path / "golden")
+    assert not store.has_snapshots()
+    golden = golden_state()
+    store.save("add_test", SOURCE, b"\x10\x02\x00\x00", golden)
+    assert store.has_snapshots()
+
+    program, loaded = store.load("add_test", SOURCE, 100)
+    assert program == b"\x10\x02\x00\x00"
+    assert loaded == golden
+    # No temporary file is left behind
+    assert [path.name for path in (tmp_path / "golden").iterdir()] == ["add_test.json"]
+
+
+def test_load_missing(tmp_path):
+    with pytest.raises(SnapshotError, match="no golden snapshot"):
+        GoldenStore(tmp_path).load("add_test", SOURCE, 100)
+
+
+def test_load_changed_source(tmp_path):
+    store = GoldenStore(tmp_path)
+    store.save("add_test", SOURCE, b"", golden_state())
+    with pytest.raises(SnapshotError, match="older version"):
+        store.load("add_test", SOURCE + "    SET 2\n", 100)
+
+
+def test_load_over_budget(tmp_path):
+    store = GoldenStore(tmp_path)
+    store.save("add_test", SOURCE, b"", golden_state(cycle_count=500))
+    with pytest.raises(SnapshotError, match="halts after 500 cycles"):
+        store.load("add_test", SOURCE, 100)
+    assert store.load("add_test", SOURCE, 500)[1]['cycle_count'] == 500
+
+
+def test_load_bad_snapshot(tmp_path):
+    store = GoldenStore(tmp_path)
+    store.path("garbled").write_text("{not json")
+    with pytest.raises(SnapshotError, match="unreadable"):
+        store.load("garbled", SOURCE, 100)
+
+    store.save("add_test", SOURCE, b"", golden_state())
+    snapshot = json.loads(store.path("add_test").read_text())
+    snapshot['version'] = SNAPSHOT_VERSION + 1
+    store.path("add_test").write_text(json.dumps(snapshot))
+    with pytest.raises(SnapshotError, match="old layout"):
+        store.load("add_test", SOURCE, 100)
@@ -0,0 +1,86 @@
+"""
+Tests for the latency grid, slowdowns and sweep reports in latency_sweep.py
+"""
+
+import csv
+
+import pytest
+
+from .latency_sweep import (BASELINE, LatencySetting, format_sweep_table, slowdown,
+                            sweep_grid, sweep_report, write_sweep_csv)
+
+GRID = [BASELINE, LatencySetting(0, 2), LatencySetting(1, 0), LatencySetting(1, 2)]
+
+RESULTS = {
+    'add_test': {BASELINE: 100, LatencySetting(0, 2): 110, LatencySetting(1, 0): 200,
+                 LatencySetting(1, 2): 210},
+    'loop_test': {BASELINE: 400, LatencySetting(0, 2): None, LatencySetting(1, 0): 800,
+                  LatencySetting(1, 2): None},
+    'spin_test': {BASELINE: None, LatencySetting(0, 2): None, LatencySetting(1, 0): None,
+                  LatencySetting(1, 2): None},
+}
+
+
+@pytest.mark.parametrize("fetch, data, grid", [
+    ([0, 1], [0, 2], GRID),
+    # The baseline is always first, even when it isn't asked for
+    ([1], [2], [BASELINE, LatencySetting(1, 2)]),
+    # Duplicates and order don't matter
+    ([1, 0, 1], [2, 0], GRID),
+    ([0], [0], [BASELINE]),
+])
+def test_sweep_grid(fetch, data, grid):
+    assert sweep_grid(fetch, data) == grid
+
+
+@pytest.mark.parametrize("program, setting, expected", [
+    ('add_test', BASELINE, 1.0),
+    ('add_test', LatencySetting(0, 2), 1.1),
+    ('add_test', LatencySetting(1, 2), 2.1),
+    ('loop_test', LatencySetting(1, 0), 2.0),
+    # Didn't halt at the setting, or at the baseline
+    ('loop_test', LatencySetting(0, 2), None),
+    ('spin_test', LatencySetting(1, 0), None),
+    # Not run at all
+    ('add_test', LatencySetting(4, 4), None),
+])
+def test_slowdown(program, setting, expected):
+    assert slowdown(RESULTS[program], setting) == (
+        None if expected is None else pytest.approx(expected))
+
+
+def test_slowdown_zero_baseline():
+    assert slowdown({BASELINE: 0, LatencySetting(1, 0): 5}, LatencySetting(1, 0)) is None
+
+
+def test_setting_name():
+    assert LatencySetting(1, 2).name == "f1_d2"
+
+
+def test_sweep_report():
+    report = sweep_report(RESULTS, GRID)
+    assert len(report) == len(RESULTS) * len(GRID)
+    assert report[1] == {'program': 'add_test', 'fetch_latency': 0, 'data_latency': 2,
+                         'cycles': 110, 'slowdown': pytest.approx(1.1)}
+    assert report[5] == {'program': 'loop_test', 'fetch_latency': 0, 'data_latency': 2,
+                         'cycles': None, 'slowdown': None}
+
+
+def test_format_sweep_table():
+    lines = format_sweep_table(RESULTS, GRID).splitlines()
+    assert lines[0].split() == ["Program", "Cycles", "f0_d2", "f1_d0", "f1_d2"]
+    assert lines[1].split() == ["add_test", "100", "1.10x", "2.00x", "2.10x"]
+    assert lines[2].split() == ["loop_test", "400", "-", "2.00x", "-"]
+    assert lines[3].split() == ["spin_test", "-", "-", "-", "-"]
+
+
+def test_write_sweep_csv(tmp_path):
+    csv_file = tmp_path / "sweep.csv"
+    write_sweep_csv(str(csv_file), sweep_report(RESULTS, GRID))
+    with open(csv_file, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 12
+    assert rows[1] == {'program': 'add_test', 'fetch_latency': '0', 'data_latency': '2',
+                       'cycles': '110', 'slowdown': '1.1000'}
+    assert rows[5] == {'program': 'loop_test', 'fetch_latency': '0', 'data_latency': '2',
+                       'cycles': '', 'slowdown': ''}
@@ -0,0 +1,123 @@
+"""
+Tests for the lockstep reference model in lockstep.py
+
+The hand-encoded programs need no toolkit. test_reference_model_matches_simulator
+runs every suite program on the model and on turtle-toolkit's simulate_program and
+needs the toolkit, it is skipped without it.
+"""
+
+import pytest
+
+from .lockstep import (ALU_ADD, ALU_AND, CARRY_FLAG, LOAD, OPCODE_ARITH_LOGIC_IMM,
+                       OPCODE_REG_MEMORY, OVERFLOW_FLAG, POSITIVE_FLAG, PUT, REG_DOFF,
+                       REG_STATUS, SET, STORE, ZERO_FLAG, RetireRecord, parse_retire_record,
+                       reference_trace)
+from .machine_code import BRANCH_CARRY, BRANCH_ZERO, HALT, branch, encode, program
+from .mem_dumps import find_mismatches
+from .test_framework import TurtleCPUTestFramework
+
+
+def run(*instructions: int, max_cycles: int = 100):
+    state = {}
+    records = list(reference_trace(program(*instructions), max_cycles, state))
+    return records, state
+
+
+def test_add_overflow_flags():
+    records, state = run(encode(OPCODE_REG_MEMORY, SET, 0x7f),
+                         encode(OPCODE_ARITH_LOGIC_IMM, ALU_ADD, 1), HALT)
+    assert state['halted']
+    assert [record.pc for record in records] == [0, 2, 4]
+    assert records[1].acc == 0x80
+    assert records[1].status & 0b1111 == OVERFLOW_FLAG
+
+
+def test_add_carry_and_zero():
+    records, _ = run(encode(OPCODE_REG_MEMORY, SET, 0xff),
+                     encode(OPCODE_ARITH_LOGIC_IMM, ALU_ADD, 1), HALT)
+    assert records[1].acc == 0
+    assert records[1].status & 0b1111 == ZERO_FLAG | POSITIVE_FLAG | CARRY_FLAG
+
+
+def test_store_load_put():
+    records, state = run(encode(OPCODE_REG_MEMORY, SET, 5), encode(OPCODE_REG_MEMORY, PUT, 3),
+                         encode(OPCODE_REG_MEMORY, SET, 2),
+                         encode(OPCODE_REG_MEMORY, PUT, REG_DOFF),
+                         encode(OPCODE_REG_MEMORY, SET, 0x42), encode(OPCODE_REG_MEMORY, STORE),
+                         encode(OPCODE_REG_MEMORY, SET, 0), encode(OPCODE_REG_MEMORY, LOAD),
+                         HALT)
+    assert state['halted']
+    assert (records[1].reg, records[1].value) == (3, 5)
+    assert state['registers'][3] == 5
+    assert state['memory'][2] == 0x42
+    assert records[-2].acc == 0x42
+
+
+def test_branch_taken():
+    records, state = run(encode(OPCODE_REG_MEMORY, SET, 0),
+                         encode(OPCODE_ARITH_LOGIC_IMM, ALU_ADD, 0),
+                         branch(BRANCH_ZERO, 4), encode(OPCODE_REG_MEMORY, SET, 9), HALT)
+    assert state['halted']
+    assert [record.pc for record in records] == [0, 2, 4, 8]
+    assert records[-1].acc == 0
+
+
+def test_stops_on_unknown_flag():
+    # AND leaves carry undefined, the model can't decide the branch
+    records, state = run(encode(OPCODE_REG_MEMORY, SET, 1),
+                         encode(OPCODE_ARITH_LOGIC_IMM, ALU_AND, 1),
+                         branch(BRANCH_CARRY, 4), HALT)
+    assert not state['halted']
+    assert len(records) == 2
+    assert records[1].status_unknown == CARRY_FLAG | OVERFLOW_FLAG
+
+
+def test_cycle_budget():
+    records, state = run(encode(OPCODE_REG_MEMORY, SET, 1), encode(OPCODE_REG_MEMORY, SET, 2),
+                         HALT, max_cycles=2)
+    assert not state['halted']
+    assert len(records) == 2
+
+
+def test_parse_retire_record():
+    record = parse_retire_record(
+        "RETIRE pc=004 instruction=0348 acc=2a reg=3 value=2a status=000001x0")
+    assert record == RetireRecord(0x004, 0x0348, 0x2a, 3, 0x2a, 0b100, 0b10)
+    assert parse_retire_record("CYCLE 12") is None
+    assert parse_retire_record(
+        "RETIRE pc=004 instruction=0348 acc=xx reg=-1 value=xx status=00000011").acc is None
+
+
+def test_retire_record_matches():
+    record = RetireRecord(4, 0x0348, 0x2a, -1, None, 0b0011, 0b1100)
+    assert record.matches(record._replace(status=0b1111, status_unknown=0))
+    assert not record.matches(record._replace(status=0b0010))
+    assert not record.matches(record._replace(acc=0x2b))
+    # The value only counts for PUTs
+    assert record.matches(record._replace(value=7))
+
+
+def test_reference_model_matches_simulator(asm_file):
+    """The model ends in simulate_program's state, after as many cycles"""
+    pytest.importorskip("turtle_toolkit")
+    framework = TurtleCPUTestFramework()
+    framework.max_cycles = framework.program_max_cycles(str(asm_file))
+    machine_code = framework.assemble_program(str(asm_file))
+    assert machine_code is not None
+    golden = framework.run_simulator(machine_code)
+    assert golden is not None
+
+    state = {}
+    records = list(reference_trace(machine_code, framework.max_cycles, state))
+    if not state['halted'] and len(records) < framework.max_cycles:
+        pytest.skip("the program branches on a flag the model can't know")
+    assert state['halted'], "the model didn't halt within the cycle budget"
+
+    assert len(records) == golden['cycle_count']
+    assert find_mismatches(golden['memory'], state['memory']) == []
+    registers = bytearray(state['registers'])
+    simulator_registers = bytearray(golden['registers'])
+    unknown = records[-1].status_unknown
+    registers[REG_STATUS] &= ~unknown & 0xFF
+    simulator_registers[REG_STATUS] &= ~unknown & 0xFF
+    assert find_mismatches(simulator_registers, registers) == []
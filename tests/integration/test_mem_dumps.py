@@ -0,0 +1,107 @@
+"""
+Tests for the memory dump helpers in mem_dumps.py
+"""
+
+import random
+
+import pytest
+
+from . import mem_dumps
+from .mem_dumps import (find_mismatches, format_memb, format_memh, format_range,
+                        mismatch_ranges, parse_dump, parse_memb, parse_memh)
+
+
+@pytest.fixture(params=["python", "numpy"])
+def comparator(request, monkeypatch):
+    """Run a test with the pure Python and with the NumPy path of find_mismatches"""
+    if request.param == "numpy":
+        monkeypatch.setattr(mem_dumps, "np", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(mem_dumps, "np", None)
+    return request.param
+
+
+def test_memb_round_trip():
+    data = bytes([0x00, 0x01, 0x7f, 0x80, 0xff])
+    assert parse_memb(format_memb(data)) == (bytearray(data), set())
+
+
+def test_parse_memb_comments_and_addresses():
+    text = "// header\n00000001 // first\n@3\n1111_0000\n00000010\n"
+    data, unknown = parse_memb(text)
+    assert data == bytearray([0x01, 0x00, 0x00, 0xf0, 0x02])
+    assert unknown == set()
+
+
+def test_parse_memb_unknown_values():
+    data, unknown = parse_memb("00000001\nxxxxxxxx\n0000z000\n00000100\n")
+    assert data == bytearray([0x01, 0x00, 0x00, 0x04])
+    assert unknown == {1, 2}
+
+
+def test_memh_round_trip():
+    data = bytes(range(256))
+    assert parse_memh(format_memh(data)) == (bytearray(data), set())
+
+
+def test_parse_memh_general_path():
+    # Comments, addresses and x values miss the bytes.fromhex fast path
+    data, unknown = parse_memh("// header\n01\n@4 ff\nxx\n1_0\n")
+    assert data == bytearray([0x01, 0x00, 0x00, 0x00, 0xff, 0x00, 0x10])
+    assert unknown == {5}
+
+
+def test_parse_dump_formats_agree():
+    data = bytes([0x00, 0x5a, 0xa5, 0xff])
+    assert parse_dump(format_memh(data), "hex") == parse_dump(format_memb(data), "bin")
+
+
+def test_find_mismatches_equal(comparator):
+    assert find_mismatches(b"\x01\x02\x03", bytearray(b"\x01\x02\x03")) == []
+
+
+def test_find_mismatches_differing_bytes(comparator):
+    assert find_mismatches(b"\x01\x02\x03\x04", b"\x01\xff\x03\x00") == [1, 3]
+
+
+def test_find_mismatches_length_difference(comparator):
+    assert find_mismatches(b"\x01\x02\x03\x04", b"\x01\x02") == [2, 3]
+    assert find_mismatches(b"\x01", b"\x01\x00\x00") == [1, 2]
+
+
+def test_find_mismatches_unknown_always_differs(comparator):
+    assert find_mismatches(b"\x00\x00\x00", b"\x00\x00\x00", {1}) == [1]
+    assert find_mismatches(b"\x00\x05\x00", b"\x00\x00\x00", {1}) == [1]
+
+
+def test_find_mismatches_paths_agree(monkeypatch):
+    """The NumPy and pure Python comparisons give the same addresses"""
+    numpy = pytest.importorskip("numpy")
+    rng = random.Random(7)
+    for _ in range(50):
+        expected = bytes(rng.randrange(256) for _ in range(rng.randrange(1, 300)))
+        # Shorter, as long or longer than expected
+        length = rng.randrange(1, len(expected) + 20)
+        actual = bytearray(expected[:length]).ljust(length, b"\0")
+        for _ in range(rng.randrange(5)):
+            address = rng.randrange(len(actual))
+            actual[address] ^= 1 << rng.randrange(8)
+        unknown = {rng.randrange(len(actual)) for _ in range(rng.randrange(3))}
+
+        monkeypatch.setattr(mem_dumps, "np", None)
+        python_result = find_mismatches(expected, actual, unknown)
+        monkeypatch.setattr(mem_dumps, "np", numpy)
+        assert find_mismatches(expected, actual, unknown) == python_result
+
+
+def test_mismatch_ranges():
+    assert mismatch_ranges([]) == []
+    assert mismatch_ranges([1, 2, 3, 7, 9, 10]) == [(1, 3), (7, 7), (9, 10)]
+
+
+def test_format_range():
+    data = bytes(range(40))
+    assert format_range(data, 2, 4) == "02 03 04"
+    assert format_range(data, 2, 4, {3}) == "02 xx 04"
+    assert format_range(data, 38, 41) == "26 27 -- --"
+    assert format_range(data, 0, 39, limit=4) == "00 01 02 03 ..."
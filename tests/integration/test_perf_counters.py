@@ -0,0 +1,108 @@
+"""
+Tests for the performance counter parser, checks and profile in perf_counters.py
+"""
+
+import pytest
+
+from .lockstep import (ALU_ADD, ALU_INV, ALU_SUB, ALU_XOR, LOAD, OPCODE_ARITH_LOGIC,
+                       OPCODE_ARITH_LOGIC_IMM, OPCODE_JUMP_IMM, OPCODE_JUMP_REG,
+                       OPCODE_REG_MEMORY, SET)
+from .machine_code import branch, encode
+from .perf_counters import (check_counters, format_profile, mnemonic, opcode_profile,
+                            parse_perf_counters, perf_summary)
+
+# What the testbench's report_perf_counters $displays, after other testbench output
+STDOUT = """\
+Loading program
+HALT retired after 6 cycles
+PERF cycles=6 retired=6 branches_taken=1 branches_not_taken=0 jumps=1 loads=0 stores=1
+PERF_PC pc=000 instruction=0144 count=1
+PERF_PC pc=002 instruction=0100 count=3
+PERF_PC pc=004 instruction=xx12 count=1
+PERF_PC pc=006 instruction=0008 count=1
+Testbench completed
+"""
+
+
+def test_parse_perf_counters():
+    counters = parse_perf_counters(STDOUT)
+    assert counters['cycles'] == 6
+    assert (counters['branches_taken'], counters['jumps'], counters['stores']) == (1, 1, 1)
+    assert counters['pc_counts'] == {0x000: (0x0144, 1), 0x002: (0x0100, 3),
+                                     0x004: (None, 1), 0x006: (0x0008, 1)}
+
+
+def test_parse_perf_counters_last_program():
+    # A batch log holds one PERF record per program, the last one counts
+    second = "PERF cycles=2 retired=2 branches_taken=0 branches_not_taken=0 jumps=0 " \
+             "loads=0 stores=0\nPERF_PC pc=000 instruction=0006 count=2\n"
+    counters = parse_perf_counters(STDOUT + second)
+    assert counters['cycles'] == 2
+    assert counters['pc_counts'] == {0: (0x0006, 2)}
+
+
+def test_parse_perf_counters_none():
+    assert parse_perf_counters("HALT retired after 6 cycles\n") is None
+    # PERF_PC records without a PERF record before them are ignored
+    assert parse_perf_counters("PERF_PC pc=000 instruction=0006 count=2\n") is None
+
+
+@pytest.mark.parametrize("instruction, name", [
+    (None, "?"),
+    (branch(0b000, 2), "BZ"), (branch(0b001, 2), "BNZ"), (branch(0b111, 2), "BOC"),
+    (encode(OPCODE_ARITH_LOGIC_IMM, ALU_ADD, 1), "ADDI"),
+    (encode(OPCODE_ARITH_LOGIC_IMM, ALU_SUB, 1), "SUBI"),
+    (encode(OPCODE_ARITH_LOGIC_IMM, ALU_INV), "INV"),
+    (encode(OPCODE_ARITH_LOGIC, ALU_ADD, 3), "ADD"),
+    (encode(OPCODE_ARITH_LOGIC, ALU_XOR, 3), "XOR"),
+    (encode(OPCODE_ARITH_LOGIC, 0b011, 3), "?"),
+    (encode(OPCODE_REG_MEMORY, LOAD), "LOAD"), (encode(OPCODE_REG_MEMORY, SET, 7), "SET"),
+    (encode(OPCODE_REG_MEMORY, 5), "?"),
+    (encode(OPCODE_JUMP_IMM, 0, 4), "JMPI"), (encode(OPCODE_JUMP_REG), "JMPR"),
+    (encode(OPCODE_JUMP_REG, 1), "JMP"), (encode(0b011), "?"),
+])
+def test_mnemonic(instruction, name):
+    assert mnemonic(instruction) == name
+
+
+def test_opcode_profile():
+    profile = opcode_profile(parse_perf_counters(STDOUT))
+    assert profile == {'ADDI': 3, '?': 1, 'JMPI': 1, 'SET': 1}
+    assert list(profile) == ['ADDI', '?', 'JMPI', 'SET']
+
+
+def test_check_counters_consistent():
+    assert check_counters(parse_perf_counters(STDOUT), 6) == []
+    assert check_counters(parse_perf_counters(STDOUT), None) == []
+
+
+def test_check_counters_cycle_mismatch():
+    assert check_counters(parse_perf_counters(STDOUT), 8) == [
+        "RTL ran 6 cycles, the simulator 8 (-2)"]
+
+
+def test_check_counters_lost_histogram_records():
+    counters = parse_perf_counters(STDOUT)
+    del counters['pc_counts'][0x002]
+    assert check_counters(counters, 6) == ["PC histogram holds 3 of 6 retired instructions"]
+
+
+def test_perf_summary():
+    summary = perf_summary(parse_perf_counters(STDOUT))
+    assert 'pc_counts' not in summary
+    assert summary['retired'] == 6
+    assert summary['opcodes']['ADDI'] == 3
+
+
+def test_format_profile():
+    text = format_profile(parse_perf_counters(STDOUT), limit=2)
+    lines = text.splitlines()
+    assert lines[0] == ("  cycles 6, retired 6, branches 1 (1 taken), jumps 1, loads 0, "
+                        "stores 1")
+    assert lines[1:5] == ["  hot PCs:",
+                          "    0x002  0100  ADDI          3   50.0%",
+                          "    0x000  0144  SET           1   16.7%",
+                          "    ... and 2 more PCs"]
+    assert "    ?             1   16.7%" in lines
+    assert "????" not in text
+    assert "????" in format_profile(parse_perf_counters(STDOUT))
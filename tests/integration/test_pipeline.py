@@ -0,0 +1,162 @@
+"""
+Tests for the pipelined suite runner: LogRouter and stream_process in pipeline.py,
+and run_tests_pipelined with its assemble/simulate, RTL and compare stages stubbed
+"""
+
+import asyncio
+import io
+import sys
+import threading
+import time
+
+import pytest
+
+from .pipeline import LogRouter, stream_process
+from .test_framework import TurtleCPUTestFramework
+
+# Seconds the stubbed preparation waits for the other tests to start preparing
+PREPARE_TIMEOUT = 10
+
+
+def test_log_router_outside_test_goes_to_stdout():
+    stdout = io.StringIO()
+    LogRouter(stdout).write("hello\n")
+    assert stdout.getvalue() == "hello\n"
+
+
+def test_log_router_routes_per_task():
+    stdout = io.StringIO()
+    router = LogRouter(stdout)
+
+    async def task(name: str) -> io.StringIO:
+        log = LogRouter.start_test()
+        for step in range(3):
+            router.write(f"{name} {step}\n")
+            await asyncio.sleep(0)
+        await asyncio.to_thread(router.write, f"{name} thread\n")
+        return log
+
+    async def main():
+        return await asyncio.gather(task("a"), task("b"))
+
+    log_a, log_b = asyncio.run(main())
+    assert log_a.getvalue() == "a 0\na 1\na 2\na thread\n"
+    assert log_b.getvalue() == "b 0\nb 1\nb 2\nb thread\n"
+    assert stdout.getvalue() == ""
+
+
+def test_stream_process_success(tmp_path):
+    returncode, output, aborted = asyncio.run(stream_process(
+        [sys.executable, "-c", "print('one'); print('two')"], str(tmp_path), lambda line: False))
+    assert (returncode, output, aborted) == (0, "one\ntwo\n", None)
+
+
+def test_stream_process_aborts_at_first_error(tmp_path):
+    script = "import time; print('ok', flush=True); print('Error: bad', flush=True); " \
+             "time.sleep(30); print('late')"
+    start = time.monotonic()
+    returncode, output, aborted = asyncio.run(stream_process(
+        [sys.executable, "-c", script], str(tmp_path), lambda line: "Error" in line))
+    assert time.monotonic() - start < 10
+    assert aborted == "Error: bad"
+    assert returncode != 0
+    assert output == "ok\nError: bad\n"
+
+
+@pytest.fixture
+def stubbed_framework(tmp_path, monkeypatch):
+    """Framework whose pipeline stages only print, with a record of the RTL stage's overlap"""
+    framework = TurtleCPUTestFramework(tmp_path)
+    framework.pipeline_depth = 2
+    framework.rtl_runs = []  # (test, concurrent RTL runs) in the order the RTL ran
+    # As many parties as tests the lookahead lets prepare at once
+    framework.prepare_barrier = threading.Barrier(framework.pipeline_depth + 1,
+                                                  timeout=PREPARE_TIMEOUT)
+    running = []
+
+    def prepare_test(self, asm_file, paths):
+        name = paths['binstr'].name.split("_instructions")[0]
+        print(f"{name} assembling")
+        if name.startswith("crash"):
+            raise RuntimeError("assembler crashed")
+        framework.prepare_barrier.wait()
+        print(f"{name} simulated")
+        self.timing_data.setdefault('assembly', []).append(0.1)
+        return {'name': name}
+
+    async def run_rtl_async(self, paths):
+        name = paths['binstr'].name.split("_instructions")[0]
+        running.append(name)
+        framework.rtl_runs.append((name, len(running)))
+        print(f"{name} rtl start")
+        await asyncio.sleep(0.01)
+        print(f"{name} rtl end")
+        running.remove(name)
+        return True, "", "", None
+
+    def finish_test(self, test_name, temp_path, paths, golden, rtl_stdout, rtl_stderr,
+                    test_start_time, divergence=None):
+        passed = not test_name.startswith("fail")
+        print(f"{test_name} {'passed' if passed else 'failed'}")
+        self.test_results[test_name] = {'status': 'PASSED' if passed else 'FAILED', 'time': 0.0}
+        return passed
+
+    monkeypatch.setattr(TurtleCPUTestFramework, "ensure_rtl_built", lambda self: True)
+    monkeypatch.setattr(TurtleCPUTestFramework, "prepare_test", prepare_test)
+    monkeypatch.setattr(TurtleCPUTestFramework, "run_rtl_async", run_rtl_async)
+    monkeypatch.setattr(TurtleCPUTestFramework, "finish_test", finish_test)
+    return framework
+
+
+def write_programs(directory, *names) -> list:
+    files = []
+    for name in names:
+        (directory / f"{name}.asm").write_text("halt: jmpi halt\n")
+        files.append(str(directory / f"{name}.asm"))
+    return files
+
+
+def test_pipelined_run_keeps_each_log_together(stubbed_framework, tmp_path, capsys):
+    names = ["alpha", "beta", "fail_gamma"]
+    passed, failed = stubbed_framework.run_tests_pipelined(write_programs(tmp_path, *names))
+    assert (passed, failed) == (2, 1)
+
+    # Preparation overlapped, the RTL stage never did. Tests reach it in the order
+    # they finish preparing and print their logs in that order
+    rtl_order = [name for name, _ in stubbed_framework.rtl_runs]
+    assert sorted(rtl_order) == sorted(names)
+    assert all(concurrent == 1 for _, concurrent in stubbed_framework.rtl_runs)
+
+    # Every line a test printed, from any thread, is in that test's own block
+    blocks = capsys.readouterr().out.split("=" * 60 + "\n🧪 Testing: ")[1:]
+    assert len(blocks) == len(names)
+    for name, block in zip(rtl_order, blocks):
+        assert block.startswith(str(tmp_path / f"{name}.asm"))
+        lines = [line for line in block.splitlines() if line.split(" ")[0] in names]
+        outcome = "failed" if name.startswith("fail") else "passed"
+        assert lines == [f"{name} assembling", f"{name} simulated", f"{name} rtl start",
+                         f"{name} rtl end", f"{name} {outcome}"]
+
+    results = stubbed_framework.test_results
+    assert {name: result['status'] for name, result in results.items()} == {
+        "alpha": "PASSED", "beta": "PASSED", "fail_gamma": "FAILED"}
+    assert results["alpha"]['phases'] == {'assembly': pytest.approx(0.1)}
+    assert len(stubbed_framework.timing_data['assembly']) == len(names)
+
+
+def test_pipelined_run_survives_a_crashing_stage(stubbed_framework, tmp_path, capsys):
+    stubbed_framework.pipeline_depth = 0
+    stubbed_framework.prepare_barrier = threading.Barrier(1)
+    passed, failed = stubbed_framework.run_tests_pipelined(
+        write_programs(tmp_path, "crash", "alpha"))
+    assert (passed, failed) == (1, 1)
+    assert stubbed_framework.test_results["crash"]['status'] == 'FAILED'
+    assert "❌ Test FAILED with exception: assembler crashed" in capsys.readouterr().out
+
+
+def test_pipelined_run_fails_every_test_without_rtl(stubbed_framework, tmp_path, monkeypatch):
+    monkeypatch.setattr(TurtleCPUTestFramework, "ensure_rtl_built", lambda self: False)
+    passed, failed = stubbed_framework.run_tests_pipelined(
+        write_programs(tmp_path, "alpha", "beta"))
+    assert (passed, failed) == (0, 2)
+    assert set(stubbed_framework.test_results) == {"alpha", "beta"}
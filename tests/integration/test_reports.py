@@ -0,0 +1,104 @@
+"""
+Tests for the JSON/JUnit reports and baseline comparison in reports.py
+"""
+
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from . import reports
+from .reports import (MIN_BASELINE_SECONDS, build_report, compare_reports, write_json_report,
+                      write_junit_report)
+
+
+def integration_result(status="PASSED", time=1.0, **phases):
+    return {'status': status, 'time': time, 'phases': phases,
+            'sim_cycles': 100, 'rtl_cycles': 100}
+
+
+def report_with(phases: dict) -> dict:
+    """A report holding one test with the given phase seconds"""
+    return {'tests': {'add_test': {'phases': phases}}}
+
+
+def test_framework_overhead():
+    entry = reports.test_report(integration_result(
+        time=1.0, assembly=0.1, simulation=0.2, rtl_simulation=0.5, comparison=0.05))
+    assert entry['phases']['framework_overhead'] == pytest.approx(0.15)
+    assert entry['rtl_cycles_per_second'] == pytest.approx(200)
+
+
+def test_framework_overhead_excludes_debug_trace():
+    # The traced rerun runs after the test's time is taken
+    entry = reports.test_report(integration_result(
+        status="FAILED", time=1.0, rtl_simulation=0.5, debug_trace=3.0))
+    assert entry['phases']['debug_trace'] == 3.0
+    assert entry['phases']['framework_overhead'] == pytest.approx(0.5)
+
+
+def test_framework_overhead_excludes_snapshot():
+    # --rtl-only runs load the program and golden state instead of assembling and simulating
+    entry = reports.test_report(integration_result(
+        time=1.0, snapshot=0.25, rtl_simulation=0.5, comparison=0.05))
+    assert entry['phases']['snapshot'] == 0.25
+    assert entry['phases']['assembly'] == 0.0
+    assert entry['phases']['framework_overhead'] == pytest.approx(0.2)
+
+
+def test_framework_overhead_never_negative():
+    entry = reports.test_report(integration_result(time=0.5, rtl_simulation=0.6))
+    assert entry['phases']['framework_overhead'] == 0.0
+
+
+def test_unit_report():
+    entry = reports.test_report({'kind': 'unit', 'status': 'FAILED', 'time': 2.0,
+                                 'phases': {'unit_build': 1.5, 'unit_run': 0.25},
+                                 'errors': 1, 'failed_checks': 2, 'passed_checks': 3})
+    assert set(entry['phases']) == {'unit_build', 'unit_run', 'framework_overhead'}
+    assert entry['phases']['framework_overhead'] == pytest.approx(0.25)
+    assert (entry['errors'], entry['failed_checks'], entry['passed_checks']) == (1, 2, 3)
+
+
+def test_build_report_counts():
+    report = build_report({'a': integration_result(), 'b': integration_result("FAILED")},
+                          {'simulation': [0.5, 0.25]}, {'jobs': 2})
+    assert report['run'] == {'jobs': 2, 'tests': 2, 'passed': 1, 'failed': 1}
+    assert report['phase_totals'] == {'simulation': 0.75}
+
+
+def test_compare_reports_threshold():
+    baseline = report_with({'simulation': 1.0})
+    assert compare_reports(report_with({'simulation': 1.19}), baseline, 20) == []
+    assert compare_reports(report_with({'simulation': 1.2}), baseline, 20) == []
+    assert compare_reports(report_with({'simulation': 1.21}), baseline, 20) == [
+        ('add_test', 'simulation', 1.0, 1.21)]
+    assert compare_reports(report_with({'simulation': 1.21}), baseline, 50) == []
+
+
+def test_compare_reports_min_baseline_seconds():
+    fast = MIN_BASELINE_SECONDS / 2
+    assert compare_reports(report_with({'comparison': fast * 10}),
+                           report_with({'comparison': fast}), 20) == []
+    assert compare_reports(report_with({'comparison': MIN_BASELINE_SECONDS * 10}),
+                           report_with({'comparison': MIN_BASELINE_SECONDS}), 20) != []
+
+
+def test_compare_reports_missing_in_baseline():
+    report = report_with({'simulation': 5.0, 'assembly': 5.0})
+    assert compare_reports(report, {'tests': {}}) == []
+    assert compare_reports(report, report_with({'simulation': 5.0})) == []
+
+
+def test_write_reports(tmp_path):
+    report = build_report({'a': integration_result(), 'b': integration_result("FAILED")},
+                          {}, {'jobs': 1})
+    write_json_report(report, tmp_path / "report.json")
+    assert json.loads((tmp_path / "report.json").read_text()) == report
+
+    write_junit_report(report, str(tmp_path / "report.xml"))
+    suite = ET.parse(tmp_path / "report.xml").getroot().find('testsuite')
+    assert (suite.get('tests'), suite.get('failures')) == ("2", "1")
+    failed = [case.get('name') for case in suite.iter('testcase')
+              if case.find('failure') is not None]
+    assert failed == ['b']
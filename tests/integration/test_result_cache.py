@@ -0,0 +1,112 @@
+"""
+Tests for the content-addressed result cache in result_cache.py
+"""
+
+import os
+
+from .result_cache import ResultCache, tree_size
+
+SOURCE = "start:\n    SET 1\n    HALT\n"
+
+
+def test_key():
+    assert ResultCache.key("a", b"b") == ResultCache.key(b"a", "b")
+    assert len(ResultCache.key(SOURCE)) == 64
+    # Parts are length-prefixed, so moving bytes between them changes the key
+    assert ResultCache.key("ab", "c") != ResultCache.key("a", "bc")
+    assert ResultCache.key("a", "") != ResultCache.key("a")
+
+
+def test_key_changes_with_sources():
+    # A changed source or toolkit fingerprint is a new key, so the old entry misses
+    key = ResultCache.key(SOURCE, "toolkit-1")
+    assert ResultCache.key(SOURCE + "    SET 2\n", "toolkit-1") != key
+    assert ResultCache.key(SOURCE, "toolkit-2") != key
+    assert ResultCache.key(SOURCE, "toolkit-1") == key
+
+
+def test_store_lookup(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    key = ResultCache.key(SOURCE)
+    assert cache.lookup('assembly', key) is None
+
+    build = tmp_path / "build"
+    (build / "obj").mkdir(parents=True)
+    (build / "obj" / "model.o").write_bytes(b"\x7fELF")
+    (tmp_path / "program.bin").write_bytes(b"\x44\x01")
+    cache.store('assembly', key, files={'program.bin': tmp_path / "program.bin", 'build': build},
+                texts={'listing.txt': "0000 SET 1\n"})
+
+    entry = cache.lookup('assembly', key)
+    assert entry == cache.entry_dir('assembly', key)
+    assert (entry / "program.bin").read_bytes() == b"\x44\x01"
+    assert (entry / "build" / "obj" / "model.o").read_bytes() == b"\x7fELF"
+    assert (entry / "listing.txt").read_text() == "0000 SET 1\n"
+    assert cache.lookup('golden', key) is None
+    assert cache.stats == {'assembly': {'hits': 1, 'misses': 1},
+                           'golden': {'hits': 0, 'misses': 1}}
+
+
+def test_store_leaves_no_staging(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.store('golden', "k", texts={'memory.txt': "00\n"})
+    assert [path.name for path in (tmp_path / "golden").iterdir()] == ["k"]
+
+
+def test_store_keeps_first_entry(tmp_path):
+    # A second worker storing the same key drops its copy
+    cache = ResultCache(tmp_path)
+    cache.store('golden', "k", texts={'memory.txt': "first\n"})
+    cache.store('golden', "k", texts={'memory.txt': "second\n"})
+    assert (cache.lookup('golden', "k") / "memory.txt").read_text() == "first\n"
+    assert [path.name for path in (tmp_path / "golden").iterdir()] == ["k"]
+
+
+def test_store_failure_drops_staging(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.store('assembly', "k", files={'program.bin': tmp_path / "missing.bin"})
+    assert cache.lookup('assembly', "k") is None
+    assert list((tmp_path / "assembly").iterdir()) == []
+
+
+def store_entry(cache: ResultCache, key: str, size: int, mtime: float):
+    cache.store('golden', key, texts={'dump.txt': "x" * size})
+    os.utime(cache.entry_dir('golden', key), (mtime, mtime))
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.max_size_bytes = 250
+    for index, key in enumerate(["old", "middle", "new"]):
+        store_entry(cache, key, 100, 1000 + index)
+    # Looking an entry up makes it the most recently used
+    assert cache.lookup('golden', "old") is not None
+
+    cache.prune()
+    assert cache.lookup('golden', "middle") is None
+    assert cache.lookup('golden', "old") is not None
+    assert cache.lookup('golden', "new") is not None
+
+
+def test_prune_under_limit_and_staging(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.max_size_bytes = 0
+    cache.prune()  # No cache directory yet
+    (tmp_path / "golden" / ".k_staging").mkdir(parents=True)
+    (tmp_path / "golden" / ".k_staging" / "dump.txt").write_text("x" * 100)
+    cache.prune()
+    # Entries being staged by another worker are left alone
+    assert (tmp_path / "golden" / ".k_staging").exists()
+
+    cache.max_size_bytes = 1000
+    store_entry(cache, "k", 100, 1000)
+    cache.prune()
+    assert cache.lookup('golden', "k") is not None
+
+
+def test_tree_size(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a").write_bytes(b"12345")
+    (tmp_path / "sub" / "b").write_bytes(b"123")
+    (tmp_path / "link").symlink_to(tmp_path / "a")
+    assert tree_size(tmp_path) == 8
@@ -0,0 +1,263 @@
+"""
+Tests for the benchmark grids, script rewriting, regression checks and the
+--rtl-bench runner in rtl_bench.py
+
+The runner tests put stand-ins for sv2v, yosys and sby on PATH, which only write
+what the runner reads back.
+"""
+
+import os
+import shutil
+from types import SimpleNamespace
+
+import pytest
+
+from .rtl_bench import (BENCH_NAMES, MIN_REGRESSION_SECONDS, Bench, BenchPoint,
+                        append_history, bench_points, find_regressions, load_history,
+                        parse_cell_count, parse_overrides, read_status, run_bench_point,
+                        run_rtl_bench, sby_config, sby_timeout, timeout_warnings, with_params)
+
+SBY = """\
+[tasks]
+bmc
+prove
+
+[options]
+bmc: mode bmc
+prove: mode prove
+prove: timeout 600
+
+[script]
+read -formal fifo_sync.sv
+prep -top fifo_sync
+
+[files]
+fifo_sync.sv
+/abs/fifo_pkg.sv
+"""
+
+
+def test_with_params_before_each_prep():
+    script = "read_verilog a.v\nprep -top alu\nsynth -top alu\n  prep -top alu\nprepare\n"
+    assert with_params(script, "alu", (("DATA_W", 16), ("MODE", 1))) == (
+        "read_verilog a.v\n"
+        "chparam -set DATA_W 16 alu\nchparam -set MODE 1 alu\nprep -top alu\n"
+        "synth -top alu\n"
+        "chparam -set DATA_W 16 alu\nchparam -set MODE 1 alu\n  prep -top alu\n"
+        "prepare\n")
+
+
+def test_with_params_without_params():
+    assert with_params("prep -top alu", "alu", ()) == "prep -top alu\n"
+
+
+def test_parse_overrides():
+    assert parse_overrides(None) == {}
+    assert parse_overrides(["DATA_W=4,8", "ENTRIES=12"]) == {'DATA_W': (4, 8), 'ENTRIES': (12,)}
+
+
+@pytest.mark.parametrize("spec", ["DATA_W", "DATA_W=", "=8", "DATA_W=eight", "DATA_W=4,,8"])
+def test_parse_overrides_malformed(spec):
+    with pytest.raises(ValueError):
+        parse_overrides([spec])
+
+
+def test_bench_points():
+    points = bench_points(["fifo_sync_formal"], {'ENTRIES': (4, 8)})
+    assert [point.name for point in points] == [
+        "fifo_sync_formal.bmc[ENTRIES=4,DATA_W=8]", "fifo_sync_formal.prove[ENTRIES=4,DATA_W=8]",
+        "fifo_sync_formal.bmc[ENTRIES=8,DATA_W=8]", "fifo_sync_formal.prove[ENTRIES=8,DATA_W=8]"]
+    assert {point.bench.name for point in bench_points()} == set(BENCH_NAMES)
+
+
+def test_sby_config(tmp_path):
+    config = sby_config(SBY, tmp_path, "fifo_sync", (("ENTRIES", 12),))
+    assert "chparam -set ENTRIES 12 fifo_sync\nprep -top fifo_sync" in config
+    assert f"\n{(tmp_path / 'fifo_sync.sv').resolve()}\n" in config
+    assert "\n/abs/fifo_pkg.sv\n" in config
+    # Only the [files] section is rewritten
+    assert "read -formal fifo_sync.sv" in config
+
+
+def test_sby_timeout():
+    assert sby_timeout(SBY, "prove") == 600
+    assert sby_timeout(SBY, "bmc") is None
+
+
+def test_parse_cell_count():
+    assert parse_cell_count({'design': {'num_cells': 42}}) == 42
+    assert parse_cell_count({'modules': {'a': {'num_cells': 3}, 'b': {'num_cells': 4}}}) == 7
+    assert parse_cell_count({}) is None
+
+
+def test_read_status(tmp_path):
+    (tmp_path / "status").write_text("timeout 600\n")
+    assert read_status(tmp_path / "status", 0) == "TIMEOUT"
+    assert read_status(tmp_path / "missing", 0) == "PASS"
+    assert read_status(tmp_path / "missing", 1) == "ERROR"
+
+
+def result(status="PASS", seconds=10.0, cells=None, point="alu_synth[DATA_W=8]"):
+    return {'point': point, 'status': status, 'seconds': seconds, 'cells': cells}
+
+
+def history(*results) -> list:
+    return [{'time': "2026-01-01T00:00:00",
+             'results': {entry['point']: entry for entry in results}}]
+
+
+def test_find_regressions_threshold():
+    runs = history(result(seconds=10.0, cells=100))
+    assert find_regressions([result(seconds=12.0, cells=120)], runs, 20) == []
+    messages = find_regressions([result(seconds=12.5, cells=121)], runs, 20)
+    assert messages == ["alu_synth[DATA_W=8]: 100 -> 121 cells (+21%)",
+                        "alu_synth[DATA_W=8]: 10.00s -> 12.50s (+2.50s)"]
+    assert find_regressions([result(seconds=12.5, cells=121)], runs, 50) == []
+
+
+def test_find_regressions_min_seconds():
+    # Doubling a fast run is noise below MIN_REGRESSION_SECONDS
+    fast = MIN_REGRESSION_SECONDS / 2
+    assert find_regressions([result(seconds=fast * 2)], history(result(seconds=fast)), 20) == []
+    assert find_regressions([result(seconds=MIN_REGRESSION_SECONDS * 2)],
+                            history(result(seconds=MIN_REGRESSION_SECONDS)), 20) != []
+
+
+def test_find_regressions_status():
+    runs = history(result())
+    assert find_regressions([result("TIMEOUT")], runs, 20) == [
+        "alu_synth[DATA_W=8]: PASS -> TIMEOUT"]
+    # Already failing points and new points aren't regressions
+    assert find_regressions([result("FAIL")], history(result("FAIL")), 20) == []
+    assert find_regressions([result("FAIL", point="new[X=1]")], runs, 20) == []
+
+
+def test_find_regressions_latest_run():
+    runs = history(result(seconds=10.0)) + history(result(seconds=20.0))
+    assert find_regressions([result(seconds=21.0)], runs, 20) == []
+
+
+def test_history_round_trip(tmp_path):
+    history_file = tmp_path / "history.json"
+    assert load_history(history_file) == []
+    append_history(history_file, [result()])
+    append_history(history_file, [result(seconds=11.0)])
+    runs = load_history(history_file)
+    assert [run['results']["alu_synth[DATA_W=8]"]['seconds'] for run in runs] == [10.0, 11.0]
+
+
+def test_timeout_warnings():
+    results = [dict(result(seconds=500.0), timeout=600), dict(result(seconds=100.0), timeout=600),
+               dict(result("TIMEOUT", seconds=600.0), timeout=600), result(seconds=500.0)]
+    assert timeout_warnings(results) == ["alu_synth[DATA_W=8]: 500.0s of a 600s timeout"]
+
+
+# Stand-in tools. sv2v prints its arguments as a comment, yosys reports
+# $FAKE_CELLS cells and sby writes $FAKE_STATUS into its task's status file.
+FAKE_TOOLS = {
+    "sv2v": """#!/bin/sh
+[ -n "$FAKE_SV2V_FAIL" ] && { echo "sv2v: parse error" >&2; exit 1; }
+echo "// sv2v $*"
+""",
+    "yosys": """#!/bin/sh
+echo "{\\"design\\": {\\"num_cells\\": ${FAKE_CELLS:-42}}}" > stat.json
+""",
+    "sby": """#!/bin/sh
+mkdir -p "bench_$3" && echo "${FAKE_STATUS:-PASS}" > "bench_$3/status"
+[ "${FAKE_STATUS:-PASS}" = PASS ]
+""",
+}
+
+DEMO_SYNTH = Bench("demo_synth", "synth", "demo", "demo",
+                   ("rtl/demo_pkg.sv", "rtl/demo.sv", "rtl/demo_core.sv"), (("W", (4, 8)),))
+DEMO_FORMAL = Bench("demo_formal", "formal", "demo", "demo", ("rtl/demo.sv",),
+                    (("W", (4,)),), config="rtl/formal.sby", tasks=("prove",))
+
+needs_sh = pytest.mark.skipif(shutil.which("sh") is None, reason="needs sh")
+
+
+@pytest.fixture
+def fake_tools(tmp_path, monkeypatch):
+    """Project root with a demo block, and the stand-in tools first on PATH"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for name, script in FAKE_TOOLS.items():
+        (bin_dir / name).write_text(script)
+        (bin_dir / name).chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    project_root = tmp_path / "project"
+    rtl_dir = project_root / "src" / "demo" / "rtl"
+    rtl_dir.mkdir(parents=True)
+    (rtl_dir / "formal.sby").write_text(SBY.replace("fifo_sync", "demo"))
+    (tmp_path / "scratch").mkdir()
+    return project_root
+
+
+def point(bench: Bench, width: int = 8, task: str = "") -> BenchPoint:
+    return BenchPoint(bench, (("W", width),), task)
+
+
+@needs_sh
+def test_run_bench_point_synth(fake_tools, tmp_path):
+    result = run_bench_point(fake_tools, point(DEMO_SYNTH), tmp_path / "scratch",
+                             tmp_path / "debug")
+    assert result['status'] == "PASS" and result['cells'] == 42
+    assert result['params'] == {'W': 8}
+
+    work_dir, = (tmp_path / "scratch").iterdir()
+    rtl_dir = fake_tools / "src" / "demo" / "rtl"
+    # Every non-package source converted on its own, with the packages
+    assert (work_dir / "scratch" / "demo_core.v").read_text() == \
+        f"// sv2v {rtl_dir / 'demo_pkg.sv'} {rtl_dir / 'demo_core.sv'}\n"
+    assert sorted(path.name for path in (work_dir / "scratch").iterdir()) == \
+        ["demo.v", "demo_core.v"]
+    script = (work_dir / "synth.ys").read_text()
+    assert "read_verilog scratch/demo.v\nread_verilog scratch/demo_core.v\n" in script
+    assert "chparam -set W 8 demo" in script
+    assert not (tmp_path / "debug").exists()  # Passing output isn't kept
+
+
+@needs_sh
+def test_run_bench_point_sv2v_failure(fake_tools, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("FAKE_SV2V_FAIL", "1")
+    result = run_bench_point(fake_tools, point(DEMO_SYNTH), tmp_path / "scratch",
+                             tmp_path / "debug")
+    assert result['status'] == "ERROR" and result['cells'] is None
+    assert "sv2v failed on demo.sv" in capsys.readouterr().out
+
+
+@needs_sh
+@pytest.mark.parametrize("status", ["PASS", "FAIL"])
+def test_run_bench_point_formal(fake_tools, tmp_path, monkeypatch, status):
+    monkeypatch.setenv("FAKE_STATUS", status)
+    result = run_bench_point(fake_tools, point(DEMO_FORMAL, 4, "prove"),
+                             tmp_path / "scratch", tmp_path / "debug")
+    assert result['status'] == status and result['timeout'] == 600
+    logs = [log.name for log in tmp_path.glob("debug/rtl_bench/*.log")]
+    assert logs == ([] if status == "PASS" else ["demo_formal.prove_W=4_.log"])
+
+
+def test_run_bench_point_missing_tool(fake_tools, tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+    result = run_bench_point(fake_tools, point(DEMO_SYNTH), tmp_path / "scratch",
+                             tmp_path / "debug")
+    assert result['status'] == "ERROR"
+
+
+@needs_sh
+def test_run_rtl_bench_history_and_regressions(fake_tools, tmp_path, monkeypatch):
+    framework = SimpleNamespace(project_root=fake_tools, jobs=2, scratch_dir=tmp_path / "scratch",
+                                debug_dir=tmp_path / "debug", save_debug=False, timing_data={},
+                                bench_results=[])
+    points = [point(DEMO_SYNTH, 4), point(DEMO_SYNTH, 8)]
+    history_file = tmp_path / "history.json"
+
+    assert run_rtl_bench(framework, points, history_file, 20)
+    assert [result['point'] for result in framework.bench_results] == \
+        ["demo_synth[W=4]", "demo_synth[W=8]"]
+    assert len(framework.timing_data['bench_synth']) == 2
+
+    monkeypatch.setenv("FAKE_CELLS", "60")
+    assert not run_rtl_bench(framework, points, history_file, 20)
+    assert len(load_history(history_file)) == 2
@@ -0,0 +1,105 @@
+"""
+Tests for the UART host model and the --uart-stream runner in uart_host.py
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from .uart_host import (UART_CONFIG_HEADER, WRAPPER_TB_FILE, WRAPPER_TB_MAKEFILE, UartSetting,
+                        parse_capture, parse_stream_result, prepare_uart_build_dir,
+                        run_uart_setting, stream_max_bytes, stream_report)
+
+WRAPPER_DIR = Path(__file__).parent.parent.parent / "src" / "wrapper_fpga_basys3"
+
+SETTING = UartSetting(115200, 16)
+
+# A wrapper testbench build that echoes the stream back, dropping bytes after DROP_AFTER
+FAKE_WRAPPER_TB_MK = """\
+PLUSARG = $(patsubst +$(1)=%,%,$(filter +$(1)=%,$(PLUSARGS)))
+DROP_AFTER ?= 1000000
+rebuild:
+\t@echo building
+run:
+\t@head -n $(DROP_AFTER) $(call PLUSARG,uart_stream_file) > $(call PLUSARG,uart_capture_file)
+\t@echo "UART_STREAM sent=$(call PLUSARG,uart_stream_length) \\
+received=$$(wc -l < $(call PLUSARG,uart_capture_file)) bit_time_ns=8680.0 \\
+first_start_ns=100.0 last_stop_ns=347300.0"
+"""
+
+needs_make = pytest.mark.skipif(shutil.which("make") is None, reason="needs make")
+
+
+def test_stream_max_bytes_is_instruction_memory():
+    # turtle_cpu_fpga_wrapper's default I_ADDR_W of 12, a 4 KiB instruction memory
+    assert stream_max_bytes(WRAPPER_DIR) == 4096
+
+
+def test_stream_max_bytes_without_address_width(tmp_path):
+    (tmp_path / WRAPPER_TB_FILE).parent.mkdir()
+    (tmp_path / WRAPPER_TB_FILE).write_text("localparam int BAUD_RATE = 115200;\n")
+    with pytest.raises(ValueError):
+        stream_max_bytes(tmp_path)
+
+
+def test_parse_capture():
+    assert parse_capture("44\n01\n") == [0x44, 0x01]
+    # $writememh headers and bytes never received
+    assert parse_capture("// memory data file\n@0\n44\nxx\n0z\n") == [0x44, None, None]
+
+
+def test_stream_report():
+    result = parse_stream_result("UART_STREAM sent=4 received=3 bit_time_ns=1000.0 "
+                                 "first_start_ns=0.0 last_stop_ns=44000.0\n")
+    report = stream_report(UartSetting(1000000, 16, 1), b"\x01\x02\x03\x04",
+                           [0x01, None, 0x03], result)
+    assert (report['dropped'], report['mismatches'], report['passed']) == (1, 1, False)
+    assert report['line_rate'] == pytest.approx(1e6 / 11)
+    assert report['bytes_per_second'] == pytest.approx(3 / 44e-6)
+
+
+@pytest.fixture
+def fake_project(tmp_path):
+    """A project root whose wrapper block builds FAKE_WRAPPER_TB_MK"""
+    project_root = tmp_path / "project"
+    wrapper_dir = project_root / "src" / "wrapper_fpga_basys3"
+    (wrapper_dir / "rtl").mkdir(parents=True)
+    (wrapper_dir / "tb").mkdir()
+    (wrapper_dir / "tb" / UART_CONFIG_HEADER).write_text("// checked in default\n")
+    (wrapper_dir / "tb" / "turtle_cpu_fpga_wrapper_tb.sv").touch()
+    (wrapper_dir / WRAPPER_TB_MAKEFILE).write_text(FAKE_WRAPPER_TB_MK)
+    return project_root
+
+
+def test_prepare_uart_build_dir(fake_project, tmp_path):
+    build_dir = prepare_uart_build_dir(fake_project, SETTING, tmp_path / "worker")
+    tb_dir = build_dir / "tb"
+    assert not tb_dir.is_symlink()
+    assert (tb_dir / "turtle_cpu_fpga_wrapper_tb.sv").is_symlink()
+    header = tb_dir / UART_CONFIG_HEADER
+    assert not header.is_symlink()
+    assert "`define UART_HOST_BAUD_RATE 115200" in header.read_text()
+    # The checked-in header is left alone
+    source_header = fake_project / "src" / "wrapper_fpga_basys3" / "tb" / UART_CONFIG_HEADER
+    assert source_header.read_text() == "// checked in default\n"
+
+
+@needs_make
+def test_run_uart_setting(fake_project, tmp_path):
+    stream_file = tmp_path / "uart_stream.hex"
+    stream_file.write_text("01\n02\n03\n")
+    report = run_uart_setting(fake_project, SETTING, b"\x01\x02\x03", stream_file, tmp_path)
+    assert report['passed']
+    assert (report['sent'], report['received']) == (3, 3)
+
+
+@needs_make
+def test_run_uart_setting_dropped(fake_project, tmp_path):
+    makefile = fake_project / "src" / "wrapper_fpga_basys3" / WRAPPER_TB_MAKEFILE
+    makefile.write_text(FAKE_WRAPPER_TB_MK.replace("DROP_AFTER ?= 1000000", "DROP_AFTER ?= 2"))
+    stream_file = tmp_path / "uart_stream.hex"
+    stream_file.write_text("01\n02\n03\n")
+    report = run_uart_setting(fake_project, SETTING, b"\x01\x02\x03", stream_file, tmp_path)
+    assert not report['passed']
+    assert report['dropped'] == 1
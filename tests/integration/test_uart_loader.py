@@ -0,0 +1,129 @@
+"""
+Tests for the UART loader protocol in uart_loader.py, against BoardModel on a local pty
+"""
+
+import io
+
+import pytest
+
+from .uart_loader import (CMD_PING, D_MEMORY_BYTES, HEADER, I_MEMORY_BYTES, REQUEST_SYNC,
+                          RESPONSE_SYNC, BoardModel, ProtocolError, PtyTransport, UartLoader,
+                          encode_frame, read_frame)
+
+PROGRAM = bytes(range(1, 41))
+
+
+class RecordingTransport(PtyTransport):
+    """A PtyTransport that records the sequence numbers it sends and the requests in flight"""
+
+    def __init__(self, model: BoardModel, corrupt_request: bool = False):
+        super().__init__(model, timeout=2.0)
+        self.sequences = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.corrupt_request = corrupt_request
+
+    def write(self, data: bytes):
+        self.sequences.append(HEADER.unpack(data[1:1 + HEADER.size])[1])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        if self.corrupt_request:
+            data = data[:-1] + bytes([data[-1] ^ 0xFF])
+        super().write(data)
+
+    def read(self, size: int) -> bytes:
+        data = super().read(size)
+        # Pings answer with a single 0x00 status byte, so a 0x5A byte is a response's SYNC
+        if data == bytes([RESPONSE_SYNC]):
+            self.in_flight -= 1
+        return data
+
+
+class FakeBoard:
+    """run_program callback: records the program, halts after 7 cycles at PC 0x00c"""
+
+    def __init__(self):
+        self.programs = []
+
+    def __call__(self, program: bytes, max_cycles: int):
+        self.programs.append(program)
+        memory = bytearray(D_MEMORY_BYTES)
+        memory[0x10] = 0x2a
+        return {'memory': bytes(memory), 'registers': bytes(range(16)), 'cycle_count': 7,
+                'pc': 0x00c}
+
+
+@pytest.fixture
+def board():
+    return FakeBoard()
+
+
+@pytest.fixture
+def transport(board):
+    transport = RecordingTransport(BoardModel(board))
+    yield transport
+    transport.close()
+
+
+def test_upload_run_dump(board, transport):
+    loader = UartLoader(transport)
+    loader.ping()
+    loader.upload_program(PROGRAM)
+    assert loader.run(1000) == 7
+    assert board.programs == [PROGRAM.ljust(I_MEMORY_BYTES, b"\0")]
+
+    state = loader.dump_state()
+    assert len(state['memory']) == D_MEMORY_BYTES
+    assert state['memory'][0x10] == 0x2a
+    assert state['registers'] == bytes(range(16))
+    assert state['pc'] == 0x00c
+
+
+def test_run_without_halt():
+    transport = PtyTransport(BoardModel(lambda program, max_cycles: None), timeout=2.0)
+    try:
+        assert UartLoader(transport).run(10) is None
+    finally:
+        transport.close()
+
+
+def test_response_crc_mismatch():
+    frame = bytearray(encode_frame(RESPONSE_SYNC, CMD_PING | 0x80, 3, b"\0"))
+    assert read_frame(io.BytesIO(b"\xff" + frame).read, RESPONSE_SYNC) == (
+        CMD_PING | 0x80, 3, b"\0")
+    frame[-2] ^= 0x01
+    with pytest.raises(ProtocolError, match="CRC mismatch"):
+        read_frame(io.BytesIO(bytes(frame)).read, RESPONSE_SYNC)
+
+
+def test_request_crc_mismatch(board):
+    # The board answers a corrupted frame with STATUS_BAD_FRAME
+    transport = RecordingTransport(BoardModel(board), corrupt_request=True)
+    try:
+        with pytest.raises(ProtocolError):
+            UartLoader(transport).ping()
+    finally:
+        transport.close()
+
+
+@pytest.mark.parametrize("window", [1, 2, 4])
+def test_window(transport, window):
+    loader = UartLoader(transport, window)
+    assert loader.transact([(CMD_PING, b"")] * 9) == [b""] * 9
+    assert transport.max_in_flight == window
+    assert transport.in_flight == 0
+
+
+def test_sequence_wrap(transport):
+    loader = UartLoader(transport, window=3)
+    loader.sequence = 253
+    assert loader.transact([(CMD_PING, b"")] * 6) == [b""] * 6
+    assert transport.sequences == [253, 254, 255, 0, 1, 2]
+    assert loader.sequence == 3
+
+
+def test_encode_frame_layout():
+    frame = encode_frame(REQUEST_SYNC, CMD_PING, 9, b"ab")
+    assert frame[0] == REQUEST_SYNC
+    assert HEADER.unpack(frame[1:1 + HEADER.size]) == (CMD_PING, 9, 2)
+    assert frame[1 + HEADER.size:-2] == b"ab"
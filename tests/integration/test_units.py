@@ -0,0 +1,133 @@
+"""
+Tests for unit testbench discovery, output parsing and the --units runner in units.py
+"""
+
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from .units import (UnitTest, find_unit_tests, parse_unit_output, prepare_unit_build_dir,
+                    run_unit_test, run_unit_tests)
+
+SRC_DIR = Path(__file__).parent.parent.parent / "src"
+
+# A block whose make targets print what a testbench would, chosen by OUTCOME=
+FAKE_MAKEFILE = """\
+FILE_LIST := demo.sv demo_tb.sv
+OUTCOME ?= pass
+rebuild:
+\t@echo building
+run:
+ifeq ($(OUTCOME),pass)
+\t@echo "[PASS] check 1"; echo "[PASS] check 2"; echo "Testbench completed successfully"
+else
+\t@echo "[PASS] check 1"; echo "[FAIL] check 2"; echo "Error: value mismatch"; exit 1
+endif
+"""
+
+needs_make = pytest.mark.skipif(shutil.which("make") is None, reason="needs make")
+
+
+def test_parse_unit_output_pass():
+    result = parse_unit_output(0, "[PASS] a\n[PASS] b\nTestbench completed successfully\n")
+    assert result == {'status': 'PASSED', 'errors': 0, 'failed_checks': 0, 'passed_checks': 2,
+                      'completed': True, 'returncode': 0}
+
+
+def test_parse_unit_output_completion_message_not_required():
+    assert parse_unit_output(0, "[PASS] a\n")['status'] == 'PASSED'
+
+
+def test_parse_unit_output_failures():
+    output = ("[PASS] a\n[FAIL] b\n[FAIL] c\n"
+              "Error: assertion failed\n%Error: tb.sv:10\nERROR: icarus\nFatal: stop\n")
+    result = parse_unit_output(0, output)
+    assert result['status'] == 'FAILED'
+    assert (result['errors'], result['failed_checks'], result['passed_checks']) == (4, 2, 1)
+
+
+def test_parse_unit_output_make_failure():
+    # Nothing failed in the output, but the build or run did
+    result = parse_unit_output(2, "[PASS] a\nTestbench completed successfully\n")
+    assert result['status'] == 'FAILED'
+    assert result['returncode'] == 2
+
+
+def test_parse_unit_output_malformed():
+    # Errors only count at the start of a line, and only whole [PASS]/[FAIL] tags count
+    output = "\x00\x1b[0mgarbage\nno Error: here\n[PASSED_ALL]\n[FAILURE] not a check\n"
+    result = parse_unit_output(0, output)
+    assert (result['errors'], result['failed_checks'], result['passed_checks']) == (0, 0, 0)
+    assert result['completed'] is False
+    assert result['status'] == 'PASSED'
+    # Truncated output still fails on what it holds
+    assert parse_unit_output(0, "[PASS] a\n[FAIL")['status'] == 'FAILED'
+    assert parse_unit_output(0, "")['status'] == 'PASSED'
+
+
+def test_find_unit_tests_project():
+    units = find_unit_tests(SRC_DIR)
+    names = [unit.name for unit in units]
+    assert names == sorted(names)
+    assert UnitTest("alu", "alu") in units
+    assert "turtle_cpu_top" not in {unit.block for unit in units}
+
+
+def test_find_unit_tests_extra_and_excluded(tmp_path):
+    for block, makefile in (("demo", "FILE_LIST := demo.sv demo_tb.sv\n"),
+                            ("rtl_only", "FILE_LIST := rtl_only.sv\n"),
+                            ("turtle_cpu_top", "FILE_LIST := top.sv top_tb.sv\n"),
+                            ("wrapper_fpga_basys3", "FILE_LIST := wrapper_tb.sv\n")):
+        (tmp_path / block).mkdir()
+        (tmp_path / block / "Makefile").write_text(makefile)
+    (tmp_path / "wrapper_fpga_basys3" / "tb").mkdir()
+    (tmp_path / "wrapper_fpga_basys3" / "tb" / "seven_segment_driver_tb.sv").touch()
+
+    units = find_unit_tests(tmp_path)
+    assert [unit.name for unit in units] == ["demo", "seven_segment_driver", "wrapper"]
+    assert units[1].make_vars == (
+        "FILE_LIST=seven_segment_driver.sv seven_segment_driver_tb.sv",)
+
+
+@pytest.fixture
+def fake_project(tmp_path):
+    """A project root with one block, `demo`, whose unit testbench is FAKE_MAKEFILE"""
+    project_root = tmp_path / "project"
+    block_dir = project_root / "src" / "demo"
+    (block_dir / "rtl").mkdir(parents=True)
+    (block_dir / "Makefile").write_text(FAKE_MAKEFILE)
+    (block_dir / "build_output.o").touch()
+    return project_root
+
+
+def test_prepare_unit_build_dir(fake_project, tmp_path):
+    build_dir = prepare_unit_build_dir(fake_project, UnitTest("demo", "demo"),
+                                       tmp_path / "worker")
+    assert build_dir == tmp_path / "worker" / "src" / "demo"
+    assert sorted(entry.name for entry in build_dir.iterdir()) == ["Makefile", "rtl"]
+    assert (build_dir / "rtl").is_symlink()
+
+
+@needs_make
+@pytest.mark.parametrize("outcome, status", [("pass", 'PASSED'), ("fail", 'FAILED')])
+def test_run_unit_test(fake_project, tmp_path, outcome, status):
+    debug_dir = tmp_path / "debug"
+    unit = UnitTest("demo", "demo", (f"OUTCOME={outcome}",))
+    result = run_unit_test(fake_project, unit, tmp_path, debug_dir)
+    assert result['status'] == status
+    assert set(result['phases']) == {'unit_build', 'unit_run'}
+    # Failing testbenches keep their output
+    assert (debug_dir / "unit_demo" / "demo.log").exists() == (status == 'FAILED')
+
+
+@needs_make
+def test_run_unit_tests_records_results(fake_project, tmp_path):
+    framework = SimpleNamespace(project_root=fake_project, jobs=2, scratch_dir=str(tmp_path),
+                                debug_dir=tmp_path / "debug", save_debug=False,
+                                test_results={}, timing_data={})
+    assert run_unit_tests(framework)
+    assert framework.test_results['unit/demo']['status'] == 'PASSED'
+    assert framework.test_results['unit/demo']['kind'] == 'unit'
+    assert set(framework.timing_data) == {'unit_build', 'unit_run'}
@@ -0,0 +1,256 @@
+"""
+UART host model for the Turtle CPU FPGA wrapper testbench
+Streams a program's bytes into RsRx of turtle_cpu_fpga_wrapper_tb, checks the bytes
+that come back on RsTx and measures throughput in bytes per simulated second
+
+uart_controller currently loops every received byte back out through its RX and TX
+FIFOs, so the stream is checked against its own echo. The testbench drives and
+samples the line at the UART's real bit time; this module only prepares its
+inputs and evaluates its output. run_uart_stream builds the testbench once per
+setting, each in a private mirror of the wrapper block, in parallel (--uart-stream).
+"""
+
+import contextlib
+import io
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+try:
+    from .mem_dumps import format_memh, parse_memh
+    from .units import UnitTest, prepare_unit_build_dir, run_make
+except ImportError:  # Run as a script from tests/integration
+    from mem_dumps import format_memh, parse_memh
+    from units import UnitTest, prepare_unit_build_dir, run_make
+
+DEFAULT_BAUD_RATES = [9600, 115200, 1000000]
+DEFAULT_OVERSAMPLE_RATES = [16, 8]
+DEFAULT_IDLE_BITS = 1
+
+# Testbench include with the UART parameters, and the make fragment that builds
+# turtle_cpu_fpga_wrapper_tb (both in src/wrapper_fpga_basys3)
+UART_CONFIG_HEADER = "uart_host_config.svh"
+WRAPPER_TB_MAKEFILE = "wrapper_tb.mk"
+
+# The testbench's stream buffers hold a full instruction memory, 1 << I_ADDR_W bytes
+WRAPPER_TB_FILE = "tb/turtle_cpu_fpga_wrapper_tb.sv"
+I_ADDR_W_RE = re.compile(r"localparam\s+int\s+I_ADDR_W\s*=\s*(\d+)\s*;")
+
+# Start, 8 data and stop bits
+FRAME_BITS = 10
+
+# uart_controller's CLOCK_FREQ default, which its baud divider is computed from
+UART_CLOCK_FREQ = 100_000_000
+
+STREAM_RE = re.compile(
+    r"UART_STREAM sent=(\d+) received=(\d+) bit_time_ns=([\d.]+) "
+    r"first_start_ns=([\d.]+) last_stop_ns=([\d.]+)")
+
+
+def stream_max_bytes(wrapper_dir: Path) -> int:
+    """Longest stream the wrapper testbench takes, from its I_ADDR_W
+
+    Raises ValueError if the testbench doesn't declare I_ADDR_W.
+    """
+    match = I_ADDR_W_RE.search((Path(wrapper_dir) / WRAPPER_TB_FILE).read_text())
+    if not match:
+        raise ValueError(f"no I_ADDR_W localparam in {WRAPPER_TB_FILE}")
+    return 1 << int(match.group(1))
+
+
+class UartSetting(NamedTuple):
+    """UART parameters of one testbench build, and the idle bits the host sends between frames"""
+    baud_rate: int
+    oversample_rate: int
+    idle_bits: int = DEFAULT_IDLE_BITS
+
+    @property
+    def name(self) -> str:
+        return f"{self.baud_rate}_osr{self.oversample_rate}_idle{self.idle_bits}"
+
+
+def oversample_clocks(setting: UartSetting) -> int:
+    """uart_controller's OVERSAMPLE_CLOCKS divider, at least 2 for a valid build"""
+    return UART_CLOCK_FREQ // (setting.baud_rate * setting.oversample_rate)
+
+
+def config_header(setting: UartSetting) -> str:
+    """uart_host_config.svh contents for a setting"""
+    return (f"`ifndef UART_HOST_CONFIG_SVH\n"
+            f"`define UART_HOST_CONFIG_SVH\n\n"
+            f"`define UART_HOST_BAUD_RATE {setting.baud_rate}\n"
+            f"`define UART_HOST_OVERSAMPLE_RATE {setting.oversample_rate}\n\n"
+            f"`endif // UART_HOST_CONFIG_SVH\n")
+
+
+def parse_capture(text: str) -> list:
+    """Bytes of a $writememh capture file, None for bytes with x/z bits"""
+    data, unknown = parse_memh(text)
+    return [None if address in unknown else byte for address, byte in enumerate(data)]
+
+
+def parse_stream_result(stdout: str) -> Optional[dict]:
+    """Counts and simulated times from the testbench's UART_STREAM line, None if missing"""
+    match = STREAM_RE.search(stdout)
+    if not match:
+        return None
+    sent, received, bit_time, first_start, last_stop = match.groups()
+    return {
+        'sent': int(sent),
+        'received': int(received),
+        'bit_time_ns': float(bit_time),
+        'elapsed_ns': float(last_stop) - float(first_start),
+    }
+
+
+def stream_report(setting: UartSetting, sent: bytes, captured: list, result: dict) -> dict:
+    """Throughput and echo check of one stream
+
+    line_rate is the host's own send rate at the UART's real bit time. An echo
+    rate below it, or dropped bytes, means the loopback can't keep up with the
+    host at that idle gap.
+    """
+    bit_time = result['bit_time_ns'] * 1e-9
+    elapsed = result['elapsed_ns'] * 1e-9
+    mismatches = sum(1 for expected, actual in zip(sent, captured) if expected != actual)
+    return {
+        'setting': setting.name,
+        'baud_rate': setting.baud_rate,
+        'oversample_rate': setting.oversample_rate,
+        'idle_bits': setting.idle_bits,
+        'actual_baud_rate': 1 / bit_time if bit_time > 0 else None,
+        'sent': result['sent'],
+        'received': result['received'],
+        'dropped': result['sent'] - result['received'],
+        'mismatches': mismatches,
+        'seconds': elapsed,
+        'bytes_per_second': result['received'] / elapsed if elapsed > 0 else None,
+        'line_rate': 1 / (bit_time * (FRAME_BITS + setting.idle_bits)) if bit_time > 0 else None,
+        'passed': result['received'] == result['sent'] and mismatches == 0,
+    }
+
+
+def format_report_table(reports: list) -> str:
+    """One line per setting: real baud rate, echo throughput against line rate, losses"""
+    lines = [f"  {'Setting':<26} {'Baud':>10} {'Bytes/s':>10} {'Line %':>7} "
+             f"{'Sim time':>10} {'Dropped':>8} {'Wrong':>6}"]
+    for report in reports:
+        if report.get('bytes_per_second') is None:
+            lines.append(f"  {report['setting']:<26} {'no result':>10}")
+            continue
+        efficiency = report['bytes_per_second'] / report['line_rate'] * 100
+        lines.append(
+            f"  {report['setting']:<26} {report['actual_baud_rate']:>10.0f} "
+            f"{report['bytes_per_second']:>10.1f} {efficiency:>6.1f}% "
+            f"{report['seconds'] * 1e3:>8.2f}ms {report['dropped']:>8} {report['mismatches']:>6}")
+    return "\n".join(lines)
+
+
+def write_stream_config(tb_dir: Path, setting: UartSetting):
+    """Replace the testbench's UART config header in a mirrored tb directory"""
+    header = tb_dir / UART_CONFIG_HEADER
+    if header.is_symlink():
+        header.unlink()
+    header.write_text(config_header(setting))
+
+
+def run_uart_stream(framework, asm_file: str, settings: list) -> bool:
+    """Stream a program over the FPGA wrapper's UART at each setting and measure throughput
+
+    Every setting is its own build of turtle_cpu_fpga_wrapper_tb, run in parallel
+    with framework.jobs workers. The reports go into framework.uart_reports. Fails
+    if any setting loses or corrupts a byte.
+    """
+    binary_data = framework.assemble_program(asm_file)
+    if binary_data is None:
+        return False
+    max_bytes = stream_max_bytes(framework.project_root / "src" / "wrapper_fpga_basys3")
+    if len(binary_data) > max_bytes:
+        print(f"❌ Program is {len(binary_data)} bytes, the testbench streams at most "
+              f"{max_bytes}")
+        return False
+
+    print(f"\n📡 Streaming {len(binary_data)} bytes over the UART at {len(settings)} settings")
+    reports = {}
+    with tempfile.TemporaryDirectory(prefix="turtle_uart_",
+                                     dir=framework.scratch_dir) as scratch_root:
+        stream_file = Path(scratch_root) / "uart_stream.hex"
+        stream_file.write_text(format_memh(binary_data))
+
+        with ProcessPoolExecutor(max_workers=framework.jobs) as pool:
+            futures = {pool.submit(_run_uart_worker, framework.project_root, setting,
+                                   binary_data, stream_file, Path(scratch_root)): setting
+                       for setting in settings}
+            for future in as_completed(futures):
+                setting = futures[future]
+                try:
+                    report, log = future.result()
+                except Exception as e:
+                    print(f"❌ UART stream at {setting.name} FAILED with worker exception: {e}")
+                    report = {'setting': setting.name, 'passed': False}
+                else:
+                    print(log, end="")
+                reports[setting] = report
+
+    framework.uart_reports = [reports[setting] for setting in settings]
+    print("\n📡 UART STREAM THROUGHPUT (bytes per simulated second)")
+    print(f"{'─'*84}")
+    print(format_report_table(framework.uart_reports))
+    print(f"{'─'*84}")
+    return all(report['passed'] for report in framework.uart_reports)
+
+
+def run_uart_setting(project_root: Path, setting: UartSetting, binary_data: bytes,
+                     stream_file: Path, scratch_root: Path) -> dict:
+    """Build turtle_cpu_fpga_wrapper_tb for one setting, stream the program and check the echo"""
+    print(f"\n📡 UART stream at {setting.name}")
+    worker_dir = Path(tempfile.mkdtemp(prefix=f"{setting.name}_", dir=scratch_root))
+    build_dir = prepare_uart_build_dir(project_root, setting, worker_dir)
+    capture_file = build_dir / "uart_capture.hex"
+
+    returncode, output = run_make("rebuild", (), build_dir, WRAPPER_TB_MAKEFILE)
+    if returncode == 0:
+        plusargs = (f"+uart_stream_file={stream_file} +uart_stream_length={len(binary_data)} "
+                    f"+uart_capture_file={capture_file} +uart_idle_bits={setting.idle_bits}")
+        returncode, output = run_make("run", (f"PLUSARGS={plusargs}",), build_dir,
+                                      WRAPPER_TB_MAKEFILE)
+
+    result = parse_stream_result(output) if returncode == 0 else None
+    if result is None:
+        print(f"❌ No UART stream result (return code {returncode})")
+        print(output)
+        return {'setting': setting.name, 'passed': False}
+
+    captured = parse_capture(capture_file.read_text()) if capture_file.exists() else []
+    report = stream_report(setting, binary_data, captured, result)
+    if report['passed']:
+        print(f"✅ {report['received']} bytes echoed at {report['bytes_per_second']:.1f} bytes/s")
+    else:
+        print(f"❌ {report['dropped']} bytes dropped, {report['mismatches']} corrupted")
+    return report
+
+
+def prepare_uart_build_dir(project_root: Path, setting: UartSetting, worker_dir: Path) -> Path:
+    """Mirror the FPGA wrapper block with a private tb directory holding the setting's config"""
+    wrapper_dir = project_root / "src" / "wrapper_fpga_basys3"
+    build_dir = prepare_unit_build_dir(
+        project_root, UnitTest("turtle_cpu_fpga_wrapper", wrapper_dir.name), worker_dir)
+
+    tb_dir = build_dir / "tb"
+    tb_dir.unlink()
+    tb_dir.mkdir()
+    for entry in (wrapper_dir / "tb").iterdir():
+        (tb_dir / entry.name).symlink_to(entry)
+    write_stream_config(tb_dir, setting)
+    return build_dir
+
+
+def _run_uart_worker(project_root: Path, setting: UartSetting, binary_data: bytes,
+                     stream_file: Path, scratch_root: Path) -> Tuple[dict, str]:
+    """Run one UART stream setting in a worker process, return (report, log)"""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        report = run_uart_setting(project_root, setting, binary_data, stream_file, scratch_root)
+    return report, log.getvalue()
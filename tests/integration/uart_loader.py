@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+UART bulk loader and state dumper for the Turtle CPU on the Basys3 board
+Uploads instruction memory and reads back data memory, the register file and
+the PC with a framed, pipelined protocol over a swappable transport
+
+Frames are SYNC, command, sequence number, 16-bit little-endian payload length,
+payload and a CRC-16/CCITT of everything after SYNC. Requests start with
+REQUEST_SYNC, responses with RESPONSE_SYNC, the request's command | 0x80 and its
+sequence number, and their payload starts with a status byte. The host keeps up
+to `window` requests in flight and matches the responses in order.
+
+Transports: SerialTransport for the board (needs pyserial), and PtyTransport,
+which serves the protocol from BoardModel on a local pty so the host side can be
+tested without hardware. The board side of the protocol is not in the RTL yet:
+io_controller's debug read ports are what it will read from.
+"""
+
+import abc
+import argparse
+import binascii
+import os
+import select
+import struct
+import sys
+import threading
+import tty
+from pathlib import Path
+from typing import Callable, Optional
+
+REQUEST_SYNC = 0xA5
+RESPONSE_SYNC = 0x5A
+RESPONSE_FLAG = 0x80
+
+CMD_PING = 0x01
+CMD_WRITE_IMEM = 0x02  # Payload: address (2), bytes
+CMD_READ_DMEM = 0x03  # Payload: address (2), count (2)
+CMD_READ_REGS = 0x04
+CMD_READ_PC = 0x05
+CMD_RUN = 0x06  # Payload: max cycles (4). Response: halted (1), cycles (4)
+
+STATUS_OK = 0x00
+STATUS_BAD_FRAME = 0x01
+STATUS_BAD_COMMAND = 0x02
+STATUS_BAD_ADDRESS = 0x03
+
+HEADER = struct.Struct("<BBH")  # Command, sequence number, payload length
+MAX_PAYLOAD = 256
+DEFAULT_WINDOW = 4
+DEFAULT_BAUD_RATE = 9600  # uart_controller's BAUD_RATE default
+DEFAULT_TIMEOUT = 5.0  # Seconds without a byte before a read fails
+
+I_MEMORY_BYTES = 1 << 12
+D_MEMORY_BYTES = 1 << 12
+REGISTER_COUNT = 16
+
+
+class ProtocolError(Exception):
+    """The board answered with an error, a corrupted frame or not at all"""
+
+
+def encode_frame(sync: int, command: int, sequence: int, payload: bytes = b"") -> bytes:
+    """One frame: SYNC, header, payload and the CRC of header and payload"""
+    body = HEADER.pack(command, sequence, len(payload)) + payload
+    return bytes([sync]) + body + struct.pack("<H", binascii.crc_hqx(body, 0xFFFF))
+
+
+def read_frame(read: Callable[[int], bytes], sync: int) -> tuple:
+    """Read one frame with read(size), skipping bytes until SYNC
+
+    Returns (command, sequence, payload). Raises ProtocolError on a bad CRC.
+    """
+    while read(1)[0] != sync:
+        pass
+    header = read(HEADER.size)
+    command, sequence, length = HEADER.unpack(header)
+    if length > MAX_PAYLOAD + 4:
+        raise ProtocolError(f"frame payload of {length} bytes is too long")
+    payload = read(length)
+    (crc,) = struct.unpack("<H", read(2))
+    if crc != binascii.crc_hqx(header + payload, 0xFFFF):
+        raise ProtocolError(f"CRC mismatch in frame {sequence} (command 0x{command:02x})")
+    return command, sequence, payload
+
+
+class Transport(abc.ABC):
+    """Byte pipe to the board"""
+
+    @abc.abstractmethod
+    def write(self, data: bytes):
+        """Write all of data"""
+
+    @abc.abstractmethod
+    def read(self, size: int) -> bytes:
+        """Read exactly size bytes, raising ProtocolError on a timeout"""
+
+    def close(self):
+        pass
+
+
+class SerialTransport(Transport):
+    """The board's USB-UART bridge, through pyserial"""
+
+    def __init__(self, port: str, baud_rate: int = DEFAULT_BAUD_RATE,
+                 timeout: float = DEFAULT_TIMEOUT):
+        try:
+            import serial
+        except ImportError as e:
+            raise ProtocolError("talking to the board needs pyserial (pip install pyserial)") from e
+        self.serial = serial.Serial(port, baud_rate, timeout=timeout)
+
+    def write(self, data: bytes):
+        self.serial.write(data)
+
+    def read(self, size: int) -> bytes:
+        data = self.serial.read(size)
+        if len(data) < size:
+            raise ProtocolError(f"timed out after {len(data)} of {size} bytes")
+        return data
+
+    def close(self):
+        self.serial.close()
+
+
+class PtyTransport(Transport):
+    """Local pty served by a BoardModel thread, a stand-in for the board"""
+
+    def __init__(self, model: "BoardModel", timeout: float = DEFAULT_TIMEOUT):
+        self.fd, device_fd = os.openpty()
+        tty.setraw(self.fd)
+        tty.setraw(device_fd)
+        self.timeout = timeout
+        self.thread = threading.Thread(target=model.serve, args=(device_fd,), daemon=True)
+        self.thread.start()
+
+    def write(self, data: bytes):
+        while data:
+            data = data[os.write(self.fd, data):]
+
+    def read(self, size: int) -> bytes:
+        return _read_fd(self.fd, size, self.timeout)
+
+    def close(self):
+        os.close(self.fd)
+        self.thread.join(self.timeout)
+
+
+class BoardModel:
+    """Board side of the protocol in Python, backed by a run_program callback
+
+    run_program(program, max_cycles) runs an uploaded program from reset and returns
+    {'memory', 'registers', 'cycle_count', 'pc'}, or None if it didn't halt.
+    """
+
+    def __init__(self, run_program: Callable[[bytes, int], Optional[dict]]):
+        self.run_program = run_program
+        self.imem = bytearray(I_MEMORY_BYTES)
+        self.dmem = bytes(D_MEMORY_BYTES)
+        self.registers = bytes(REGISTER_COUNT)
+        self.pc = 0
+
+    def serve(self, fd: int):
+        """Answer requests on fd until the host closes its end"""
+        def read(size):
+            return _read_fd(fd, size, None)
+
+        try:
+            while True:
+                try:
+                    command, sequence, payload = read_frame(read, REQUEST_SYNC)
+                    status, data = self.handle(command, payload)
+                except (ProtocolError, struct.error):
+                    command, sequence, status, data = 0, 0, STATUS_BAD_FRAME, b""
+                os.write(fd, encode_frame(RESPONSE_SYNC, command | RESPONSE_FLAG,
+                                          sequence, bytes([status]) + data))
+        except (EOFError, OSError):
+            pass
+        finally:
+            os.close(fd)
+
+    def handle(self, command: int, payload: bytes) -> tuple:
+        """(status, response data) of one request"""
+        if command == CMD_PING:
+            return STATUS_OK, b""
+        if command == CMD_WRITE_IMEM:
+            (address,) = struct.unpack_from("<H", payload)
+            data = payload[2:]
+            if address + len(data) > I_MEMORY_BYTES:
+                return STATUS_BAD_ADDRESS, b""
+            self.imem[address:address + len(data)] = data
+            return STATUS_OK, b""
+        if command == CMD_READ_DMEM:
+            address, count = struct.unpack("<HH", payload)
+            if address + count > D_MEMORY_BYTES or count > MAX_PAYLOAD:
+                return STATUS_BAD_ADDRESS, b""
+            return STATUS_OK, self.dmem[address:address + count]
+        if command == CMD_READ_REGS:
+            return STATUS_OK, self.registers
+        if command == CMD_READ_PC:
+            return STATUS_OK, struct.pack("<H", self.pc)
+        if command == CMD_RUN:
+            (max_cycles,) = struct.unpack("<I", payload)
+            state = self.run_program(bytes(self.imem), max_cycles)
+            if state is None:
+                return STATUS_OK, struct.pack("<BI", 0, 0)
+            self.dmem = state['memory'].ljust(D_MEMORY_BYTES, b"\0")
+            self.registers = state['registers'].ljust(REGISTER_COUNT, b"\0")
+            self.pc = state.get('pc', 0)
+            return STATUS_OK, struct.pack("<BI", 1, state['cycle_count'])
+        return STATUS_BAD_COMMAND, b""
+
+
+class UartLoader:
+    """Host side: uploads programs and dumps the CPU state with pipelined requests"""
+
+    def __init__(self, transport: Transport, window: int = DEFAULT_WINDOW):
+        self.transport = transport
+        self.window = max(1, window)
+        self.sequence = 0
+
+    def transact(self, requests: list) -> list:
+        """Send (command, payload) requests, at most `window` in flight, return response data"""
+        pending = []  # (sequence, command) in send order
+        responses = []
+        for command, payload in requests:
+            if len(pending) == self.window:
+                responses.append(self.receive(*pending.pop(0)))
+            self.transport.write(encode_frame(REQUEST_SYNC, command, self.sequence, payload))
+            pending.append((self.sequence, command))
+            self.sequence = (self.sequence + 1) & 0xFF
+        responses.extend(self.receive(*request) for request in pending)
+        return responses
+
+    def receive(self, sequence: int, command: int) -> bytes:
+        """Read the response to one request, return its data after the status byte"""
+        response_command, response_sequence, payload = read_frame(
+            self.transport.read, RESPONSE_SYNC)
+        if response_sequence != sequence or response_command != command | RESPONSE_FLAG:
+            raise ProtocolError(f"expected response {sequence} to command 0x{command:02x}, "
+                                f"got {response_sequence} to 0x{response_command & 0x7F:02x}")
+        if not payload or payload[0] != STATUS_OK:
+            status = payload[0] if payload else None
+            raise ProtocolError(f"command 0x{command:02x} failed with status {status}")
+        return payload[1:]
+
+    def ping(self):
+        self.transact([(CMD_PING, b"")])
+
+    def upload_program(self, program: bytes):
+        """Write a program to instruction memory from address 0, zeroing the rest"""
+        image = program.ljust(I_MEMORY_BYTES, b"\0")
+        self.transact([(CMD_WRITE_IMEM, struct.pack("<H", address) + image[address:address + MAX_PAYLOAD])
+                       for address in range(0, I_MEMORY_BYTES, MAX_PAYLOAD)])
+
+    def run(self, max_cycles: int) -> Optional[int]:
+        """Reset the CPU and run the uploaded program, return its cycles to HALT (None if it didn't)"""
+        (response,) = self.transact([(CMD_RUN, struct.pack("<I", max_cycles))])
+        halted, cycles = struct.unpack("<BI", response)
+        return cycles if halted else None
+
+    def dump_state(self) -> dict:
+        """Data memory, register file and PC as {'memory', 'registers', 'pc'}"""
+        requests = [(CMD_READ_DMEM, struct.pack("<HH", address, MAX_PAYLOAD))
+                    for address in range(0, D_MEMORY_BYTES, MAX_PAYLOAD)]
+        requests += [(CMD_READ_REGS, b""), (CMD_READ_PC, b"")]
+        *memory, registers, pc = self.transact(requests)
+        return {'memory': b"".join(memory), 'registers': registers,
+                'pc': struct.unpack("<H", pc)[0]}
+
+    def close(self):
+        self.transport.close()
+
+
+def _read_fd(fd: int, size: int, timeout: Optional[float]) -> bytes:
+    """Read exactly size bytes from a file descriptor"""
+    data = b""
+    while len(data) < size:
+        if timeout is not None and not select.select([fd], [], [], timeout)[0]:
+            raise ProtocolError(f"timed out after {len(data)} of {size} bytes")
+        chunk = os.read(fd, size - len(data))
+        if not chunk:
+            raise EOFError("transport closed")
+        data += chunk
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Upload a program to the Turtle CPU board and dump its state over the UART")
+    parser.add_argument("port", help="Serial port of the board's USB-UART bridge")
+    parser.add_argument("--baud-rate", type=int, default=DEFAULT_BAUD_RATE,
+                        help=f"UART baud rate (default: {DEFAULT_BAUD_RATE})")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW,
+                        help=f"Requests in flight (default: {DEFAULT_WINDOW})")
+    parser.add_argument("--upload", metavar="BIN",
+                        help="Machine code file to write to instruction memory")
+    parser.add_argument("--run", type=int, metavar="MAX_CYCLES",
+                        help="Reset and run the program for at most MAX_CYCLES cycles")
+    parser.add_argument("--dump-dir", metavar="DIR",
+                        help="Write data_memory.bin, register_file.bin and pc.txt here")
+    args = parser.parse_args()
+
+    loader = UartLoader(SerialTransport(args.port, args.baud_rate), args.window)
+    try:
+        loader.ping()
+        if args.upload:
+            program = Path(args.upload).read_bytes()
+            loader.upload_program(program)
+            print(f"Uploaded {len(program)} bytes")
+        if args.run is not None:
+            cycles = loader.run(args.run)
+            print(f"Halted after {cycles} cycles" if cycles is not None
+                  else f"Didn't halt within {args.run} cycles")
+        if args.dump_dir:
+            state = loader.dump_state()
+            dump_dir = Path(args.dump_dir)
+            dump_dir.mkdir(parents=True, exist_ok=True)
+            (dump_dir / "data_memory.bin").write_bytes(state['memory'])
+            (dump_dir / "register_file.bin").write_bytes(state['registers'])
+            (dump_dir / "pc.txt").write_text(f"0x{state['pc']:03x}\n")
+            print(f"State dumped to {dump_dir}")
+    except ProtocolError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        loader.close()
+
+
+if __name__ == "__main__":
+    main()
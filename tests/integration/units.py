@@ -0,0 +1,233 @@
+"""
+Unit testbenches for the Turtle CPU test framework (--units)
+Finds the testbench each RTL block Makefile runs, builds and runs every one in a
+private mirror of its block in parallel, and decides from a testbench's output
+whether it passed
+"""
+
+import contextlib
+import io
+import os
+import re
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple, Tuple
+
+# Blocks without a unit testbench of their own: turtle_cpu_top is the integration suite
+UNIT_EXCLUDED_BLOCKS = {"turtle_cpu_top"}
+
+# Testbenches next to a block's default one that its Makefile doesn't run, as
+# FILE_LIST overrides. turtle_cpu_fpga_wrapper_tb needs the whole CPU and the clock
+# wizard IP, so it isn't a unit testbench.
+EXTRA_UNIT_TESTS = {
+    "wrapper_fpga_basys3": {
+        "seven_segment_driver": "seven_segment_driver.sv seven_segment_driver_tb.sv",
+    },
+}
+
+# Entries of a block directory a unit build reads, everything else is a build output
+UNIT_SOURCE_DIRS = {"rtl", "tb", "constraints", "ip"}
+UNIT_SOURCE_SUFFIXES = {".txt", ".mem", ".mk", ".ys", ".eqy", ".sby"}
+
+FILE_LIST_RE = re.compile(r"^FILE_LIST\s*:?=.*?(\w+)_tb\.sv", re.MULTILINE)
+
+# $error/$fatal as printed by xsim (Error:/Fatal:), Verilator (%Error:) and Icarus (ERROR:),
+# and the [FAIL] checks of the testbenches that report every comparison
+ERROR_RE = re.compile(r"^\s*%?(?:Error|ERROR|Fatal|FATAL)\b", re.MULTILINE)
+FAIL_RE = re.compile(r"\[FAIL\b")
+PASS_RE = re.compile(r"\[PASS\b")
+COMPLETED_RE = re.compile(r"testbench completed successfully", re.IGNORECASE)
+
+
+class UnitTest(NamedTuple):
+    """One unit testbench: the block directory it builds in and its make variables"""
+    name: str
+    block: str
+    make_vars: tuple = ()
+
+
+def find_unit_tests(src_dir: Path) -> list:
+    """Unit testbenches of every block Makefile under src_dir, sorted by name"""
+    units = []
+    for makefile in sorted(src_dir.glob("*/Makefile")):
+        block = makefile.parent.name
+        if block in UNIT_EXCLUDED_BLOCKS:
+            continue
+
+        match = FILE_LIST_RE.search(makefile.read_text())
+        if match:
+            units.append(UnitTest(match.group(1), block))
+        for name, file_list in EXTRA_UNIT_TESTS.get(block, {}).items():
+            if (makefile.parent / "tb" / f"{name}_tb.sv").exists():
+                units.append(UnitTest(name, block, (f"FILE_LIST={file_list}",)))
+
+    return sorted(units)
+
+
+def parse_unit_output(returncode: int, output: str) -> dict:
+    """Pass/fail of a unit testbench run from make's return code and the simulator output
+
+    Counts failed assertions ($error/$fatal) and [FAIL]/[PASS] checks. A testbench
+    passes if make succeeded and nothing failed, the "completed successfully"
+    message most testbenches print is reported but not required.
+    """
+    errors = len(ERROR_RE.findall(output))
+    failed_checks = len(FAIL_RE.findall(output))
+    return {
+        'status': 'PASSED' if returncode == 0 and errors + failed_checks == 0 else 'FAILED',
+        'errors': errors,
+        'failed_checks': failed_checks,
+        'passed_checks': len(PASS_RE.findall(output)),
+        'completed': bool(COMPLETED_RE.search(output)),
+        'returncode': returncode,
+    }
+
+
+def mirror_block_dir(project_root: Path, block_dir: Path, worker_dir: Path) -> Path:
+    """Create an empty mirror of a src/ block directory under worker_dir
+
+    The project root and src/ entries are linked into the mirror, so the block's
+    relative includes still resolve. The caller links in the block's own entries.
+    """
+    mirror_block = worker_dir / block_dir.relative_to(project_root)
+    mirror_block.mkdir(parents=True)
+
+    for real_dir, mirror_dir in ((project_root, worker_dir),
+                                 (block_dir.parent, mirror_block.parent)):
+        for entry in real_dir.iterdir():
+            link = mirror_dir / entry.name
+            if not link.exists():
+                link.symlink_to(entry)
+
+    return mirror_block
+
+
+def prepare_unit_build_dir(project_root: Path, unit: UnitTest, worker_dir: Path) -> Path:
+    """Mirror a unit testbench's block with only its sources linked, for a private build"""
+    block_dir = project_root / "src" / unit.block
+    build_dir = mirror_block_dir(project_root, block_dir, worker_dir)
+    for entry in block_dir.iterdir():
+        if (entry.name == "Makefile" or entry.name in UNIT_SOURCE_DIRS
+                or entry.suffix in UNIT_SOURCE_SUFFIXES):
+            (build_dir / entry.name).symlink_to(entry)
+
+    return build_dir
+
+
+def run_unit_tests(framework) -> bool:
+    """Build and run every block's unit testbench in parallel, each in a private build dir
+
+    Uses framework.jobs workers, or one per CPU when running with a single job.
+    Results go into the framework's test_results as unit/<name>, next to the
+    integration tests, and their phases into its timing_data.
+    """
+    units = find_unit_tests(framework.project_root / "src")
+    workers = framework.jobs if framework.jobs > 1 else (os.cpu_count() or 1)
+    print(f"\n🔬 Running {len(units)} unit testbenches with {workers} parallel jobs")
+    start_time = time.time()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="turtle_units_",
+                                     dir=framework.scratch_dir) as scratch_root:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_unit_worker, framework.project_root, unit,
+                                   Path(scratch_root), framework.debug_dir,
+                                   framework.save_debug): unit
+                       for unit in units}
+            for future in as_completed(futures):
+                unit = futures[future]
+                try:
+                    result, log = future.result()
+                except Exception as e:
+                    print(f"❌ Unit testbench {unit.name} FAILED with worker exception: {e}")
+                    result = {'status': 'FAILED', 'time': 0.0, 'phases': {}}
+                else:
+                    print(log, end="")
+                results[unit] = result
+
+    for unit in units:
+        result = results[unit]
+        framework.test_results[f"unit/{unit.name}"] = {**result, 'kind': 'unit'}
+        for phase, seconds in result['phases'].items():
+            framework.timing_data.setdefault(phase, []).append(seconds)
+
+    print_unit_summary(units, results, time.time() - start_time)
+    return all(result['status'] == 'PASSED' for result in results.values())
+
+
+def run_unit_test(project_root: Path, unit: UnitTest, scratch_root: Path, debug_dir: Path,
+                  save_debug: bool = False) -> dict:
+    """Build and run one unit testbench in its own mirror of the block, return its result"""
+    print(f"\n🔬 Unit testbench {unit.name} ({unit.block})")
+    start_time = time.time()
+    worker_dir = Path(tempfile.mkdtemp(prefix=f"{unit.name}_", dir=scratch_root))
+    build_dir = prepare_unit_build_dir(project_root, unit, worker_dir)
+
+    phases = {}
+    output = ""
+    for target, phase in (("rebuild", "unit_build"), ("run", "unit_run")):
+        phase_start = time.time()
+        returncode, target_output = run_make(target, unit.make_vars, build_dir)
+        phases[phase] = time.time() - phase_start
+        output += target_output
+        if returncode != 0:
+            print(f"❌ make {target} failed (return code {returncode})")
+            break
+
+    result = parse_unit_output(returncode, output)
+    result.update(time=time.time() - start_time, phases=phases)
+
+    if result['status'] == 'PASSED':
+        print(f"✅ {unit.name} passed ({result['passed_checks']} checks, {result['time']:.2f}s)")
+    else:
+        print(f"❌ {unit.name} failed: {result['errors']} errors, "
+              f"{result['failed_checks']} failed checks ({result['time']:.2f}s)")
+    if save_debug or result['status'] != 'PASSED':
+        unit_debug_dir = debug_dir / f"unit_{unit.name}"
+        unit_debug_dir.mkdir(parents=True, exist_ok=True)
+        (unit_debug_dir / f"{unit.name}.log").write_text(output)
+        print(f"💾 Testbench output saved to: {unit_debug_dir}")
+
+    return result
+
+
+def print_unit_summary(units: list, results: dict, wall_time: float):
+    """Print one line per unit testbench: status, build and run time and failure counts"""
+    print("\n🔬 UNIT TESTBENCHES")
+    print(f"{'─'*72}")
+    for unit in units:
+        result = results[unit]
+        phases = result['phases']
+        icon = "✅" if result['status'] == 'PASSED' else "❌"
+        failures = ""
+        if result['status'] != 'PASSED':
+            failures = (f"  {result.get('errors', 0)} errors, "
+                        f"{result.get('failed_checks', 0)} failed checks")
+        print(f"  {icon} {unit.name:<22} build {phases.get('unit_build', 0.0):6.2f}s  "
+              f"run {phases.get('unit_run', 0.0):6.2f}s{failures}")
+    print(f"{'─'*72}")
+    print(f"  {'Wall Time':<24}: {wall_time:.2f}s")
+
+
+def run_make(target: str, make_vars: tuple, build_dir: Path,
+             makefile: str = None) -> Tuple[int, str]:
+    """Run a make target in a build directory, return (return code, stdout and stderr)"""
+    cmd = ["make", *(["-f", makefile] if makefile else []), target, *make_vars]
+    print(f"Running: {' '.join(cmd)}")
+    try:
+        result = subprocess.run(cmd, cwd=build_dir, capture_output=True, text=True, check=False)
+    except OSError as e:
+        return -1, str(e)
+    return result.returncode, result.stdout + result.stderr
+
+
+def _run_unit_worker(project_root: Path, unit: UnitTest, scratch_root: Path, debug_dir: Path,
+                     save_debug: bool) -> Tuple[dict, str]:
+    """Run one unit testbench in a worker process, return (result, log)"""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        result = run_unit_test(project_root, unit, scratch_root, debug_dir, save_debug)
+    return result, log.getvalue()